@@ -1,3 +1,21 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ParsedProblem, Problem
+
+
+class ProblemAdmin(admin.ModelAdmin):
+    list_display = ['frontend_id', 'title', 'difficulty', 'ac_rate', 'paid_only', 'updated_at']
+    list_filter = ['difficulty', 'paid_only']
+    search_fields = ['title', 'title_slug']
+    readonly_fields = ['updated_at']
+    ordering = ['frontend_id']
+
+admin.site.register(Problem, ProblemAdmin)
+
+
+class ParsedProblemAdmin(admin.ModelAdmin):
+    list_display = ['title_slug', 'content_hash', 'parser_version', 'created_at']
+    search_fields = ['title_slug', 'content_hash']
+    readonly_fields = ['created_at']
+
+admin.site.register(ParsedProblem, ParsedProblemAdmin)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+CORPUS_DIR = BENCHMARK_DIR / 'corpus'
+BASELINE_PATH = BENCHMARK_DIR / 'content_baseline.json'
+
+# Allowed growth over the recorded baseline before a document counts as regressed. Latency is compared as a ratio
+# to the legacy parser timed in the same run, since absolute times move with the machine and its load
+LATENCY_TOLERANCE = 0.5
+ALLOCATION_TOLERANCE = 0.2
+
+
+@dataclass
+class CorpusDocument:
+    name: str
+    html: str
+
+    @property
+    def golden_path(self) -> Path:
+        return CORPUS_DIR / f"{self.name}.json"
+
+    def golden(self) -> Optional[Dict[str, Any]]:
+        if not self.golden_path.exists():
+            return None
+        return json.loads(self.golden_path.read_text(encoding='utf-8'))
+
+
+@dataclass
+class DocumentResult:
+    name: str
+    latency: float
+    peak_bytes: int
+    output_matches: Optional[bool]
+    regressions: List[str] = field(default_factory=list)
+    reference_latency: float = 0.0
+
+    @property
+    def latency_ratio(self) -> float:
+        return self.latency / self.reference_latency if self.reference_latency else 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.output_matches is not False and not self.regressions
+
+
+def load_corpus(directory: Path = CORPUS_DIR) -> List[CorpusDocument]:
+    """Recorded questionContent HTML payloads, one <slug>.html per problem"""
+    return [CorpusDocument(path.stem, path.read_text(encoding='utf-8')) for path in sorted(directory.glob('*.html'))]
+
+
+def default_parser() -> Callable[[str], Dict[str, Any]]:
+    from mysite.views import parse_leetcode_content
+    return parse_leetcode_content
+
+
+def reference_parser() -> Callable[[str], Dict[str, Any]]:
+    """The BeautifulSoup parser: goldens are recorded from it and latency is measured against it"""
+    from mysite.views import legacy_parse_leetcode_content
+    return legacy_parse_leetcode_content
+
+
+def measure_latency(func: Callable[[str], Any], html: str, number: int = 20, rounds: int = 5) -> float:
+    """Seconds per call: best of several rounds, which filters out scheduler noise"""
+    func(html)
+    best = float('inf')
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        for _ in range(max(1, number)):
+            func(html)
+        best = min(best, (time.perf_counter() - started) / max(1, number))
+    return best
+
+
+def measure_latencies(func: Callable[[str], Any], reference: Callable[[str], Any], html: str,
+                      number: int = 20, rounds: int = 5) -> Tuple[float, float]:
+    """measure_latency of func and of reference, in alternating rounds so both see the same machine load"""
+    func(html)
+    reference(html)
+    best = [float('inf'), float('inf')]
+    for _ in range(max(1, rounds)):
+        for index, timed in enumerate((func, reference)):
+            started = time.perf_counter()
+            for _ in range(max(1, number)):
+                timed(html)
+            best[index] = min(best[index], (time.perf_counter() - started) / max(1, number))
+    return best[0], best[1]
+
+
+def measure_peak(func: Callable[[str], Any], html: str) -> int:
+    """Peak bytes allocated by one call, as traced by tracemalloc"""
+    func(html)
+    tracemalloc.start()
+    try:
+        func(html)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def write_baseline(results: List[DocumentResult], path: Path = BASELINE_PATH) -> None:
+    data = {r.name: {'latency_ratio': round(r.latency_ratio, 4), 'peak_bytes': r.peak_bytes} for r in results}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+
+def write_golden(document: CorpusDocument, parsed: Dict[str, Any]) -> None:
+    document.golden_path.write_text(json.dumps(parsed, indent=2, sort_keys=True, ensure_ascii=False) + '\n', encoding='utf-8')
+
+
+def check_document(document: CorpusDocument, parser: Callable[[str], Dict[str, Any]],
+                   baseline: Dict[str, Dict[str, float]], number: int = 20, rounds: int = 5,
+                   latency_tolerance: Optional[float] = LATENCY_TOLERANCE,
+                   allocation_tolerance: Optional[float] = ALLOCATION_TOLERANCE,
+                   reference: Optional[Callable[[str], Dict[str, Any]]] = None) -> DocumentResult:
+    """Measure one document and compare it with its golden output and baseline.
+
+    Latency is timed against reference (the legacy parser by default) and compared as a ratio.
+    A tolerance of None skips that check (and the measurement, for latency).
+    """
+    golden = document.golden()
+    output_matches = None if golden is None else parser(document.html) == golden
+    recorded = baseline.get(document.name)
+    latency = reference_latency = 0.0
+    if latency_tolerance is not None:
+        reference = reference or reference_parser()
+        latency, reference_latency = measure_latencies(parser, reference, document.html, number, rounds)
+        if recorded and latency > reference_latency * recorded['latency_ratio'] * (1 + latency_tolerance):
+            # A real regression survives a second measurement; a burst of load on one side of the ratio does not
+            retry = measure_latencies(parser, reference, document.html, number, rounds)
+            if retry[0] / retry[1] < latency / reference_latency:
+                latency, reference_latency = retry
+    peak = measure_peak(parser, document.html)
+    result = DocumentResult(document.name, latency, peak, output_matches, reference_latency=reference_latency)
+
+    if recorded:
+        limit = recorded['latency_ratio'] * (1 + latency_tolerance) if latency_tolerance is not None else None
+        if limit is not None and result.latency_ratio > limit:
+            result.regressions.append(f"latency {result.latency_ratio:.3f}x legacy > {limit:.3f}x")
+        limit_bytes = recorded['peak_bytes'] * (1 + allocation_tolerance) if allocation_tolerance is not None else None
+        if limit_bytes is not None and peak > limit_bytes:
+            result.regressions.append(f"peak {peak} B > {limit_bytes:.0f} B")
+    return result
+
+
+def run(parser: Optional[Callable[[str], Dict[str, Any]]] = None, **kwargs) -> List[DocumentResult]:
+    parser = parser or default_parser()
+    baseline = load_baseline()
+    return [check_document(document, parser, baseline, **kwargs) for document in load_corpus()]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import random
+from typing import Any, Callable, Dict, List, Tuple
+
+from .content import measure_latency, measure_peak
+
+def cases(size: int = 10 ** 5, seed: int = 7) -> List[Tuple[str, str, str]]:
+    """(name, literal text, C++ type) shaped like the inputs of LeetCode's largest tests"""
+    rng = random.Random(seed)
+    side = max(1, int(size ** 0.5))
+    ints = [rng.randint(-10 ** 9, 10 ** 9) for _ in range(size)]
+    words = [''.join(rng.choice('abcdefghij') for _ in range(rng.randint(1, 8))) for _ in range(size)]
+    grid = [[rng.randint(0, 9) for _ in range(side)] for _ in range(side)]
+    board = [[rng.choice('.123456789') for _ in range(side)] for _ in range(side)]
+    return [
+        (f'{size} ints', json.dumps(ints, separators=(',', ':')), 'vector<int>&'),
+        (f'{size} ints, spaced', json.dumps(ints), 'vector<int>&'),
+        (f'{size} strings', json.dumps(words, separators=(',', ':')), 'vector<string>&'),
+        (f'{side}x{side} int grid', json.dumps(grid, separators=(',', ':')), 'vector<vector<int>>&'),
+        (f'{side}x{side} char board', json.dumps(board, separators=(',', ':')), 'vector<vector<char>>&'),
+        (f'{size}-char string', json.dumps(''.join(words)[:size]), 'string'),
+    ]
+
+
+def _quiet(func: Callable[[str, str], Any], type_spelling: str) -> Callable[[str], Any]:
+    def call(text: str) -> Any:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(text, type_spelling)
+    return call
+
+
+def run(size: int = 10 ** 5, number: int = 3, rounds: int = 3) -> List[Dict[str, Any]]:
+    """Latency and peak memory of the literal parser vs the character-walking converter per case"""
+    from mysite.views import convert_value_to_type, legacy_convert_value_to_type
+
+    rows = []
+    for name, text, type_spelling in cases(size):
+        row: Dict[str, Any] = {'case': name, 'chars': len(text)}
+        results = {}
+        for label, func in (('legacy', legacy_convert_value_to_type), ('parser', convert_value_to_type)):
+            call = _quiet(func, type_spelling)
+            results[label] = call(text)
+            row[f'{label}_ms'] = measure_latency(call, text, number, rounds) * 1000
+            row[f'{label}_peak'] = measure_peak(call, text)
+        # The old converter gives up on nested types and keeps string escapes, so timings only compare when equal
+        row['same_result'] = results['legacy'] == results['parser']
+        rows.append(row)
+    return rows
@@ -0,0 +1,207 @@
+"""
+WebSocket consumer for the problem editor.
+
+One socket per open editor (ws/leetcode/editor/<question_id>/) carries autosave deltas and Run requests,
+and streams the run back: queue position, running, one message per judged test case, then the result.
+"""
+
+import asyncio
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from .models import JudgeJob
+from .services import harness, judge_queue
+
+
+class EditorConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Client -> server:
+      {"type": "sync", "code", "language"}                  full text; sets version 1
+      {"type": "edit", "base", "ops": [{"at", "remove", "insert"}], "length"}
+      {"type": "run", "language", "title_slug"}             runs the code as last synced/edited
+    Server -> client:
+      saved {version} | resync {version} | queued {job_id, queue_position} | running {job_id}
+      | test {job_id, case, input, expected, output, passed} | result {job_id, status, result, passed, total}
+      | error {error, status}
+
+    Edit offsets and lengths count UTF-16 code units, as the browser does. An edit whose base is not the
+    current version, or which leaves a text of another length, is answered with resync, and the client
+    sends the full text again.
+    """
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if not user or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+        self.user = user
+        self.question_id = self.scope['url_route']['kwargs']['question_id']
+        self.code = None
+        self.language = 'cpp'
+        self.version = 0
+        self.saved_version = 0
+        self.save_task = None
+        self.jobs = {}
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if not hasattr(self, 'user'):
+            return
+        if self.save_task is not None:
+            self.save_task.cancel()
+        await self.flush(reply=False)
+        for job_id, (task, _) in list(self.jobs.items()):
+            task.cancel()
+            await self.channel_layer.group_discard(judge_queue.job_group(job_id), self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        kind = content.get('type')
+        if kind == 'sync':
+            await self.sync(content)
+        elif kind == 'edit':
+            await self.edit(content)
+        elif kind == 'run':
+            await self.run(content)
+        else:
+            await self.send_json({'type': 'error', 'error': f'Unknown message type {kind!r}'})
+
+    # Autosave
+
+    async def sync(self, content):
+        code = content.get('code')
+        if not isinstance(code, str):
+            await self.send_json({'type': 'error', 'error': 'sync needs the code'})
+            return
+        self.code = code
+        self.language = content.get('language') or self.language
+        self.version += 1
+        self.schedule_save()
+
+    async def edit(self, content):
+        code = None
+        if self.code is not None and content.get('base') == self.version:
+            code = apply_ops(self.code, content.get('ops') or [], content.get('length'))
+        if code is None:
+            await self.send_json({'type': 'resync', 'version': self.version})
+            return
+        self.code = code
+        self.version += 1
+        self.schedule_save()
+
+    def schedule_save(self):
+        # Coalesce a burst of edits into one write per LEETCODE_EDITOR_AUTOSAVE_SECONDS
+        if self.save_task is None or self.save_task.done():
+            self.save_task = asyncio.ensure_future(self.save_later())
+
+    async def save_later(self):
+        await asyncio.sleep(getattr(settings, 'LEETCODE_EDITOR_AUTOSAVE_SECONDS', 2))
+        await self.flush()
+
+    async def flush(self, reply=True):
+        if self.code is None or self.version == self.saved_version:
+            return
+        version = self.version
+        if self.code.strip():
+            await self.save_code(self.code, self.language)
+        self.saved_version = version
+        if reply:
+            await self.send_json({'type': 'saved', 'version': version})
+
+    @database_sync_to_async
+    def save_code(self, code, language):
+        from polls.models import UserCodeSubmission
+        UserCodeSubmission.objects.update_or_create(
+            user=self.user, question_id=self.question_id, defaults={'code': code, 'language': language},
+        )
+
+    # Runs
+
+    async def run(self, content):
+        if not (self.code or '').strip():
+            await self.send_json({'type': 'error', 'error': 'No code provided', 'status': 400})
+            return
+        language = content.get('language') or self.language
+        if language != self.language:
+            self.language = language
+            self.saved_version = 0
+        await self.flush()
+        try:
+            job = await self.submit(self.code, language, content.get('title_slug'))
+        except judge_queue.Rejected as exc:
+            await self.send_json({'type': 'error', 'error': str(exc), 'status': 429})
+            return
+        job_id = str(job.pk)
+        wake = asyncio.Event()
+        await self.channel_layer.group_add(judge_queue.job_group(job_id), self.channel_name)
+        self.jobs[job_id] = (asyncio.ensure_future(self.follow(job_id, wake)), wake)
+
+    @database_sync_to_async
+    def submit(self, code, language, title_slug):
+        # The stdin-harness pipeline: its report ("Test Case N:" blocks) is what send_result splits into tests
+        return judge_queue.submit('project', code, language, self.question_id, title_slug, user=self.user)
+
+    @database_sync_to_async
+    def job_state(self, job_id):
+        job = JudgeJob.objects.get(pk=job_id)
+        return job, judge_queue.payload(job)
+
+    async def follow(self, job_id, wake):
+        """Send each state change of a job until it finishes; wakes on judge.update, else re-reads on a timer"""
+        sent = None
+        delay = getattr(settings, 'LEETCODE_EDITOR_POLL_SECONDS', 1)
+        try:
+            while True:
+                job, state = await self.job_state(job_id)
+                if job.finished:
+                    await self.send_result(job_id, state)
+                    return
+                message = {'type': job.status, 'job_id': job_id}
+                if job.status == JudgeJob.QUEUED:
+                    message['queue_position'] = state['queue_position']
+                if message != sent:
+                    await self.send_json(message)
+                    sent = message
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    delay = min(delay * 1.5, 5)
+                wake.clear()
+        finally:
+            self.jobs.pop(job_id, None)
+            await self.channel_layer.group_discard(judge_queue.job_group(job_id), self.channel_name)
+
+    async def send_result(self, job_id, state):
+        result = state.get('result') or dict(judge_queue.UNAVAILABLE)
+        cases = harness.parse_report(result.get('output') or '') if result.get('success') else []
+        for case in cases:
+            await self.send_json({'type': 'test', 'job_id': job_id, **case})
+        await self.send_json({
+            'type': 'result', 'job_id': job_id, 'status': state['status'], 'result': result,
+            'passed': sum(case['passed'] for case in cases), 'total': len(cases),
+        })
+
+    async def judge_update(self, event):
+        """judge_queue.notify: wake the follower of that job"""
+        followed = self.jobs.get(event['job_id'])
+        if followed is not None:
+            followed[1].set()
+
+
+def apply_ops(code, ops, length=None):
+    """Apply [{"at", "remove", "insert"}, ...] in order; None when an op is out of range or the length is off"""
+    if len(code.encode('utf-16-le')) != 2 * len(code):
+        # Characters outside the BMP make browser offsets and str indexes disagree: ask for the full text
+        return None
+    for op in ops:
+        try:
+            at, remove, insert = int(op['at']), int(op.get('remove', 0)), str(op.get('insert', ''))
+        except (KeyError, TypeError, ValueError):
+            return None
+        if at < 0 or remove < 0 or at + remove > len(code) or len(insert.encode('utf-16-le')) != 2 * len(insert):
+            return None
+        code = code[:at] + insert + code[at + remove:]
+    if length is not None and len(code.encode('utf-16-le')) != 2 * length:
+        return None
+    return code
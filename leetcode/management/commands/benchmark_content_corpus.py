@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from leetcode.benchmarks import content as content_bench
+
+
+class Command(BaseCommand):
+    help = (
+        "Run parse_leetcode_content over the recorded problem corpus (leetcode/benchmarks/corpus). "
+        "Reports per-document latency (as a ratio to the BeautifulSoup parser timed in the same run) and peak "
+        "allocations and fails when either regresses past its tolerance over the recorded baseline, or when a "
+        "parsed output differs from its golden file (the BeautifulSoup parser's output)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=20, help='Calls per timed round')
+        parser.add_argument('--rounds', type=int, default=5, help='Timed rounds per document (best is kept)')
+        parser.add_argument('--latency-tolerance', type=float, default=content_bench.LATENCY_TOLERANCE,
+                            help='Allowed growth of the latency ratio to legacy over baseline, as a fraction')
+        parser.add_argument('--allocation-tolerance', type=float, default=content_bench.ALLOCATION_TOLERANCE,
+                            help='Allowed peak-allocation growth over baseline, as a fraction')
+        parser.add_argument('--update-baseline', action='store_true', help='Record this run as the new baseline')
+        parser.add_argument('--update-golden', action='store_true', help='Rewrite golden outputs from the legacy parser')
+
+    def handle(self, *args, **options):
+        documents = content_bench.load_corpus()
+        if not documents:
+            raise CommandError(f"No corpus documents in {content_bench.CORPUS_DIR}")
+        parser = content_bench.default_parser()
+        if options['update_golden']:
+            reference = content_bench.reference_parser()
+            for document in documents:
+                content_bench.write_golden(document, reference(document.html))
+            self.stdout.write(f"Wrote {len(documents)} golden outputs")
+
+        baseline = {} if options['update_baseline'] else content_bench.load_baseline()
+        results = [
+            content_bench.check_document(
+                document, parser, baseline,
+                number=options['number'], rounds=options['rounds'],
+                latency_tolerance=options['latency_tolerance'],
+                allocation_tolerance=options['allocation_tolerance'],
+            )
+            for document in documents
+        ]
+        for result in results:
+            status = 'ok' if result.ok else 'FAIL'
+            notes = list(result.regressions)
+            if result.output_matches is False:
+                notes.append('output differs from golden')
+            elif result.output_matches is None:
+                notes.append('no golden output')
+            self.stdout.write(
+                f"{status:4} {result.name}: {result.latency * 1000:.3f} ms ({result.latency_ratio:.3f}x legacy "
+                f"{result.reference_latency * 1000:.3f} ms), peak {result.peak_bytes / 1024:.1f} KiB"
+                + (f" ({'; '.join(notes)})" if notes else '')
+            )
+
+        if options['update_baseline']:
+            content_bench.write_baseline(results)
+            self.stdout.write(f"Recorded baseline for {len(results)} documents")
+        failed = [result.name for result in results if not result.ok]
+        if failed:
+            raise CommandError(f"{len(failed)} of {len(results)} documents regressed: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f"{len(results)} documents within budget"))
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from leetcode.benchmarks import content as content_bench
+from leetcode.services.leetcode_api import LeetCodeAPI
+from mysite.views import legacy_parse_leetcode_content, parse_leetcode_content
+
+PARSERS = (
+    ('legacy', legacy_parse_leetcode_content),
+    ('single-pass', parse_leetcode_content),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare latency and peak memory of the BeautifulSoup content parser with the single-pass "
+        "extractor on real problem pages (HTML files and/or problems fetched from LeetCode by slug)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help='HTML files holding problem content')
+        parser.add_argument('--slug', action='append', default=[], help='Fetch this problem from LeetCode (repeatable)')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed calls per round, per parser and page')
+
+    def handle(self, *args, **options):
+        pages = []
+        for name in options['files']:
+            pages.append((Path(name).stem, Path(name).read_text(encoding='utf-8')))
+        api = LeetCodeAPI()
+        for slug in options['slug']:
+            resp = api.fetch_question_content(slug)
+            question = ((resp.data or {}).get('data') or {}).get('question') if resp.ok else None
+            if not question or not question.get('content'):
+                raise CommandError(f"Could not fetch content for {slug}: {resp.error or 'empty response'}")
+            pages.append((slug, question['content']))
+        if not pages:
+            raise CommandError("Pass HTML files and/or --slug")
+
+        repeat = max(1, options['repeat'])
+        totals = {name: [0.0, 0] for name, _ in PARSERS}
+        for page, html in pages:
+            results = {}
+            line = [f"{page} ({len(html)} chars):"]
+            for name, parser in PARSERS:
+                results[name] = parser(html)
+                latency = content_bench.measure_latency(parser, html, number=repeat)
+                peak = content_bench.measure_peak(parser, html)
+                totals[name][0] += latency
+                totals[name][1] = max(totals[name][1], peak)
+                line.append(f"{name} {latency * 1000:.3f} ms, peak {peak / 1024:.1f} KiB;")
+            line.append('output matches' if results['legacy'] == results['single-pass'] else 'OUTPUT DIFFERS')
+            self.stdout.write(' '.join(line))
+
+        legacy_latency, legacy_peak = totals['legacy']
+        latency, peak = totals['single-pass']
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(pages)} pages: latency {legacy_latency * 1000:.3f} -> {latency * 1000:.3f} ms "
+            f"({legacy_latency / latency if latency else 0:.1f}x), max peak {legacy_peak / 1024:.1f} -> {peak / 1024:.1f} KiB"
+        ))
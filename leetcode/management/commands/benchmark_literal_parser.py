@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from leetcode.benchmarks import literals as literal_bench
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the recursive-descent test-case literal parser with the character-walking "
+        "convert_value_to_type on large inputs (10^5-element arrays, grids, long strings)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=10 ** 5, help='Elements per array case')
+        parser.add_argument('--number', type=int, default=3, help='Calls per timed round')
+        parser.add_argument('--rounds', type=int, default=3, help='Timed rounds (best is kept)')
+
+    def handle(self, *args, **options):
+        for row in literal_bench.run(size=options['size'], number=options['number'], rounds=options['rounds']):
+            speedup = row['legacy_ms'] / row['parser_ms'] if row['parser_ms'] else 0
+            self.stdout.write(
+                f"{row['case']} ({row['chars']} chars): legacy {row['legacy_ms']:.2f} ms, "
+                f"peak {row['legacy_peak'] / 1024:.0f} KiB; parser {row['parser_ms']:.2f} ms, "
+                f"peak {row['parser_peak'] / 1024:.0f} KiB "
+                + (f"({speedup:.1f}x)" if row['same_result'] else "(legacy result differs: not comparable)")
+            )
@@ -0,0 +1,73 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from leetcode.services import execution, judge_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Execute queued JudgeJob rows (LEETCODE_JUDGE_MODE=worker). Each worker thread claims the oldest queued "
+        "job with a conditional update, so any number of these processes can share the table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Worker threads in this process')
+        parser.add_argument('--poll-interval', type=float, default=0.5, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--stale-after', type=int, default=settings.LEETCODE_JUDGE_STALE_SECONDS,
+                            help='Requeue jobs left running this many seconds by a dead worker')
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit')
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        counts = []
+        lock = threading.Lock()
+
+        def work():
+            done = 0
+            try:
+                while not stop.is_set():
+                    close_old_connections()
+                    job = judge_queue.claim_next()
+                    if job is None:
+                        if options['once']:
+                            break
+                        stop.wait(options['poll_interval'])
+                        continue
+                    judge_queue.execute(job)
+                    done += 1
+            finally:
+                connection.close()
+                with lock:
+                    counts.append(done)
+
+        # Start the execution backend (and its sandbox pool, for the local one) before the first job needs it
+        execution.get_backend()
+        requeued = judge_queue.requeue_stale(timedelta(seconds=options['stale_after']))
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale jobs")
+        purged = judge_queue.purge_finished()
+        if purged:
+            self.stdout.write(f"Purged {purged} finished jobs")
+        threads = [threading.Thread(target=work, name=f"judge-{i}", daemon=True) for i in range(max(1, options['workers']))]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f"{len(threads)} judge workers running")
+        stale_after = timedelta(seconds=options['stale_after'])
+        next_sweep = time.monotonic() + options['stale_after']
+        try:
+            while any(thread.is_alive() for thread in threads):
+                time.sleep(0.2)
+                if time.monotonic() >= next_sweep:
+                    judge_queue.requeue_stale(stale_after)
+                    judge_queue.purge_finished()
+                    next_sweep = time.monotonic() + options['stale_after']
+        except KeyboardInterrupt:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        self.stdout.write(self.style.SUCCESS(f"Executed {sum(counts)} jobs"))
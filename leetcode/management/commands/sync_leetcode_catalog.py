@@ -0,0 +1,105 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+
+from leetcode.models import CatalogPage
+from leetcode.services import catalog
+from leetcode.services.leetcode_api import LeetCodeAPI
+
+
+class Command(BaseCommand):
+    help = (
+        "Sync the local LeetCode problem catalog. Pages are fetched in parallel and bulk-upserted. "
+        "Later runs only fetch the first page, the previous last page and any new pages, falling back "
+        "to a full sync if those show the problemset shifted; use --full to refresh every page "
+        "(including acceptance rates)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Number of parallel page fetches')
+        parser.add_argument('--page-size', type=int, default=100, help='Problems per questionList request')
+        parser.add_argument('--full', action='store_true', help='Fetch every page even if nothing changed')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        page_size = max(1, options['page_size'])
+        started = time.monotonic()
+        self.api = LeetCodeAPI()
+        self.requests_made = 0
+
+        total, first_rows = self._fetch_page(0, page_size)
+        self.requests_made += 1
+        if total is None:
+            raise CommandError(f"Could not fetch the first problemset page: {first_rows}")
+
+        all_skips = list(range(0, total, page_size))
+        fetched = {0: first_rows}
+        stored = {page.skip: page for page in CatalogPage.objects.filter(page_size=page_size)}
+
+        mode = 'full'
+        if not options['full'] and 0 in stored:
+            stored_total = max(page.total_num for page in stored.values())
+            # A shrunken problemset or a changed first page means rows moved: every stored page is suspect
+            if total >= stored_total and catalog.page_hash(first_rows) == stored[0].content_hash:
+                mode = 'incremental'
+
+        if mode == 'full':
+            pending = [skip for skip in all_skips if skip != 0]
+        else:
+            # New problems are appended, so only the old last page (the probe) and anything after it can change
+            probe = max(stored)
+            pending = [skip for skip in all_skips if skip >= probe and skip != 0]
+        fetched.update(self._fetch_pages(pending, page_size, workers))
+
+        if mode == 'incremental' and probe + page_size <= stored_total and probe in fetched:
+            # The probe page was full last time, so a different hash means rows shifted: fall back to a full sync
+            if catalog.page_hash(fetched[probe]) != stored[probe].content_hash:
+                mode = 'full'
+                remaining = [skip for skip in all_skips if skip not in fetched]
+                fetched.update(self._fetch_pages(remaining, page_size, workers))
+
+        written = 0
+        for skip in sorted(fetched):
+            rows = fetched[skip]
+            content_hash = catalog.page_hash(rows)
+            page = stored.get(skip)
+            if page is not None and page.content_hash == content_hash and mode == 'incremental':
+                continue
+            written += catalog.upsert_problems(rows)
+            CatalogPage.objects.update_or_create(
+                skip=skip,
+                defaults={'page_size': page_size, 'content_hash': content_hash, 'total_num': total},
+            )
+        CatalogPage.objects.filter(page_size=page_size).update(total_num=total)
+        CatalogPage.objects.exclude(page_size=page_size).delete()
+        CatalogPage.objects.filter(skip__gte=total).delete()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode.capitalize()} sync: {total} problems, {self.requests_made} requests, "
+            f"{written} rows written in {elapsed:.1f}s"
+        ))
+
+    def _fetch_page(self, skip, page_size):
+        """Return (totalNum, rows) for one page, or (None, error) on failure"""
+        resp = self.api.fetch_problemset(skip=skip, limit=page_size)
+        if not resp.ok or not resp.data:
+            return None, resp.error or 'empty response'
+        problemset = ((resp.data.get('data') or {}).get('problemsetQuestionList') or {})
+        return int(problemset.get('total') or 0), problemset.get('questions') or []
+
+    def _fetch_pages(self, skips, page_size, workers):
+        pages = {}
+        if not skips:
+            return pages
+        self.requests_made += len(skips)
+        with ThreadPoolExecutor(max_workers=min(workers, len(skips))) as pool:
+            futures = {pool.submit(self._fetch_page, skip, page_size): skip for skip in skips}
+            for future in as_completed(futures):
+                skip = futures[future]
+                total, rows = future.result()
+                if total is None:
+                    raise CommandError(f"Failed to fetch problemset page at skip={skip}: {rows}")
+                pages[skip] = rows
+        return pages
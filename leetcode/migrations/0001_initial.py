@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Problem',
+            fields=[
+                ('frontend_id', models.PositiveIntegerField(help_text='LeetCode frontend question id (e.g. 1 for Two Sum)', primary_key=True, serialize=False)),
+                ('title_slug', models.SlugField(help_text='LeetCode title slug used by the GraphQL API', max_length=200, unique=True)),
+                ('title', models.CharField(max_length=255)),
+                ('difficulty', models.CharField(db_index=True, help_text='Easy, Medium or Hard', max_length=10)),
+                ('ac_rate', models.FloatField(default=0, help_text='Acceptance rate in percent')),
+                ('paid_only', models.BooleanField(db_index=True, default=False)),
+                ('tags', models.JSONField(blank=True, default=list, help_text='Topic tag names')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['frontend_id'],
+            },
+        ),
+    ]
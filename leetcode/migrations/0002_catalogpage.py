@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leetcode', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogPage',
+            fields=[
+                ('skip', models.PositiveIntegerField(help_text='Offset of the page in the problemset', primary_key=True, serialize=False)),
+                ('page_size', models.PositiveIntegerField()),
+                ('content_hash', models.CharField(help_text="SHA-256 of the page's stable fields", max_length=64)),
+                ('total_num', models.PositiveIntegerField(help_text='Problemset totalNum reported when the page was synced')),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['skip'],
+            },
+        ),
+    ]
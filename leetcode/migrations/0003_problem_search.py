@@ -0,0 +1,93 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Full-text index over title and tags. SQLite gets an external-content FTS5 table kept in sync
+# by triggers; Postgres gets a GIN expression index matched by leetcode.services.search.
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE leetcode_problem_fts USING fts5(title, tags, content='leetcode_problem', content_rowid='frontend_id')",
+    """CREATE TRIGGER leetcode_problem_fts_ai AFTER INSERT ON leetcode_problem BEGIN
+        INSERT INTO leetcode_problem_fts(rowid, title, tags) VALUES (new.frontend_id, new.title, new.tags);
+    END""",
+    """CREATE TRIGGER leetcode_problem_fts_ad AFTER DELETE ON leetcode_problem BEGIN
+        INSERT INTO leetcode_problem_fts(leetcode_problem_fts, rowid, title, tags) VALUES ('delete', old.frontend_id, old.title, old.tags);
+    END""",
+    """CREATE TRIGGER leetcode_problem_fts_au AFTER UPDATE ON leetcode_problem BEGIN
+        INSERT INTO leetcode_problem_fts(leetcode_problem_fts, rowid, title, tags) VALUES ('delete', old.frontend_id, old.title, old.tags);
+        INSERT INTO leetcode_problem_fts(rowid, title, tags) VALUES (new.frontend_id, new.title, new.tags);
+    END""",
+    "INSERT INTO leetcode_problem_fts(leetcode_problem_fts) VALUES ('rebuild')",
+]
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS leetcode_problem_fts_ai",
+    "DROP TRIGGER IF EXISTS leetcode_problem_fts_ad",
+    "DROP TRIGGER IF EXISTS leetcode_problem_fts_au",
+    "DROP TABLE IF EXISTS leetcode_problem_fts",
+]
+POSTGRES_FTS = [
+    "CREATE INDEX leetcode_problem_fts_idx ON leetcode_problem USING GIN (to_tsvector('simple', title || ' ' || tags::text))",
+]
+POSTGRES_FTS_DROP = [
+    "DROP INDEX IF EXISTS leetcode_problem_fts_idx",
+]
+
+
+def _run(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def create_fts(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                return  # search falls back to LIKE on builds without FTS5
+        _run(schema_editor, SQLITE_FTS)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FTS)
+
+
+def drop_fts(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FTS_DROP)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FTS_DROP)
+
+
+def populate_tags(apps, schema_editor):
+    Problem = apps.get_model('leetcode', 'Problem')
+    ProblemTag = apps.get_model('leetcode', 'ProblemTag')
+    rows = [
+        ProblemTag(name=name, problem_id=problem.frontend_id)
+        for problem in Problem.objects.only('frontend_id', 'tags').iterator()
+        for name in set(problem.tags or [])
+    ]
+    ProblemTag.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leetcode', '0002_catalogpage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProblemTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('problem', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_rows', to='leetcode.problem')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('name', 'problem'), name='leetcode_problemtag_name_problem_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_tags, migrations.RunPython.noop),
+        migrations.RunPython(create_fts, drop_fts),
+    ]
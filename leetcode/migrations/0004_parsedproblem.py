@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leetcode', '0003_problem_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParsedProblem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(help_text='SHA-256 of the raw LeetCode content', max_length=64)),
+                ('parser_version', models.PositiveSmallIntegerField(help_text='Bumped when the parser output changes')),
+                ('title_slug', models.SlugField(blank=True, max_length=200)),
+                ('description', models.TextField()),
+                ('examples', models.JSONField(blank=True, default=list)),
+                ('constraints', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('content_hash', 'parser_version'), name='leetcode_parsedproblem_hash_version_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:58
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leetcode', '0004_parsedproblem'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JudgeJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('runner', models.CharField(help_text='Key of the pipeline in judge_queue.RUNNERS', max_length=32)),
+                ('language', models.CharField(default='cpp', max_length=20)),
+                ('question_id', models.CharField(default='1', max_length=20)),
+                ('title_slug', models.SlugField(blank=True, max_length=200)),
+                ('code', models.TextField()),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('result', models.JSONField(blank=True, help_text='The execution result dict once the job is done', null=True)),
+                ('error', models.TextField(blank=True, help_text='Why the worker failed, when status is failed')),
+                ('worker', models.CharField(blank=True, help_text='Worker that claimed the job', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='judge_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='leetcode_judgejob_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leetcode', '0005_judgejob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='judgejob',
+            name='fair_finish',
+            field=models.FloatField(default=0.0, help_text="fair_start + 1/weight; the flow's next job starts here"),
+        ),
+        migrations.AddField(
+            model_name='judgejob',
+            name='fair_start',
+            field=models.FloatField(default=0.0, help_text='Start-time fair queuing tag; workers claim the smallest'),
+        ),
+        migrations.AddField(
+            model_name='judgejob',
+            name='flow',
+            field=models.CharField(default='anonymous', help_text='Fair-queuing flow: one per user (or session)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='judgejob',
+            name='weight',
+            field=models.FloatField(default=1.0, help_text='Share of the judge this flow gets relative to weight 1'),
+        ),
+        migrations.AddIndex(
+            model_name='judgejob',
+            index=models.Index(fields=['status', 'fair_start'], name='leetcode_judgejob_fair_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='judgejob',
+            index=models.Index(fields=['flow', 'created_at'], name='leetcode_judgejob_flow_idx'),
+        ),
+    ]
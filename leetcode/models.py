@@ -1,3 +1,137 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class Problem(models.Model):
+    """Local copy of the LeetCode problemset, keyed by frontend question id"""
+    frontend_id = models.PositiveIntegerField(primary_key=True, help_text="LeetCode frontend question id (e.g. 1 for Two Sum)")
+    title_slug = models.SlugField(max_length=200, unique=True, help_text="LeetCode title slug used by the GraphQL API")
+    title = models.CharField(max_length=255)
+    difficulty = models.CharField(max_length=10, db_index=True, help_text="Easy, Medium or Hard")
+    ac_rate = models.FloatField(default=0, help_text="Acceptance rate in percent")
+    paid_only = models.BooleanField(default=False, db_index=True)
+    tags = models.JSONField(default=list, blank=True, help_text="Topic tag names")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['frontend_id']
+
+    def __str__(self):
+        return f"{self.frontend_id}. {self.title}"
+
+    @property
+    def leetcode_url(self):
+        return f"https://leetcode.com/problems/{self.title_slug}"
+
+    def as_question_info(self):
+        """Return the problem in the shape of a LeetCode questionList row"""
+        return {
+            'frontendQuestionId': str(self.frontend_id),
+            'title': self.title,
+            'titleSlug': self.title_slug,
+            'difficulty': self.difficulty,
+            'acRate': self.ac_rate,
+            'paidOnly': self.paid_only,
+            'topicTags': [{'name': name} for name in self.tags],
+        }
+
+
+class ProblemTag(models.Model):
+    """One row per (tag, problem) so tag filters hit an index instead of scanning the JSON tags"""
+    name = models.CharField(max_length=100)
+    problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name='tag_rows')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'problem'], name='leetcode_problemtag_name_problem_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.problem_id})"
+
+
+class CatalogPage(models.Model):
+    """Sync state for one page of the LeetCode problemset, used for incremental catalog syncs"""
+    skip = models.PositiveIntegerField(primary_key=True, help_text="Offset of the page in the problemset")
+    page_size = models.PositiveIntegerField()
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 of the page's stable fields")
+    total_num = models.PositiveIntegerField(help_text="Problemset totalNum reported when the page was synced")
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['skip']
+
+    def __str__(self):
+        return f"Catalog page @{self.skip} ({self.page_size})"
+
+
+class ParsedProblem(models.Model):
+    """Description, examples and constraints parsed from one version of a problem's HTML content"""
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 of the raw LeetCode content")
+    parser_version = models.PositiveSmallIntegerField(help_text="Bumped when the parser output changes")
+    title_slug = models.SlugField(max_length=200, blank=True, db_index=True)
+    description = models.TextField()
+    examples = models.JSONField(default=list, blank=True)
+    constraints = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['content_hash', 'parser_version'], name='leetcode_parsedproblem_hash_version_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.title_slug or self.content_hash[:12]} (parser v{self.parser_version})"
+
+    def as_parsed_content(self):
+        """Return the artifact in the shape produced by parse_leetcode_content"""
+        return {
+            'description': self.description,
+            'examples': self.examples,
+            'constraints': self.constraints,
+        }
+
+
+class JudgeJob(models.Model):
+    """One Run request: queued by compile_code, executed by a judge worker, polled by the editor"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE, related_name='judge_jobs')
+    flow = models.CharField(max_length=64, default='anonymous', help_text="Fair-queuing flow: one per user (or session)")
+    weight = models.FloatField(default=1.0, help_text="Share of the judge this flow gets relative to weight 1")
+    fair_start = models.FloatField(default=0.0, help_text="Start-time fair queuing tag; workers claim the smallest")
+    fair_finish = models.FloatField(default=0.0, help_text="fair_start + 1/weight; the flow's next job starts here")
+    runner = models.CharField(max_length=32, help_text="Key of the pipeline in judge_queue.RUNNERS")
+    language = models.CharField(max_length=20, default='cpp')
+    question_id = models.CharField(max_length=20, default='1')
+    title_slug = models.SlugField(max_length=200, blank=True)
+    code = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    result = models.JSONField(null=True, blank=True, help_text="The execution result dict once the job is done")
+    error = models.TextField(blank=True, help_text="Why the worker failed, when status is failed")
+    worker = models.CharField(max_length=100, blank=True, help_text="Worker that claimed the job")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='leetcode_judgejob_status_idx'),
+            models.Index(fields=['status', 'fair_start'], name='leetcode_judgejob_fair_idx'),
+            models.Index(fields=['flow', 'created_at'], name='leetcode_judgejob_flow_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.runner} job {self.id} ({self.status})"
+
+    @property
+    def finished(self):
+        return self.status in (self.DONE, self.FAILED)
@@ -0,0 +1,10 @@
+"""
+WebSocket URL routing for the leetcode app.
+"""
+
+from django.urls import re_path
+from . import consumers
+
+websocket_urlpatterns = [
+    re_path(r'ws/leetcode/editor/(?P<question_id>[\w-]+)/$', consumers.EditorConsumer.as_asgi()),
+]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable, Dict
+
+from ..models import ParsedProblem
+from . import tiered_cache
+
+# Bump whenever the parser's output for the same HTML changes; older artifacts are then ignored
+PARSER_VERSION = 3
+
+ParsedContent = Dict[str, Any]
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _load_or_parse(digest: str, content: str, parser: Callable[[str], ParsedContent], title_slug: str) -> ParsedContent:
+    artifact = ParsedProblem.objects.filter(content_hash=digest, parser_version=PARSER_VERSION).first()
+    if artifact is not None:
+        return artifact.as_parsed_content()
+    parsed = parser(content)
+    if not str(parsed.get('description', '')).startswith('Error parsing content'):
+        # ignore_conflicts: another worker may have stored the same artifact meanwhile
+        ParsedProblem.objects.bulk_create([ParsedProblem(
+            content_hash=digest,
+            parser_version=PARSER_VERSION,
+            title_slug=title_slug or '',
+            description=parsed.get('description', ''),
+            examples=parsed.get('examples', []),
+            constraints=parsed.get('constraints', []),
+        )], ignore_conflicts=True)
+    return parsed
+
+
+def get_parsed_content(content: str, parser: Callable[[str], ParsedContent], title_slug: str = '') -> ParsedContent:
+    """Parsed description/examples/constraints for content, parsing only when this HTML was never seen.
+
+    Artifacts are stored per content hash, so a problem is re-parsed only when LeetCode changes
+    its HTML (or PARSER_VERSION is bumped). Hot artifacts are also kept in the two-tier cache.
+    """
+    if not content:
+        return parser(content)
+    digest = content_hash(content)
+    return tiered_cache.get_cache('parsed').get_or_compute(
+        f"v{PARSER_VERSION}:{digest}",
+        lambda: _load_or_parse(digest, content, parser, title_slug),
+    )
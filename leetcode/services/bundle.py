@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from . import tiered_cache
+from .leetcode_api import LeetCodeAPI
+
+
+@dataclass
+class ProblemBundle:
+    """Everything the compile path needs about one problem, fetched in a single questionContent query.
+
+    method_name and signature are filled in by the caller from the C++ snippet so every stage
+    (simulation data, wrapper generation, test-case parsing) reuses the same detection.
+    """
+
+    question_id: str
+    title_slug: str
+    title: str = ""
+    difficulty: str = ""
+    content: str = ""
+    example_testcases: str = ""
+    code_snippets: List[Dict[str, Any]] = field(default_factory=list)
+    method_name: str = "solve"
+    signature: Optional[Dict[str, Any]] = None
+
+    @property
+    def cpp_snippet(self) -> str:
+        for snippet in self.code_snippets:
+            if snippet.get("langSlug") == "cpp" or snippet.get("lang") in ("cpp", "C++"):
+                return snippet.get("code") or ""
+        return ""
+
+    def as_simulation_data(self) -> Dict[str, Any]:
+        """Shape returned by the legacy fetch_leetcode_data_for_simulation"""
+        return {
+            "example_testcases": self.example_testcases,
+            "method_name": self.method_name,
+            "title": self.title,
+            "difficulty": self.difficulty,
+        }
+
+
+def _fetch(question_id: str, title_slug: str) -> Optional[ProblemBundle]:
+    resp = LeetCodeAPI().fetch_question_content(title_slug)
+    if not resp.ok or not resp.data:
+        return None
+    question = (resp.data.get("data") or {}).get("question")
+    if not question:
+        return None
+    return ProblemBundle(
+        question_id=str(question.get("questionFrontendId") or question_id),
+        title_slug=question.get("titleSlug") or title_slug,
+        title=question.get("title") or "",
+        difficulty=question.get("difficulty") or "",
+        content=question.get("content") or "",
+        example_testcases=question.get("exampleTestcases") or "",
+        code_snippets=question.get("codeSnippets") or [],
+    )
+
+
+def fetch_problem_bundle(question_id: str, title_slug: str) -> Optional[ProblemBundle]:
+    """Return the bundle for title_slug, making at most one upstream request (none when cached)"""
+    return tiered_cache.bundles().get_or_compute(title_slug, lambda: _fetch(str(question_id), title_slug))
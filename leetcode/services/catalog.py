@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+from ..models import Problem, ProblemTag
+
+# Fields of a questionList row needed to build a catalog entry
+QUESTION_LIST_FIELDS = """
+    acRate
+    difficulty
+    frontendQuestionId: questionFrontendId
+    paidOnly: isPaidOnly
+    title
+    titleSlug
+    topicTags { name }
+"""
+
+VERSION_KEY = 'leetcode:catalog:version'
+_UPDATE_FIELDS = ['title_slug', 'title', 'difficulty', 'ac_rate', 'paid_only', 'tags']
+
+
+def _parse_frontend_id(question_id: Any) -> Optional[int]:
+    try:
+        value = int(str(question_id).strip())
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def problem_from_api(row: Dict[str, Any]) -> Optional[Problem]:
+    """Build an unsaved Problem from a LeetCode questionList row, or None if the row is unusable"""
+    if not row or not isinstance(row, dict):
+        return None
+    frontend_id = _parse_frontend_id(row.get('frontendQuestionId'))
+    title_slug = row.get('titleSlug') or ''
+    if frontend_id is None or not title_slug:
+        return None
+    topic_tags = row.get('topicTags') or []
+    tags = [tag.get('name', '') for tag in topic_tags if tag and isinstance(tag, dict) and tag.get('name')]
+    return Problem(
+        frontend_id=frontend_id,
+        title_slug=title_slug,
+        title=row.get('title') or title_slug,
+        difficulty=row.get('difficulty') or '',
+        ac_rate=float(row.get('acRate') or 0),
+        paid_only=bool(row.get('paidOnly', row.get('isPaidOnly', False))),
+        tags=tags,
+    )
+
+
+def upsert_problems(rows: Iterable[Dict[str, Any]]) -> int:
+    """Insert or update catalog entries from questionList rows; returns the number of rows written"""
+    problems: Dict[int, Problem] = {}
+    by_slug: Dict[str, int] = {}
+    for row in rows:
+        problem = problem_from_api(row)
+        if problem is None:
+            continue
+        # A slug listed twice in one batch: the later row wins, as for a repeated frontend id
+        previous = by_slug.get(problem.title_slug)
+        if previous is not None and previous != problem.frontend_id:
+            del problems[previous]
+        problems[problem.frontend_id] = problem
+        by_slug[problem.title_slug] = problem.frontend_id
+    if not problems:
+        return 0
+    with transaction.atomic():
+        _release_slugs(by_slug)
+        Problem.objects.bulk_create(
+            list(problems.values()),
+            update_conflicts=True,
+            unique_fields=['frontend_id'],
+            update_fields=_UPDATE_FIELDS,
+        )
+        ProblemTag.objects.filter(problem_id__in=problems).delete()
+        ProblemTag.objects.bulk_create([
+            ProblemTag(name=name, problem_id=frontend_id)
+            for frontend_id, problem in problems.items()
+            for name in set(problem.tags)
+        ])
+    bump_version()
+    return len(problems)
+
+
+def _release_slugs(by_slug: Dict[str, int]) -> None:
+    """Free slugs the batch assigns to other problems than the rows holding them now.
+
+    The upsert only resolves conflicts on frontend_id, so a reassigned slug would violate the title_slug
+    constraint. Holders that are in the batch get a placeholder and their new slug from the upsert
+    (placeholders also make slug swaps safe); holders that are not are stale and dropped until their page
+    is synced again.
+    """
+    stale = [
+        (frontend_id, slug)
+        for frontend_id, slug in Problem.objects.filter(title_slug__in=by_slug).values_list('frontend_id', 'title_slug')
+        if by_slug[slug] != frontend_id
+    ]
+    if not stale:
+        return
+    Problem.objects.filter(pk__in=[pk for pk, _ in stale]).exclude(pk__in=by_slug.values()).delete()
+    for frontend_id in {pk for pk, _ in stale} & set(by_slug.values()):
+        Problem.objects.filter(pk=frontend_id).update(title_slug=f"stale-slug-{frontend_id}")
+
+
+def catalog_version() -> str:
+    """Opaque token that changes whenever the catalog is written; keys cached counts and tag lists"""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = bump_version()
+    return version
+
+
+def bump_version() -> str:
+    version = str(time.time_ns())
+    cache.set(VERSION_KEY, version, None)
+    return version
+
+
+def get_problem(question_id: Any) -> Optional[Problem]:
+    """Look up a catalog entry by frontend question id"""
+    frontend_id = _parse_frontend_id(question_id)
+    if frontend_id is None:
+        return None
+    return Problem.objects.filter(pk=frontend_id).first()
+
+
+def get_title_slug(question_id: Any) -> Optional[str]:
+    """Map a frontend question id to its title slug with a single primary-key lookup"""
+    frontend_id = _parse_frontend_id(question_id)
+    if frontend_id is None:
+        return None
+    return Problem.objects.filter(pk=frontend_id).values_list('title_slug', flat=True).first()
+
+
+def get_question_info(question_id: Any) -> Optional[Dict[str, Any]]:
+    """Return the catalog entry as a questionList-shaped dict"""
+    problem = get_problem(question_id)
+    return problem.as_question_info() if problem else None
+
+
+def catalog_size() -> int:
+    return Problem.objects.count()
+
+
+def find_in_rows(rows: List[Dict[str, Any]], question_id: Any) -> Optional[Dict[str, Any]]:
+    """Find the questionList row with the given frontend id"""
+    frontend_id = _parse_frontend_id(question_id)
+    if frontend_id is None:
+        return None
+    for row in rows:
+        if row and _parse_frontend_id(row.get('frontendQuestionId')) == frontend_id:
+            return row
+    return None
+
+
+def page_hash(rows: Iterable[Dict[str, Any]]) -> str:
+    """Hash the stable fields of a questionList page (acRate is left out because it drifts constantly)"""
+    stable = []
+    for row in rows:
+        problem = problem_from_api(row)
+        if problem is not None:
+            stable.append([problem.frontend_id, problem.title_slug, problem.title,
+                           problem.difficulty, problem.paid_only, problem.tags])
+    return hashlib.sha256(json.dumps(stable, separators=(',', ':')).encode('utf-8')).hexdigest()
@@ -0,0 +1,471 @@
+from __future__ import annotations
+
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Union
+
+ParsedContent = Dict[str, Any]
+
+VOID_TAGS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr',
+})
+# Text below these is not part of get_text(); script and style text is also written out unescaped
+_SKIP_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+_RAW_TEXT_TAGS = frozenset({'script', 'style'})
+_PRESERVE_WHITESPACE_TAGS = frozenset({'pre', 'textarea'})
+# Attributes the tree builder stores as lists of words
+_MULTI_VALUED_ATTRS = {
+    '*': frozenset({'class', 'accesskey', 'dropzone'}),
+    'a': frozenset({'rel', 'rev'}), 'link': frozenset({'rel', 'rev'}), 'area': frozenset({'rel'}),
+    'td': frozenset({'headers'}), 'th': frozenset({'headers'}), 'form': frozenset({'accept-charset'}),
+    'object': frozenset({'archive'}), 'icon': frozenset({'sizes'}), 'iframe': frozenset({'sandbox'}),
+    'output': frozenset({'for'}),
+}
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+EXAMPLE_MARKERS = ('Example 1:', 'Example 1', 'Example:', 'Input:', 'Examples:')
+CONSTRAINT_KEYWORDS = ('≤', '≥', 'length', 'range', 'constraint', '1 ≤', '0 ≤', 'n ≤', 'm ≤')
+DESCRIPTION_KEYWORDS = ('example', 'constraint', 'follow-up', 'note')
+
+_EXAMPLE_HEADING_RE = re.compile(r'Example\s*\d*', re.I)
+_EXAMPLE_TEXT_RE = re.compile(r'Example\s*\d*[:\s]*(.*?)(?:Input:|Output:|Explanation:)', re.I | re.S)
+_CONSTRAINT_TEXT_RE = re.compile(r'Constraints?[:\s]*(.*?)(?:Example|Follow-up|Note|$)', re.I | re.S)
+_SECTION_SPLIT_RE = re.compile(r'(?:\n\s*\n|Example|Constraints|Follow-up)')
+_BULLET_SPLIT_RE = re.compile(r'[•\-\*]')
+_EXAMPLE_CLASS_RE = re.compile(r'example', re.I)
+_CONSTRAINT_CLASS_RE = re.compile(r'constraint', re.I)
+_ESCAPE_RE = re.compile(r'[&<>]')
+_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;'}
+
+
+def _escape(text: str) -> str:
+    return _ESCAPE_RE.sub(lambda match: _ESCAPES[match.group()], text) if '&' in text or '<' in text or '>' in text else text
+
+
+def _quote(value: str) -> str:
+    value = _escape(value)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', '&quot;') + '"'
+
+
+def _start_tag(tag: str, attrs: Dict[str, str], void: bool) -> str:
+    """The start tag as str(tag) writes it: attributes sorted, word lists normalized, void tags self-closed"""
+    parts = ['<', tag]
+    for name in sorted(attrs):
+        parts.append(f' {name}={_quote(attrs[name])}')
+    parts.append('/>' if void else '>')
+    return ''.join(parts)
+
+
+class _Node:
+    """One element: its range of output tokens and the range of text chunks it contains"""
+
+    __slots__ = ('tag', 'classes', 'class_attr', 'parent', 'children', 'start', 'end', 'text_start', 'text_end')
+
+    def __init__(self, tag: str, class_attr: str, parent: Optional['_Node'], start: int, text_start: int) -> None:
+        self.tag = tag
+        self.class_attr = class_attr
+        self.classes = class_attr.split()
+        self.parent = parent
+        # Child elements, ints indexing the text chunk of a text child, or the text of a comment or declaration
+        self.children: List[Union['_Node', int, str]] = []
+        self.start = start
+        self.end = start
+        self.text_start = text_start
+        self.text_end = text_start
+
+
+class _ContentParser(HTMLParser):
+    """Single pass over the HTML that builds the same tree as BeautifulSoup's html.parser builder.
+
+    Elements are indexed by their range in a flat list of output tokens (str(element) is a join
+    over that range, serialized as BeautifulSoup does) and by their range of text chunks (get_text()
+    is a join over those), so only the few elements the rules look at are ever turned into strings.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = _Node('[document]', '', None, 0, 0)
+        self.nodes: List[_Node] = []
+        self.chunks: List[str] = []
+        self.tokens: List[str] = []
+        self._stack = [self.root]
+        self._skip_text = 0
+        self._raw_text = 0
+        self._preserve_whitespace = 0
+
+    def _open(self, tag: str, attrs, void: bool) -> _Node:
+        values: Dict[str, str] = {}
+        multi_valued = _MULTI_VALUED_ATTRS['*'] | _MULTI_VALUED_ATTRS.get(tag, frozenset())
+        for name, value in attrs:
+            value = value or ''
+            values[name] = ' '.join(value.split()) if name in multi_valued else value
+        parent = self._stack[-1]
+        node = _Node(tag, values.get('class', ''), parent, len(self.tokens), len(self.chunks))
+        self.tokens.append(_start_tag(tag, values, void))
+        parent.children.append(node)
+        self.nodes.append(node)
+        return node
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            node = self._open(tag, attrs, void=True)
+            node.end = len(self.tokens)
+            return
+        node = self._open(tag, attrs, void=False)
+        self._enter(tag)
+        self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        # <div/> is an empty div; only void elements are written self-closed
+        node = self._open(tag, attrs, void=tag in VOID_TAGS)
+        if tag not in VOID_TAGS:
+            self.tokens.append(f'</{tag}>')
+        node.end = len(self.tokens)
+
+    def _enter(self, tag: str) -> None:
+        self._skip_text += tag in _SKIP_TEXT_TAGS
+        self._raw_text += tag in _RAW_TEXT_TAGS
+        self._preserve_whitespace += tag in _PRESERVE_WHITESPACE_TAGS
+
+    def _leave(self, node: _Node) -> None:
+        self._skip_text -= node.tag in _SKIP_TEXT_TAGS
+        self._raw_text -= node.tag in _RAW_TEXT_TAGS
+        self._preserve_whitespace -= node.tag in _PRESERVE_WHITESPACE_TAGS
+        self.tokens.append(f'</{node.tag}>')
+        node.end = len(self.tokens)
+        node.text_end = len(self.chunks)
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self._stack) - 1, 0, -1):
+            if self._stack[depth].tag == tag:
+                break
+        else:
+            return  # stray end tag
+        # Elements left open inside this one end where it ends, as in the tree builder
+        for node in reversed(self._stack[depth:]):
+            self._leave(node)
+        del self._stack[depth:]
+
+    def handle_data(self, data):
+        if not self._preserve_whitespace and not data.strip(_ASCII_SPACES):
+            # The tree builder keeps whitespace-only text as a single newline or space
+            data = '\n' if '\n' in data else ' '
+        self.tokens.append(data if self._raw_text else _escape(data))
+        if self._skip_text:
+            return
+        self._stack[-1].children.append(len(self.chunks))
+        self.chunks.append(data)
+
+    def handle_comment(self, data):
+        self._stack[-1].children.append(data)
+        self.tokens.append(f'<!--{data}-->')
+
+    def handle_decl(self, decl):
+        if decl[:8].upper() == 'DOCTYPE ':
+            decl = decl[8:]
+        self._stack[-1].children.append(decl)
+        self.tokens.append(f'<!DOCTYPE {decl}>\n')
+
+    def handle_pi(self, data):
+        self._stack[-1].children.append(data)
+        self.tokens.append(f'<?{data}>')
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            data = data[6:]
+            self.tokens.append(f'<![CDATA[{data}]]>')
+            self._stack[-1].children.append(len(self.chunks))
+            self.chunks.append(data)
+        else:
+            self._stack[-1].children.append(data)
+            self.tokens.append(f'<?{data}?>')
+
+    def close(self):
+        super().close()
+        for node in reversed(self._stack[1:]):
+            self._leave(node)
+        self.root.end = len(self.tokens)
+        self.root.text_end = len(self.chunks)
+        self._stack = [self.root]
+
+
+class _Document:
+    def __init__(self, source: str) -> None:
+        parser = _ContentParser()
+        parser.feed(source)
+        parser.close()
+        self.root = parser.root
+        self.nodes = parser.nodes
+        self.chunks = parser.chunks
+        self.tokens = parser.tokens
+        self._all_text: Optional[str] = None
+        self._html: Optional[str] = None
+
+    @property
+    def full_html(self) -> str:
+        """str(soup)"""
+        if self._html is None:
+            self._html = self.html(self.root)
+        return self._html
+
+    def html(self, node: _Node) -> str:
+        """str(node)"""
+        return ''.join(self.tokens[node.start:node.end])
+
+    def text(self, node: _Node) -> str:
+        """node.get_text()"""
+        return ''.join(self.chunks[node.text_start:node.text_end])
+
+    def stripped_text(self, node: _Node) -> str:
+        """node.get_text(separator=' ', strip=True)"""
+        return ' '.join(s for s in (c.strip() for c in self.chunks[node.text_start:node.text_end]) if s)
+
+    @property
+    def all_text(self) -> str:
+        if self._all_text is None:
+            self._all_text = self.stripped_text(self.root)
+        return self._all_text
+
+    def find(self, predicate) -> Optional[_Node]:
+        return next((node for node in self.nodes if predicate(node)), None)
+
+    def main_content(self) -> Optional[_Node]:
+        return (self.find(lambda n: n.tag == 'div' and 'content__u3I1' in n.classes)
+                or self.find(lambda n: n.tag == 'div' and 'question-content' in n.classes))
+
+    def string(self, node: _Node) -> Optional[str]:
+        """node.string: the only text below node when it has a single child chain"""
+        if len(node.children) != 1:
+            return None
+        child = node.children[0]
+        if isinstance(child, int):
+            return self.chunks[child]
+        if isinstance(child, str):
+            return child
+        return self.string(child)
+
+
+# Same precedence as the CSS selectors of the BeautifulSoup parser
+_DESCRIPTION_SELECTORS = (
+    lambda n: 'content__u3I1' in n.classes and 'question-content__JfgR' in n.classes,
+    lambda n: 'question-content' in n.classes,
+    lambda n: 'content' in n.classes,
+    lambda n: 'content' in n.class_attr,
+    lambda n: 'question' in n.class_attr,
+    lambda n: 'problem' in n.class_attr,
+)
+
+
+def _class_matches(node: _Node, pattern: re.Pattern) -> bool:
+    return bool(node.class_attr) and (
+        any(pattern.search(name) for name in node.classes) or bool(pattern.search(node.class_attr))
+    )
+
+
+def _example_from_text(text: str) -> Optional[Dict[str, str]]:
+    if 'Input:' not in text or 'Output:' not in text:
+        return None
+    input_line = output_line = explanation = ''
+    for line in text.split('\n'):
+        if line.startswith('Input:'):
+            input_line = line.replace('Input:', '').strip()
+        elif line.startswith('Output:'):
+            output_line = line.replace('Output:', '').strip()
+        elif line.startswith('Explanation:'):
+            explanation = line.replace('Explanation:', '').strip()
+    if input_line and output_line:
+        return {'input': input_line, 'output': output_line, 'explanation': explanation}
+    return None
+
+
+def _description_before_examples(doc: _Document, elem: _Node) -> Optional[str]:
+    full_text = doc.stripped_text(elem)
+    positions = [pos for pos in (full_text.find(marker) for marker in EXAMPLE_MARKERS) if pos != -1]
+    if not positions:
+        return None
+    description_text = full_text[:min(positions)].strip()
+    if len(description_text) <= 50:
+        return None
+    html_parts = []
+    for child in elem.children:
+        if isinstance(child, int):
+            # str() of a text node is the text itself, not its escaped form
+            child_text, child_html = doc.chunks[child].strip(), doc.chunks[child]
+        elif isinstance(child, str):
+            continue  # comments and declarations have no text
+        else:
+            child_text, child_html = doc.stripped_text(child), doc.html(child)
+        if any(marker in child_text for marker in EXAMPLE_MARKERS):
+            break
+        if child_text:
+            html_parts.append(child_html)
+    return ''.join(html_parts) or f"<p>{description_text}</p>"
+
+
+def _description(doc: _Document) -> str:
+    description = ''
+    divs = [node for node in doc.nodes if node.tag == 'div']
+    for selector in _DESCRIPTION_SELECTORS:
+        elem = next((node for node in divs if selector(node)), None)
+        if elem is None:
+            continue
+        text = doc.stripped_text(elem)
+        if len(text) > 100:
+            if 'Example' in text or 'Input:' in text:
+                description = _description_before_examples(doc, elem) or doc.html(elem)
+            else:
+                description = doc.html(elem)
+            break
+
+    full_html = doc.full_html
+    if not description and len(full_html) > 200:
+        description = full_html
+    if description and len(description) < 1000 and len(full_html) > len(description):
+        description = full_html
+
+    if not description:
+        main = doc.main_content()
+        if main is not None:
+            description = doc.html(main)
+        else:
+            for section in _SECTION_SPLIT_RE.split(doc.all_text):
+                section = section.strip()
+                if len(section) > 100 and not section.startswith('Example') and not section.startswith('Constraints'):
+                    description = section
+                    break
+
+    if description:
+        if '<' in description and '>' in description:
+            description = re.sub(r'>\s+<', '><', description)
+            description = re.sub(r'\s+', ' ', description)
+        else:
+            description = re.sub(r'\s+', ' ', description)
+            description = re.sub(r'^Given\s+', '', description)
+
+        lowered = description.lower()
+        if not any(keyword in lowered for keyword in DESCRIPTION_KEYWORDS):
+            if '<' in description:
+                main = doc.main_content()
+                if main is not None and len(doc.html(main)) > len(description):
+                    description = doc.html(main)
+            elif len(doc.all_text) > len(description):
+                description = doc.all_text
+    return description
+
+
+def _examples(doc: _Document) -> List[Dict[str, str]]:
+    examples = []
+    for node in doc.nodes:
+        if node.tag == 'pre':
+            example = _example_from_text(doc.text(node).strip())
+            if example:
+                examples.append(example)
+    if examples:
+        return examples
+
+    main = doc.main_content()
+    if main is not None:
+        for node in doc.nodes:
+            if not (main.start < node.start < main.end) or node.tag not in ('div', 'section'):
+                continue
+            heading = doc.string(node)
+            if heading is None or not _EXAMPLE_HEADING_RE.search(heading) or node.parent is None:
+                continue
+            example = _example_from_text(doc.text(node.parent).strip())
+            if example:
+                examples.append(example)
+        if examples:
+            return examples
+
+    for match in _EXAMPLE_TEXT_RE.findall(doc.all_text)[:5]:
+        if match.strip():
+            examples.append({
+                'input': 'See LeetCode for input details',
+                'output': 'See LeetCode for output details',
+                'explanation': match.strip(),
+            })
+    if examples:
+        return examples
+
+    for node in doc.nodes:
+        if node.tag in ('div', 'section') and _class_matches(node, _EXAMPLE_CLASS_RE):
+            example_text = doc.text(node).strip()
+            if example_text and len(example_text) > 20:
+                examples.append({
+                    'input': 'See LeetCode for input details',
+                    'output': 'See LeetCode for output details',
+                    'explanation': example_text,
+                })
+    return examples
+
+
+def _split_bullets(text: str) -> List[str]:
+    return [line.strip() for line in _BULLET_SPLIT_RE.split(text) if len(line.strip()) > 10]
+
+
+def _constraints(doc: _Document) -> List[str]:
+    constraints = []
+    for node in doc.nodes:
+        if node.tag == 'li':
+            text = doc.text(node).strip()
+            lowered = text.lower()
+            if any(keyword in lowered for keyword in CONSTRAINT_KEYWORDS):
+                constraints.append(text)
+    if constraints:
+        return constraints
+
+    matches = _CONSTRAINT_TEXT_RE.findall(doc.all_text)
+    if matches:
+        constraints.extend(_split_bullets(matches[0].strip()))
+    if constraints:
+        return constraints
+
+    for node in doc.nodes:
+        if node.tag in ('div', 'section') and _class_matches(node, _CONSTRAINT_CLASS_RE):
+            text = doc.text(node).strip()
+            if text and len(text) > 20:
+                constraints.extend(_split_bullets(text))
+    return constraints
+
+
+def extract_problem_content(content: str) -> ParsedContent:
+    """Description, examples and constraints of a LeetCode problem's HTML.
+
+    Same rules and output as the BeautifulSoup parser (mysite.views.legacy_parse_leetcode_content),
+    but the HTML is tokenized once and no tree of objects is built: markup is serialized (entities
+    decoded, then re-escaped as BeautifulSoup writes them) only for the elements the rules keep.
+    """
+    if not content:
+        return {
+            'description': 'No description available',
+            'examples': [],
+            'constraints': []
+        }
+    try:
+        doc = _Document(content)
+        description = _description(doc)
+        examples = _examples(doc)
+        constraints = _constraints(doc)
+
+        if not description or len(description) < 100:
+            main = doc.main_content()
+            if main is not None:
+                description = f"Raw HTML content: {doc.html(main)}"
+            elif doc.all_text:
+                description = f"Raw content: {doc.all_text}"
+
+        return {
+            'description': description or 'Problem description not available',
+            'examples': examples,
+            'constraints': constraints
+        }
+    except Exception as e:
+        return {
+            'description': f'Error parsing content: {str(e)}',
+            'examples': [],
+            'constraints': []
+        }
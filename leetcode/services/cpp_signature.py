@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_SNIPPETS = 512
+
+_TOKEN_RE = re.compile(r"""
+      (?P<space>\s+)
+    | (?P<comment>//[^\n]*|/\*.*?\*/)
+    | (?P<directive>\#[^\n]*)
+    | (?P<literal>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+    | (?P<ident>[A-Za-z_]\w*)
+    | (?P<number>\d[\w.]*)
+    | (?P<op>::|->|&&|[^\s\w])
+""", re.X | re.S)
+_KEPT = frozenset({'ident', 'number', 'op'})
+
+# Words that may precede a declaration without being part of its type
+_SPECIFIERS = frozenset({'static', 'inline', 'virtual', 'explicit', 'constexpr', 'friend', 'extern', 'mutable'})
+# Words that combine into one builtin type name ("unsigned long long")
+_BUILTIN_WORDS = frozenset({'unsigned', 'signed', 'long', 'short', 'int', 'char', 'double'})
+_NOT_FUNCTIONS = frozenset({
+    'if', 'for', 'while', 'switch', 'return', 'sizeof', 'catch', 'decltype', 'operator', 'alignof', 'static_assert',
+})
+_TRAILING_QUALIFIERS = frozenset({'const', 'volatile', 'override', 'final', '&', '&&'})
+
+
+class SignatureError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CppType:
+    """A parsed C++ type such as ``const vector<vector<int>>&``"""
+
+    name: str
+    args: Tuple['CppType', ...] = ()
+    const: bool = False
+    pointer: int = 0
+    reference: str = ''
+
+    @property
+    def spelling(self) -> str:
+        text = self.name
+        if self.args:
+            text += '<' + ', '.join(arg.spelling for arg in self.args) + '>'
+        if self.const:
+            text = 'const ' + text
+        return text + '*' * self.pointer + self.reference
+
+    @property
+    def base(self) -> 'CppType':
+        """The type without const, pointer or reference"""
+        return CppType(self.name, self.args)
+
+    @property
+    def unqualified_name(self) -> str:
+        return self.name.rsplit('::', 1)[-1]
+
+    def __str__(self) -> str:
+        return self.spelling
+
+
+@dataclass(frozen=True)
+class Parameter:
+    type: CppType
+    name: str
+    default: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Signature:
+    method_name: str
+    return_type: CppType
+    parameters: Tuple[Parameter, ...] = ()
+    class_name: Optional[str] = None
+    access: str = ''
+    is_const: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The dict shape the wrapper generators take"""
+        return {
+            'return_type': self.return_type.spelling,
+            'parameters': [{'type': p.type.spelling, 'name': p.name} for p in self.parameters],
+            'method_name': self.method_name,
+        }
+
+
+def tokenize(code: str) -> List[str]:
+    """Identifiers, numbers and punctuation; comments, literals and preprocessor lines are dropped"""
+    return [m.group() for m in _TOKEN_RE.finditer(code) if m.lastgroup in _KEPT]
+
+
+def _is_ident(token: str) -> bool:
+    return token[:1].isalpha() or token[:1] == '_'
+
+
+def _parse_type(tokens: List[str], pos: int = 0) -> Tuple[CppType, int]:
+    const = False
+    while pos < len(tokens) and tokens[pos] in ('const', 'volatile', 'typename', 'struct', 'class'):
+        const = const or tokens[pos] == 'const'
+        pos += 1
+    if pos >= len(tokens):
+        raise SignatureError('missing type')
+
+    if tokens[pos] in _BUILTIN_WORDS:
+        words = []
+        while pos < len(tokens) and tokens[pos] in _BUILTIN_WORDS:
+            words.append(tokens[pos])
+            pos += 1
+        name = ' '.join(words)
+    else:
+        parts = []
+        if tokens[pos] == '::':
+            parts.append('::')
+            pos += 1
+        if pos >= len(tokens) or not (_is_ident(tokens[pos]) or tokens[pos][0].isdigit()):
+            raise SignatureError(f"unexpected {tokens[pos] if pos < len(tokens) else 'end'!r} in type")
+        parts.append(tokens[pos])
+        pos += 1
+        while pos + 1 < len(tokens) and tokens[pos] == '::' and _is_ident(tokens[pos + 1]):
+            parts.extend(('::', tokens[pos + 1]))
+            pos += 2
+        name = ''.join(parts)
+
+    args: List[CppType] = []
+    if pos < len(tokens) and tokens[pos] == '<':
+        pos += 1
+        while True:
+            arg, pos = _parse_type(tokens, pos)
+            args.append(arg)
+            if pos >= len(tokens):
+                raise SignatureError('unterminated template arguments')
+            if tokens[pos] == ',':
+                pos += 1
+                continue
+            if tokens[pos] == '>':
+                pos += 1
+                break
+            raise SignatureError(f"unexpected {tokens[pos]!r} in template arguments")
+
+    pointer, reference = 0, ''
+    while pos < len(tokens) and tokens[pos] in ('*', '&', '&&', 'const', 'volatile'):
+        token = tokens[pos]
+        if token == '*':
+            pointer += 1
+        elif token in ('&', '&&'):
+            reference = token
+        elif token == 'const' and not pointer:
+            const = True  # east const: "int const&"
+        pos += 1
+    return CppType(name, tuple(args), const, pointer, reference), pos
+
+
+@lru_cache(maxsize=1024)
+def parse_type(text: str) -> CppType:
+    """Parse a type spelling such as ``vector<int>&``; raises SignatureError if it is not one"""
+    tokens = tokenize(text)
+    cpp_type, pos = _parse_type(tokens)
+    if pos != len(tokens):
+        raise SignatureError(f"trailing {tokens[pos]!r} after type {cpp_type}")
+    return cpp_type
+
+
+def _split_top_level(tokens: List[str], separator: str = ',') -> List[List[str]]:
+    parts: List[List[str]] = [[]]
+    depth = 0
+    for token in tokens:
+        if token in ('<', '(', '[', '{'):
+            depth += 1
+        elif token in ('>', ')', ']', '}'):
+            depth -= 1
+        elif token == separator and depth == 0:
+            parts.append([])
+            continue
+        parts[-1].append(token)
+    return [part for part in parts if part]
+
+
+def _parse_parameter(tokens: List[str], index: int) -> Parameter:
+    default = None
+    for pos, token in enumerate(tokens):
+        if token == '=':
+            default = ' '.join(tokens[pos + 1:])
+            tokens = tokens[:pos]
+            break
+    array = 0
+    while len(tokens) >= 2 and tokens[-1] == ']':
+        # "int a[]" / "int a[10]": passed as a pointer
+        tokens = tokens[:tokens.index('[')]
+        array += 1
+    cpp_type, pos = _parse_type(tokens)
+    if cpp_type.name[0].isdigit():
+        raise SignatureError(f"{cpp_type.name!r} is a value, not a type")
+    if pos == len(tokens):
+        name = f'arg{index}'
+    elif pos == len(tokens) - 1 and _is_ident(tokens[pos]):
+        name = tokens[pos]
+    else:
+        raise SignatureError(f"cannot parse parameter {' '.join(tokens)!r}")
+    if array:
+        cpp_type = CppType(cpp_type.name, cpp_type.args, cpp_type.const, cpp_type.pointer + array, cpp_type.reference)
+    return Parameter(cpp_type, name, default)
+
+
+class _DeclarationParser:
+    """Collects function declarations at namespace and class scope; function bodies are skipped"""
+
+    def __init__(self, tokens: List[str]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+        self.signatures: List[Signature] = []
+
+    def _skip_balanced(self, pos: int) -> int:
+        """Index just past the bracket that closes the one at pos"""
+        opening = self.tokens[pos]
+        closing = {'(': ')', '{': '}', '[': ']', '<': '>'}[opening]
+        depth = 0
+        for index in range(pos, len(self.tokens)):
+            token = self.tokens[index]
+            if token == opening:
+                depth += 1
+            elif token == closing:
+                depth -= 1
+                if depth == 0:
+                    return index + 1
+        return len(self.tokens)
+
+    def parse(self) -> Tuple[Signature, ...]:
+        self._scope(None, '')
+        return tuple(self.signatures)
+
+    def _scope(self, class_name: Optional[str], access: str) -> None:
+        tokens = self.tokens
+        start = self.pos
+        while self.pos < len(tokens):
+            token = tokens[self.pos]
+            following = tokens[self.pos + 1] if self.pos + 1 < len(tokens) else ''
+            if token == '}':
+                self.pos += 1
+                return
+            if token == ';':
+                self.pos += 1
+                start = self.pos
+            elif token in ('public', 'private', 'protected') and following == ':':
+                access = token
+                self.pos += 2
+                start = self.pos
+            elif token == 'template' and following == '<':
+                self.pos = self._skip_balanced(self.pos + 1)
+                start = self.pos
+            elif token in ('class', 'struct', 'union') and self.pos == start:
+                self._class()
+                start = self.pos
+            elif token == 'namespace':
+                while self.pos < len(tokens) and tokens[self.pos] not in ('{', ';'):
+                    self.pos += 1
+                if self.pos < len(tokens) and tokens[self.pos] == '{':
+                    self.pos += 1
+                    self._scope(None, '')
+                start = self.pos
+            elif token == '(' and self.pos > start and _is_ident(tokens[self.pos - 1]) \
+                    and tokens[self.pos - 1] not in _NOT_FUNCTIONS:
+                self._function(start, class_name, access)
+                start = self.pos
+            elif token == '{':
+                self.pos = self._skip_balanced(self.pos)
+                start = self.pos
+            else:
+                self.pos += 1
+
+    def _class(self) -> None:
+        tokens = self.tokens
+        access = 'private' if tokens[self.pos] == 'class' else 'public'
+        self.pos += 1
+        name = tokens[self.pos] if self.pos < len(tokens) and _is_ident(tokens[self.pos]) else None
+        while self.pos < len(tokens) and tokens[self.pos] not in ('{', ';'):
+            self.pos += 1
+        if self.pos < len(tokens) and tokens[self.pos] == '{':
+            self.pos += 1
+            self._scope(name, access)
+
+    def _function(self, start: int, class_name: Optional[str], access: str) -> None:
+        tokens = self.tokens
+        lparen = self.pos
+        name = tokens[lparen - 1]
+        prefix = [token for token in tokens[start:lparen - 1] if token not in _SPECIFIERS]
+        self.pos = self._skip_balanced(lparen)
+        params = tokens[lparen + 1:self.pos - 1]
+
+        is_const = False
+        while self.pos < len(tokens):
+            token = tokens[self.pos]
+            if token in _TRAILING_QUALIFIERS:
+                is_const = is_const or token == 'const'
+                self.pos += 1
+            elif token == 'noexcept':
+                self.pos += 1
+                if self.pos < len(tokens) and tokens[self.pos] == '(':
+                    self.pos = self._skip_balanced(self.pos)
+            elif token == '->':
+                # Trailing return type: "auto f(int x) -> vector<int>"
+                trailing_start = self.pos + 1
+                while self.pos < len(tokens) and tokens[self.pos] not in ('{', ';'):
+                    self.pos += 1
+                prefix = tokens[trailing_start:self.pos]
+            else:
+                break
+
+        token = tokens[self.pos] if self.pos < len(tokens) else ''
+        if token == ':':
+            # Constructor initializer list: skip member initializers up to the body
+            self.pos += 1
+            while self.pos < len(tokens) and tokens[self.pos] != '{':
+                if tokens[self.pos] == '(':
+                    self.pos = self._skip_balanced(self.pos)
+                else:
+                    self.pos += 1
+                if self.pos < len(tokens) and tokens[self.pos] == '{' and _is_ident(tokens[self.pos - 1]):
+                    self.pos = self._skip_balanced(self.pos)  # brace initializer "member{value}"
+            token = tokens[self.pos] if self.pos < len(tokens) else ''
+        if token == '=':
+            # "= 0", "= default", "= delete"
+            while self.pos < len(tokens) and tokens[self.pos] != ';':
+                self.pos += 1
+            token = ';'
+        if token == '{':
+            self.pos = self._skip_balanced(self.pos)
+        elif token == ';':
+            self.pos += 1
+        else:
+            return  # not a declaration (e.g. a call or an initializer)
+
+        if not prefix or prefix[-1] == '~' or name == class_name:
+            return  # constructor or destructor
+        try:
+            return_type, consumed = _parse_type(prefix)
+            if consumed != len(prefix):
+                return
+            parameters = tuple(
+                _parse_parameter(part, index)
+                for index, part in enumerate(_split_top_level(params))
+                if part != ['void']
+            )
+        except SignatureError:
+            return
+        self.signatures.append(Signature(name, return_type, parameters, class_name, access, is_const))
+
+
+_lock = threading.Lock()
+_snippets: 'OrderedDict[str, Tuple[Signature, ...]]' = OrderedDict()
+_hits = 0
+_misses = 0
+
+
+def snippet_hash(code: str) -> str:
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def declarations(code: str) -> Tuple[Signature, ...]:
+    """Every function declared at namespace or class scope in code, memoized by snippet hash"""
+    global _hits, _misses
+    key = snippet_hash(code or '')
+    with _lock:
+        found = _snippets.get(key)
+        if found is not None:
+            _snippets.move_to_end(key)
+            _hits += 1
+            return found
+        _misses += 1
+    found = _DeclarationParser(tokenize(code or '')).parse()
+    with _lock:
+        _snippets[key] = found
+        _snippets.move_to_end(key)
+        while len(_snippets) > MAX_SNIPPETS:
+            _snippets.popitem(last=False)
+    return found
+
+
+def find_signature(code: str, method_name: Optional[str] = None) -> Optional[Signature]:
+    """The named function's signature, or the method a LeetCode snippet asks to implement.
+
+    Without a name this prefers the first public member of class Solution, then the first
+    public member of any class (design problems), then the first free function other than main.
+    """
+    signatures = declarations(code)
+    if method_name:
+        return next((s for s in signatures if s.method_name == method_name), None)
+    for matches in (
+        lambda s: s.class_name == 'Solution' and s.access == 'public',
+        lambda s: s.class_name is not None and s.access == 'public',
+        lambda s: s.method_name != 'main',
+    ):
+        found = next((s for s in signatures if matches(s)), None)
+        if found is not None:
+            return found
+    return None
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        total = _hits + _misses
+        return {
+            'hits': _hits,
+            'misses': _misses,
+            'hit_rate': _hits / total if total else 0.0,
+            'size': len(_snippets),
+        }
+
+
+def clear() -> None:
+    global _hits, _misses
+    with _lock:
+        _snippets.clear()
+        _hits = _misses = 0
@@ -0,0 +1,230 @@
+"""Daily question payload, served stale-while-revalidate.
+
+The cached entry outlives its freshness window (LEETCODE_CACHE_TTL_SECONDS) and doubles as the
+last known-good copy: once stale it keeps being served while one background thread refreshes it,
+a failed refresh never replaces it (stale-if-error), and a timer refreshes it just after each UTC
+date change. Only a cold cache makes a visitor wait on LeetCode.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .leetcode_api import AsyncLeetCodeAPI
+
+# Versioned: entries stored by earlier releases under "leetcode:daily_question" have another shape
+CACHE_KEY = "leetcode:daily_question:v2"
+LOCK_KEY = "leetcode:daily_question:refresh"
+# Long enough to bridge a LeetCode outage; freshness is decided by the entry itself
+KEEP_SECONDS = 7 * 24 * 3600
+# A refresh lock that is not released after a failure doubles as the retry back-off
+REFRESH_LOCK_SECONDS = 60
+COLD_WAIT_SECONDS = 10.0
+FAILED = "failed"
+
+
+def _placeholder_question() -> Dict[str, Any]:
+    return {
+        'title': 'Daily Question',
+        'date': '',
+        'difficulty': 'Medium',
+        'ac_rate': None,
+        'frontend_id': None,
+        'title_slug': '',
+        'link': '',
+        'description': 'Problem description not available',
+        'examples': [],
+        'constraints': [],
+        'example_testcases': '',
+        'template': '',
+        'cppTemplate': '',
+        'hasRealCppTemplate': False,
+    }
+
+
+def _utc_today() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+
+def _read_entry(entry: Any) -> Optional[Dict[str, Any]]:
+    """The stored entry, or None for a miss or a value of any other shape"""
+    if isinstance(entry, dict) and isinstance(entry.get('context'), dict) and 'fetched_at' in entry and 'day' in entry:
+        return entry
+    return None
+
+
+def is_fresh(entry: Dict[str, Any]) -> bool:
+    ttl = getattr(settings, 'LEETCODE_CACHE_TTL_SECONDS', 300)
+    return entry.get('day') == _utc_today() and time.time() - entry.get('fetched_at', 0) < ttl
+
+
+async def build_context() -> Dict[str, Any]:
+    """Fetch today's question and its details from LeetCode (two sequential upstream calls)"""
+    api = AsyncLeetCodeAPI()
+    api_error: str | None = None
+    is_real_question = False
+    daily = _placeholder_question()
+
+    resp = await api.fetch_daily_question()
+    if resp.ok and resp.data:
+        try:
+            active = resp.data['data']['activeDailyCodingChallengeQuestion']
+            daily['date'] = active.get('date') or ''
+            daily['link'] = active.get('link') or ''
+            q = active.get('question') or {}
+            daily['title'] = q.get('title') or daily['title']
+            daily['difficulty'] = q.get('difficulty') or daily['difficulty']
+            daily['ac_rate'] = q.get('acRate')
+            daily['frontend_id'] = q.get('frontendQuestionId')
+            title_slug = q.get('titleSlug') or ''
+            daily['title_slug'] = title_slug
+            is_real_question = True
+
+            # Enrich with problem details (needs the slug from the daily lookup, so it can't overlap it)
+            if title_slug:
+                details = await api.fetch_problem_details(title_slug)
+                if not (details.ok and details.data):
+                    # Without the details the page is a partial one: show it, but never cache it
+                    api_error = details.error or 'Failed to fetch problem details'
+                else:
+                    dq = details.data['data']['question']
+                    content = dq.get('content') or ''
+                    daily['description'] = content
+                    samples = dq.get('exampleTestcaseList') or []
+                    ex_list = []
+                    for s in samples:
+                        # Heuristic split; LeetCode gives lines like "Input: ..., Output: ..."
+                        ex_list.append({'input': s, 'output': '', 'explanation': ''})
+                    daily['examples'] = ex_list
+                    daily['example_testcases'] = (dq.get('sampleTestCase') or '')
+                    daily['constraints'] = []
+                    # Templates
+                    cpp = None
+                    snippets = dq.get('codeSnippets') or []
+                    for sn in snippets:
+                        if sn.get('langSlug') == 'cpp':
+                            cpp = sn.get('code')
+                        if sn.get('langSlug') == 'python3' and not daily['template']:
+                            daily['template'] = sn.get('code') or ''
+                    if cpp:
+                        daily['cppTemplate'] = cpp
+                        daily['hasRealCppTemplate'] = True
+                    elif daily['template']:
+                        daily['cppTemplate'] = daily['template']
+        except Exception as exc:  # safety net for unexpected API schema
+            api_error = str(exc)
+    else:
+        api_error = resp.error or 'Failed to fetch daily question'
+
+    return {
+        'daily_question': daily,
+        'is_real_question': is_real_question,
+        'api_error': api_error,
+    }
+
+
+async def refresh() -> Optional[Dict[str, Any]]:
+    """Rebuild the cached entry unless another worker is already doing so.
+
+    Returns the freshly built context (even a failed one, for a cold cache to show), or None when
+    another worker holds the refresh lock. Failures never replace the stored entry.
+    """
+    if not await cache.aadd(LOCK_KEY, 1, REFRESH_LOCK_SECONDS):
+        return None
+    return await _rebuild()
+
+
+async def _rebuild() -> Dict[str, Any]:
+    """The body of refresh(); the caller holds the refresh lock"""
+    try:
+        context = await build_context()
+    except Exception as exc:
+        context = {'daily_question': _placeholder_question(), 'is_real_question': False, 'api_error': str(exc)}
+    if not context['is_real_question'] or context['api_error']:
+        # Keep the lock until it expires so retries back off; tell cold-cache waiters not to wait
+        await cache.aset(LOCK_KEY, FAILED, REFRESH_LOCK_SECONDS)
+        return context
+    await cache.aset(CACHE_KEY, {'context': context, 'fetched_at': time.time(), 'day': _utc_today()}, KEEP_SECONDS)
+    await cache.adelete(LOCK_KEY)
+    return context
+
+
+def _refresh_in_thread(rebuild=refresh) -> None:
+    try:
+        asyncio.run(rebuild())
+    except Exception as exc:
+        print(f"Daily question refresh failed: {exc}")
+    finally:
+        connections.close_all()
+
+
+def spawn_refresh() -> None:
+    """Refresh in a background thread, unless a refresh is already running or backing off"""
+    # Taking the lock before starting the thread keeps a burst of stale requests down to one thread
+    if cache.add(LOCK_KEY, 1, REFRESH_LOCK_SECONDS):
+        threading.Thread(target=_refresh_in_thread, args=(_rebuild,), name="daily-question-refresh",
+                         daemon=True).start()
+
+
+_timer: Optional[threading.Timer] = None
+_timer_lock = threading.Lock()
+
+
+def _seconds_until_rollover() -> float:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time(), datetime.timezone.utc)
+    return (midnight - now).total_seconds() + getattr(settings, 'LEETCODE_DAILY_REFRESH_DELAY_SECONDS', 30)
+
+
+def _on_rollover() -> None:
+    global _timer
+    with _timer_lock:
+        _timer = None
+    _refresh_in_thread()
+    ensure_rollover_refresh()
+
+
+def ensure_rollover_refresh() -> None:
+    """Start this process's timer that refreshes the payload just after the next UTC midnight"""
+    global _timer
+    with _timer_lock:
+        if _timer is None:
+            _timer = threading.Timer(_seconds_until_rollover(), _on_rollover)
+            _timer.daemon = True
+            _timer.start()
+
+
+async def aget_context() -> Dict[str, Any]:
+    """Template context for the daily question page"""
+    ensure_rollover_refresh()
+    entry = _read_entry(await cache.aget(CACHE_KEY))
+    if entry:
+        if not is_fresh(entry):
+            await sync_to_async(spawn_refresh)()
+        return entry['context']
+
+    # Cold cache: one visitor fetches, the rest wait briefly for it
+    context = await refresh()
+    if context is not None:
+        return context
+    deadline = time.monotonic() + COLD_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        entry = _read_entry(await cache.aget(CACHE_KEY))
+        if entry:
+            return entry['context']
+        if await cache.aget(LOCK_KEY) in (None, FAILED):
+            break
+        await asyncio.sleep(0.1)
+    return {
+        'daily_question': _placeholder_question(),
+        'is_real_question': False,
+        'api_error': 'Daily question is temporarily unavailable',
+    }
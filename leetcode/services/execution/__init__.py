@@ -0,0 +1,71 @@
+"""Pluggable code execution: LEETCODE_EXECUTION_BACKEND picks "jdoodle" (remote API) or "local" (g++ under rlimits).
+
+Languages the configured backend cannot run go to JDoodle. Results of identical runs are memoized (result_cache).
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional, Type
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from . import result_cache
+from .base import ExecutionBackend, Result, failure, success
+from .binary_cache import BinaryCache
+from .jdoodle import JDoodleBackend
+from .local import LocalBackend
+from .pool import SandboxPool
+
+BACKENDS: Dict[str, Type[ExecutionBackend]] = {
+    JDoodleBackend.name: JDoodleBackend,
+    LocalBackend.name: LocalBackend,
+}
+
+_instances: Dict[str, ExecutionBackend] = {}
+_lock = threading.Lock()
+
+
+def backend(name: str) -> ExecutionBackend:
+    instance = _instances.get(name)
+    if instance is None:
+        if name not in BACKENDS:
+            raise ImproperlyConfigured(f"Unknown execution backend {name!r}; expected one of {', '.join(BACKENDS)}")
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = _instances[name] = BACKENDS[name]()
+    return instance
+
+
+def get_backend(language: str = 'cpp') -> ExecutionBackend:
+    """The configured backend, or JDoodle for languages it cannot run"""
+    configured = backend(getattr(settings, 'LEETCODE_EXECUTION_BACKEND', JDoodleBackend.name))
+    return configured if configured.supports(language) else backend(JDoodleBackend.name)
+
+
+def execute(script: str, language: str, stdin: str = '') -> Optional[Result]:
+    """Run script on the backend for language; identical runs are answered from the result cache"""
+    chosen = get_backend(language)
+    if getattr(settings, 'LEETCODE_RESULT_CACHE_SIZE', 1024) <= 0:
+        return chosen.execute(script, language, stdin)
+    return result_cache.execute(chosen, script, language, stdin)
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Per-backend metrics for the backends this process has used"""
+    with _lock:
+        instances = dict(_instances)
+    return {name: instance.stats() for name, instance in instances.items()}
+
+
+def reset() -> None:
+    """Forget backend instances so the next call re-reads settings"""
+    with _lock:
+        _instances.clear()
+
+
+__all__ = [
+    'BACKENDS', 'BinaryCache', 'ExecutionBackend', 'JDoodleBackend', 'LocalBackend', 'Result', 'SandboxPool',
+    'backend', 'execute', 'failure', 'get_backend', 'reset', 'stats', 'success',
+]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet, Optional
+
+# Every backend reports a run in the dict execute_code_jdoodle has always returned:
+#   {'success': True, 'output', 'error', 'statusCode', 'memory', 'cpuTime'}
+#   {'success': False, 'error', 'error_type'}  (compilation_error, runtime_error, timeout_error, api_error)
+# or None when the executor itself could not be reached.
+Result = Dict[str, Any]
+
+
+def success(output: str, error: str = '', status_code: int = 0, memory: Any = 'N/A', cpu_time: Any = 'N/A') -> Result:
+    return {
+        'success': True,
+        'output': output,
+        'error': error,
+        'statusCode': status_code,
+        'memory': memory,
+        'cpuTime': cpu_time,
+    }
+
+
+def failure(error: str, error_type: str, **extra: Any) -> Result:
+    return {'success': False, 'error': error, 'error_type': error_type, **extra}
+
+
+class ExecutionBackend:
+    """Runs a complete program (script + stdin) and reports it as a Result"""
+
+    name = 'base'
+    languages: FrozenSet[str] = frozenset()
+
+    def supports(self, language: str) -> bool:
+        return language in self.languages
+
+    def fingerprint(self, language: str) -> str:
+        """What besides script and stdin decides a run's result (compiler version, flags, limits)"""
+        return f"{self.name}:{language}"
+
+    def execute(self, script: str, language: str, stdin: str = '') -> Optional[Result]:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import subprocess
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+SUFFIX = '.bin'
+# Every entry starts with this many bytes of BLAKE2b digest of the binary that follows
+DIGEST_SIZE = 32
+
+
+@functools.lru_cache(maxsize=8)
+def toolchain_version(compiler: str) -> str:
+    """First line of `compiler --version`; part of every cache key so a toolchain upgrade invalidates binaries"""
+    try:
+        completed = subprocess.run([compiler, '--version'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return compiler
+    return (completed.stdout.splitlines() or [compiler])[0]
+
+
+def binary_key(source: str, flags: Iterable[str], toolchain: str) -> str:
+    digest = hashlib.sha256()
+    for part in (toolchain, '\0'.join(flags), source):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _digest(binary: bytes) -> bytes:
+    return hashlib.blake2b(binary, digest_size=DIGEST_SIZE).digest()
+
+
+class BinaryCache:
+    """Compiled binaries on disk, keyed by binary_key and evicted least-recently-used past max_bytes.
+
+    Recency is the file's mtime (touched on every hit), so several worker processes can share one
+    directory. Writes go through a temp file and os.replace, so readers never see a partial binary.
+    Entries are read-only and carry a digest of the binary; a run always gets its own copy, never
+    the entry itself, and an entry that fails its digest is dropped and counted as a miss.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.corrupt = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def fetch(self, key: str, destination: Path) -> bool:
+        """Copy the cached binary for key to destination; False on a miss"""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        binary = data[DIGEST_SIZE:]
+        if data[:DIGEST_SIZE] != _digest(binary):
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.corrupt += 1
+                self.misses += 1
+            return False
+        try:
+            destination.write_bytes(binary)
+            destination.chmod(0o755)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key: str, binary: Path) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            data = binary.read_bytes()
+            temp.write_bytes(_digest(data) + data)
+            temp.chmod(0o444)
+            os.replace(temp, self._path(key))
+        except OSError:
+            temp.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self.stores += 1
+        self.evict()
+
+    def _entries(self):
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def evict(self) -> int:
+        """Remove least-recently-used binaries until the cache fits in max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self.hits = self.misses = self.stores = self.evictions = self.corrupt = 0
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'directory': str(self.directory),
+                'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'corrupt': self.corrupt,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+
+from .base import ExecutionBackend, Result, failure, success
+from .binary_cache import BinaryCache, binary_key, toolchain_version
+from .pool import SandboxError, SandboxPool
+from .sandbox import Completed, Limits, run_limited
+
+CXX_FLAGS = ('-std=c++17', '-O2', '-pipe')
+# A static binary skips the dynamic loader resolving libstdc++ at every start (about a millisecond a run)
+STATIC_FLAGS = ('-static',)
+
+_FROM_SETTINGS = object()
+
+# run_limited, or a pool worker's run that does the same inside the worker
+Runner = Callable[[List[str], Path, Limits, str], Completed]
+
+
+class LocalBackend(ExecutionBackend):
+    """g++ in a warm sandbox worker's directory (or a throwaway temp dir without a pool); the binary runs under
+    CPU-time, address-space, output and wall-clock limits"""
+
+    name = 'local'
+    languages = frozenset({'cpp'})
+
+    def __init__(self, compiler: Optional[str] = None, binary_cache: Any = _FROM_SETTINGS, pool: Any = _FROM_SETTINGS,
+                 static: Optional[bool] = None, **limits: Any) -> None:
+        self.compiler = compiler or settings.LOCAL_EXECUTION_COMPILER
+        if binary_cache is _FROM_SETTINGS:
+            cache_bytes = settings.LOCAL_EXECUTION_BINARY_CACHE_MB * 1024 * 1024
+            binary_cache = BinaryCache(Path(settings.LOCAL_EXECUTION_BINARY_CACHE_DIR), cache_bytes) if cache_bytes else None
+        self.binary_cache: Optional[BinaryCache] = binary_cache
+        if pool is _FROM_SETTINGS:
+            size = settings.LOCAL_EXECUTION_POOL_SIZE
+            pool = SandboxPool(
+                Path(settings.LOCAL_EXECUTION_POOL_DIR), size, settings.LOCAL_EXECUTION_POOL_MAX_RUNS,
+                settings.LOCAL_EXECUTION_POOL_WAIT_SECONDS,
+            ) if size > 0 else None
+        self.pool: Optional[SandboxPool] = pool
+        static = settings.LOCAL_EXECUTION_STATIC_LINK if static is None else static
+        self.cxx_flags = CXX_FLAGS + STATIC_FLAGS if static else CXX_FLAGS
+        self.run_limits = Limits(
+            cpu_seconds=limits.get('cpu_seconds', settings.LOCAL_EXECUTION_CPU_SECONDS),
+            wall_seconds=limits.get('wall_seconds', settings.LOCAL_EXECUTION_WALL_SECONDS),
+            memory_bytes=limits.get('memory_mb', settings.LOCAL_EXECUTION_MEMORY_MB) * 1024 * 1024,
+            output_bytes=limits.get('output_bytes', settings.LOCAL_EXECUTION_OUTPUT_BYTES),
+            processes=limits.get('processes', settings.LOCAL_EXECUTION_MAX_PROCESSES),
+        )
+        # The compiler needs far more address space than the programs it builds
+        self.compile_limits = Limits(
+            cpu_seconds=settings.LOCAL_EXECUTION_COMPILE_SECONDS,
+            wall_seconds=settings.LOCAL_EXECUTION_COMPILE_SECONDS * 2,
+            memory_bytes=2048 * 1024 * 1024,
+            output_bytes=64 * 1024 * 1024,
+            processes=settings.LOCAL_EXECUTION_MAX_PROCESSES,
+        )
+
+    def compile(self, script: str, workdir: Path, runner: Runner = run_limited) -> Completed:
+        (workdir / 'main.cpp').write_text(script, encoding='utf-8')
+        return runner([self.compiler, *self.cxx_flags, '-o', 'main', 'main.cpp'], workdir, self.compile_limits)
+
+    def run(self, workdir: Path, stdin: str, runner: Runner = run_limited) -> Result:
+        completed = runner(['./main'], workdir, self.run_limits, stdin)
+        cpu_time = f"{completed.cpu_seconds:.2f}"
+        limits = self.run_limits
+        # SIGXCPU at the soft CPU limit; SIGKILL at the hard one if the program ignored it
+        cpu_exceeded = completed.signal_name == 'SIGXCPU' or (
+            completed.signal_name == 'SIGKILL' and completed.cpu_seconds >= limits.cpu_seconds
+        )
+        if completed.timed_out or cpu_exceeded:
+            return failure(
+                f"Time limit exceeded ({limits.cpu_seconds}s CPU, {limits.wall_seconds:g}s wall)", 'timeout_error',
+                output=completed.stdout, cpuTime=cpu_time,
+            )
+        if completed.signal_name == 'SIGXFSZ':
+            return failure(f"Output limit exceeded ({limits.output_bytes} bytes)", 'runtime_error', output=completed.stdout)
+        if completed.returncode != 0:
+            reason = completed.stderr.strip()
+            if 'bad_alloc' in reason:
+                reason += f"\nMemory limit exceeded ({limits.memory_bytes // (1024 * 1024)} MB)"
+            if completed.signal_name:
+                reason = f"{reason}\nProcess terminated by {completed.signal_name}".strip()
+            return failure(
+                reason or f"Process exited with status {completed.returncode}", 'runtime_error',
+                output=completed.stdout, statusCode=completed.returncode, cpuTime=cpu_time,
+            )
+        return success(completed.stdout, completed.stderr, memory=completed.max_rss_kb, cpu_time=cpu_time)
+
+    def fingerprint(self, language: str) -> str:
+        return f"{self.name}:{toolchain_version(self.compiler)}:{' '.join(self.cxx_flags)}:{self.run_limits}"
+
+    def execute(self, script: str, language: str, stdin: str = '') -> Optional[Result]:
+        if not self.supports(language):
+            return failure(f"The local backend cannot run {language}", 'api_error')
+        if self.pool is not None:
+            try:
+                with self.pool.lease() as worker:
+                    return self._execute_in(worker.workdir, script, stdin, worker.run)
+            except SandboxError as exc:
+                return failure(f"Sandbox unavailable: {exc}", 'api_error')
+        with tempfile.TemporaryDirectory(prefix='judge-') as workdir:
+            return self._execute_in(Path(workdir), script, stdin, run_limited)
+
+    def _execute_in(self, workdir: Path, script: str, stdin: str, runner: Runner) -> Result:
+        key = None
+        if self.binary_cache is not None:
+            # Same source, flags and compiler: reuse the binary (new test inputs only change stdin)
+            key = binary_key(script, self.cxx_flags, toolchain_version(self.compiler))
+            if self.binary_cache.fetch(key, workdir / 'main'):
+                return self._run_checked(workdir, stdin, runner)
+        try:
+            compiled = self.compile(script, workdir, runner)
+        except OSError as exc:
+            return failure(f"Compiler unavailable: {exc}", 'api_error')
+        if compiled.timed_out or compiled.returncode != 0:
+            return failure(compiled.stderr or 'Compilation timed out', 'compilation_error')
+        if key is not None:
+            self.binary_cache.store(key, workdir / 'main')
+        return self._run_checked(workdir, stdin, runner)
+
+    def _run_checked(self, workdir: Path, stdin: str, runner: Runner) -> Result:
+        try:
+            return self.run(workdir, stdin, runner)
+        except OSError as exc:
+            # The program could not be started (fork or exec failed, or the pool worker reported an error)
+            return failure(f"Sandbox unavailable: {exc}", 'api_error')
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'binary_cache': self.binary_cache.stats() if self.binary_cache is not None else None,
+            'pool': self.pool.stats() if self.pool is not None else None,
+        }
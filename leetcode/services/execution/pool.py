@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import sandbox
+from .sandbox import Completed, Limits
+
+# Without a pool every run forks the (large) web or judge process and creates and removes a temp dir before the
+# compiler or the program starts. Pool workers are small Python processes started ahead of time, each with its own
+# working directory; a run is a JSON line to an idle worker, which forks g++ or the binary from there. Workers are
+# replaced after max_runs leases, or as soon as one misbehaves, so nothing a run leaves behind outlives them.
+
+
+class SandboxError(RuntimeError):
+    """The worker died, answered garbage, or none was free in time"""
+
+
+class SandboxWorker:
+    """One warm worker process and the directory it runs everything in"""
+
+    def __init__(self, root: Path) -> None:
+        self.workdir = root / uuid.uuid4().hex
+        # Created here rather than by the worker, so files can be placed in it before the worker has booted
+        self.workdir.mkdir(parents=True)
+        self.process = subprocess.Popen(
+            [sys.executable, '-I', sandbox.__file__, str(self.workdir)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding='utf-8',
+        )
+        self.ready = False
+        self.leases = 0
+        self.broken = False
+
+    def _read(self) -> str:
+        line = self.process.stdout.readline()
+        if not line:
+            self.broken = True
+            raise SandboxError(f"Sandbox worker {self.process.pid} exited with status {self.process.poll()}")
+        return line
+
+    def run(self, argv: List[str], workdir: Path, limits: Limits, stdin: str = '') -> Completed:
+        """run_limited, executed by the worker in its workdir"""
+        if not self.ready:
+            if self._read().strip() != sandbox.READY:
+                self.broken = True
+                raise SandboxError(f"Sandbox worker {self.process.pid} did not start")
+            self.ready = True
+        try:
+            self.process.stdin.write(json.dumps({'argv': argv, 'limits': asdict(limits), 'stdin': stdin}) + '\n')
+            self.process.stdin.flush()
+        except OSError as exc:
+            self.broken = True
+            raise SandboxError(f"Sandbox worker {self.process.pid} is gone: {exc}") from exc
+        try:
+            reply = json.loads(self._read())
+        except ValueError as exc:
+            self.broken = True
+            raise SandboxError(f"Sandbox worker {self.process.pid} sent an invalid reply") from exc
+        if not reply.pop('ok'):
+            raise OSError(reply['error'])
+        return Completed(**reply)
+
+    def reset(self) -> None:
+        """Empty the workdir for the next lease"""
+        with os.scandir(self.workdir) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.unlink(entry.path)
+
+    def close(self) -> None:
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class SandboxPool:
+    """size pre-started SandboxWorkers, leased one run at a time and recycled after max_runs leases"""
+
+    def __init__(self, root: Path, size: int, max_runs: int = 50, wait_seconds: float = 30.0) -> None:
+        self.root = root
+        self.size = max(1, size)
+        self.max_runs = max(1, max_runs)
+        self.wait_seconds = wait_seconds
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._started = time.monotonic()
+        self._busy = 0
+        self._busy_seconds = 0.0
+        self.leases = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+        self.recycles = 0
+        self.failures = 0
+        self.spawn_failures = 0
+        self._missing = 0  # workers that could not be replaced yet; retried on the next lease
+        # LIFO: the most recently used worker is the likeliest to have its pages and the compiler's still cached
+        self._idle: "queue.LifoQueue[SandboxWorker]" = queue.LifoQueue()
+        for _ in range(self.size):
+            self._idle.put(SandboxWorker(root))
+        atexit.register(self.close)
+
+    @contextmanager
+    def lease(self) -> Iterator[SandboxWorker]:
+        """An idle worker for one execution; raises SandboxError if none frees up within wait_seconds"""
+        started = time.monotonic()
+        waited = False
+        if self._missing:
+            self._replenish()
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            waited = True
+            try:
+                worker = self._idle.get(timeout=self.wait_seconds)
+            except queue.Empty:
+                with self._lock:
+                    self.waits += 1
+                    self.timeouts += 1
+                raise SandboxError(f"No sandbox worker became free within {self.wait_seconds:g}s") from None
+        leased = time.monotonic()
+        with self._lock:
+            wait = leased - started
+            self.leases += 1
+            self.waits += waited
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            self._busy += 1
+        worker.leases += 1
+        try:
+            yield worker
+        except SandboxError:
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            with self._lock:
+                self._busy -= 1
+                self._busy_seconds += time.monotonic() - leased
+            self._release(worker)
+
+    def _release(self, worker: SandboxWorker) -> None:
+        if not worker.broken and worker.leases < self.max_runs and worker.process.poll() is None:
+            try:
+                worker.reset()
+            except OSError:
+                worker.broken = True
+        if worker.broken or worker.leases >= self.max_runs or worker.process.poll() is not None:
+            worker.close()
+            with self._lock:
+                self.recycles += 1
+            # The replacement boots while it waits in the idle queue; its first lease only waits for what is left.
+            # This runs in lease()'s finally: a failed start must not replace the run's own exception
+            replacement = self._spawn()
+            if replacement is None:
+                return
+            worker = replacement
+        if self._closed:
+            worker.close()
+        else:
+            self._idle.put(worker)
+
+    def _spawn(self) -> Optional[SandboxWorker]:
+        """A new worker, or None (counted as missing) when its process or directory cannot be created"""
+        try:
+            return SandboxWorker(self.root)
+        except OSError:
+            with self._lock:
+                self.spawn_failures += 1
+                self._missing += 1
+            return None
+
+    def _replenish(self) -> None:
+        with self._lock:
+            missing, self._missing = self._missing, 0
+        for _ in range(missing):
+            worker = self._spawn()
+            if worker is None:
+                return
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            uptime = time.monotonic() - self._started
+            return {
+                'size': self.size,
+                'busy': self._busy,
+                'idle': self._idle.qsize(),
+                'leases': self.leases,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'wait_seconds_mean': round(self.wait_seconds_total / self.leases, 4) if self.leases else 0.0,
+                'wait_seconds_max': round(self.wait_seconds_max, 4),
+                'recycles': self.recycles,
+                'failures': self.failures,
+                'spawn_failures': self.spawn_failures,
+                'missing': self._missing,
+                # Share of worker time spent on leases since the pool started
+                'utilization': round(self._busy_seconds / (self.size * uptime), 4) if uptime > 0 else 0.0,
+            }
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Optional
+
+from django.conf import settings
+
+from .. import tiered_cache
+from ..singleflight import SingleFlight
+from .base import ExecutionBackend, Result
+
+# Byte-identical runs (unmodified templates, shared solutions, reruns of unchanged code) share one result, keyed by
+# the final program, its stdin (the test set), the language and the backend's fingerprint (version index, compiler,
+# limits). Only deterministic outcomes are kept; timeouts, runtime errors and API errors can depend on load or on
+# the executor, so those always run again.
+# Results with more output than LEETCODE_RESULT_CACHE_MAX_OUTPUT_BYTES are not kept either, so the in-process tier
+# stays bounded in bytes and not only in entries.
+CACHEABLE_ERRORS = frozenset({'compilation_error'})
+
+# Identical runs in flight in this process share one execution whatever its outcome; the cache's stampede lock
+# only covers other processes, and only until the holder finishes
+_inflight = SingleFlight()
+
+
+def result_key(script: str, language: str, stdin: str, fingerprint: str) -> str:
+    digest = hashlib.sha256()
+    for part in (fingerprint, language, script, stdin):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def cacheable(result: Optional[Result]) -> bool:
+    if result is None or not (result.get('success') or result.get('error_type') in CACHEABLE_ERRORS):
+        return False
+    size = sum(len(str(result.get(field) or '').encode('utf-8')) for field in ('output', 'error'))
+    return size <= getattr(settings, 'LEETCODE_RESULT_CACHE_MAX_OUTPUT_BYTES', 64 * 1024)
+
+
+def execute(backend: ExecutionBackend, script: str, language: str, stdin: str = '') -> Optional[Result]:
+    """backend.execute, answered from the result cache when the same run was seen within the TTL.
+
+    Concurrent identical runs in this process share one execution; across processes they go through the cache's
+    stampede lock, so only one of them reaches the executor while the result is cacheable.
+    """
+    key = result_key(script, language, stdin, backend.fingerprint(language))
+
+    def lookup() -> Optional[Result]:
+        uncached: Any = None
+
+        def run() -> Optional[Result]:
+            nonlocal uncached
+            result = backend.execute(script, language, stdin)
+            if cacheable(result):
+                return result
+            uncached = result
+            return None
+
+        cached = tiered_cache.results().get_or_compute(key, run)
+        return cached if cached is not None else uncached
+
+    result = _inflight.do(key, lookup)
+    # Callers own the dict they get back; the cached or shared one is seen by every other caller
+    return dict(result) if result is not None else None
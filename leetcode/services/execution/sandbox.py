@@ -0,0 +1,129 @@
+"""Run a program under rlimits, in this process or in a warm sandbox worker.
+
+Imports nothing from Django or this package: pool.SandboxWorker starts this file as a script
+(python -I sandbox.py WORKDIR), and the worker answers JSON-line requests on stdin/stdout with
+run_limited inside its own working directory until stdin closes.
+"""
+from __future__ import annotations
+
+import json
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+READY = 'ready'
+
+
+@dataclass(frozen=True)
+class Limits:
+    cpu_seconds: int
+    wall_seconds: float
+    memory_bytes: int
+    output_bytes: int
+    # RLIMIT_NPROC; counts every process of the user, not only this run's (0 keeps the inherited limit)
+    processes: int = 0
+
+    def apply(self) -> None:
+        """preexec_fn: runs in the child between fork and exec"""
+        resource.setrlimit(resource.RLIMIT_CPU, (self.cpu_seconds, self.cpu_seconds + 1))
+        resource.setrlimit(resource.RLIMIT_AS, (self.memory_bytes, self.memory_bytes))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (self.output_bytes, self.output_bytes))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        if self.processes:
+            resource.setrlimit(resource.RLIMIT_NPROC, (self.processes, self.processes))
+
+
+@dataclass
+class Completed:
+    returncode: int
+    stdout: str
+    stderr: str
+    cpu_seconds: float
+    max_rss_kb: int
+    timed_out: bool
+
+    @property
+    def signal_name(self) -> Optional[str]:
+        if self.returncode >= 0:
+            return None
+        try:
+            return signal.Signals(-self.returncode).name
+        except ValueError:
+            return f"signal {-self.returncode}"
+
+
+def run_limited(argv: List[str], workdir: Path, limits: Limits, stdin: str = '') -> Completed:
+    """Run argv in workdir under limits; stdio goes through files so output size is bounded by RLIMIT_FSIZE.
+
+    The child is reaped with wait4, which reports its own CPU time and peak RSS; whatever it forked is then killed
+    with the rest of its process group, so nothing outlives the run or its limits.
+    """
+    stdin_path, stdout_path, stderr_path = workdir / 'stdin.txt', workdir / 'stdout.txt', workdir / 'stderr.txt'
+    stdin_path.write_text(stdin, encoding='utf-8')
+    with open(stdin_path, 'rb') as stdin_file, open(stdout_path, 'wb') as stdout_file, \
+            open(stderr_path, 'wb') as stderr_file:
+        process = subprocess.Popen(
+            argv, cwd=workdir, stdin=stdin_file, stdout=stdout_file, stderr=stderr_file,
+            preexec_fn=limits.apply, start_new_session=True, env={'PATH': os.environ.get('PATH', '/usr/bin:/bin')},
+        )
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def expire() -> None:
+        timed_out.set()
+        kill()
+
+    timer = threading.Timer(limits.wall_seconds, expire)
+    timer.start()
+    try:
+        _, status, usage = os.wait4(process.pid, 0)
+    finally:
+        timer.cancel()
+        kill()
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return Completed(
+        returncode=process.returncode,
+        stdout=stdout_path.read_text(encoding='utf-8', errors='replace'),
+        stderr=stderr_path.read_text(encoding='utf-8', errors='replace'),
+        cpu_seconds=usage.ru_utime + usage.ru_stime,
+        max_rss_kb=usage.ru_maxrss,
+        timed_out=timed_out.is_set(),
+    )
+
+
+def serve(workdir: Path) -> None:
+    """Worker loop: {"argv", "limits", "stdin"} in, {"ok": true, **Completed} or {"ok": false, "error"} out"""
+    workdir.mkdir(parents=True, exist_ok=True)
+    # Requests and replies own stdin/stdout; programs get their stdio from files in workdir
+    channel = sys.stdout
+    sys.stdout = sys.stderr
+    channel.write(READY + '\n')
+    channel.flush()
+    try:
+        for line in sys.stdin:
+            request = json.loads(line)
+            try:
+                completed = run_limited(request['argv'], workdir, Limits(**request['limits']), request.get('stdin', ''))
+                reply = {'ok': True, **asdict(completed)}
+            except OSError as exc:
+                reply = {'ok': False, 'error': str(exc)}
+            channel.write(json.dumps(reply) + '\n')
+            channel.flush()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    serve(Path(sys.argv[1]))
@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .cpp_signature import CppType, SignatureError, parse_type
+from .literals import FLOAT_TYPES, INT_TYPES, LiteralError, parse_assignments
+
+# Test cases travel on stdin, one LeetCode literal per line: each case is one line per parameter followed by
+# the expected output line. The harness reads cases until EOF, so one binary runs any number of them.
+
+NODE_TYPES = frozenset({'ListNode', 'TreeNode'})
+SCALAR_TYPES = INT_TYPES | FLOAT_TYPES | {'bool', 'char', 'string'}
+PREVIEW_CHARS = 200
+MAX_TEMPLATES = 256
+
+_RUNTIME = r'''
+#include <cctype>
+#include <iomanip>
+#include <sstream>
+#include <stdexcept>
+
+struct LcReader {
+    const string& s;
+    size_t i;
+    explicit LcReader(const string& text) : s(text), i(0) {}
+    void skip() { while (i < s.size() && isspace((unsigned char)s[i])) i++; }
+    bool peek(char c) { skip(); return i < s.size() && s[i] == c; }
+    void expect(char c) {
+        if (!peek(c)) throw runtime_error(string("expected '") + c + "' at " + to_string(i));
+        i++;
+    }
+    string token() {
+        skip();
+        size_t start = i;
+        while (i < s.size() && s[i] != ',' && s[i] != ']' && !isspace((unsigned char)s[i])) i++;
+        if (start == i) throw runtime_error("expected a value at " + to_string(i));
+        return s.substr(start, i - start);
+    }
+    static void utf8(string& out, unsigned code) {
+        if (code < 0x80) out += (char)code;
+        else if (code < 0x800) { out += (char)(0xC0 | (code >> 6)); out += (char)(0x80 | (code & 0x3F)); }
+        else { out += (char)(0xE0 | (code >> 12)); out += (char)(0x80 | ((code >> 6) & 0x3F)); out += (char)(0x80 | (code & 0x3F)); }
+    }
+    string quoted() {
+        skip();
+        char quote = s[i++];
+        string out;
+        while (i < s.size() && s[i] != quote) {
+            char c = s[i++];
+            if (c != '\\' || i >= s.size()) { out += c; continue; }
+            char e = s[i++];
+            switch (e) {
+                case 'n': out += '\n'; break;
+                case 't': out += '\t'; break;
+                case 'r': out += '\r'; break;
+                case 'b': out += '\b'; break;
+                case 'f': out += '\f'; break;
+                case 'u': utf8(out, (unsigned)stoul(s.substr(i, 4), nullptr, 16)); i += 4; break;
+                default: out += e;
+            }
+        }
+        if (i >= s.size()) throw runtime_error("unterminated string");
+        i++;
+        return out;
+    }
+    bool quote_next() { return peek('"') || peek('\''); }
+};
+
+inline void lc_read(LcReader& r, int& v) { v = stoi(r.token()); }
+inline void lc_read(LcReader& r, short& v) { v = (short)stoi(r.token()); }
+inline void lc_read(LcReader& r, long& v) { v = stol(r.token()); }
+inline void lc_read(LcReader& r, long long& v) { v = stoll(r.token()); }
+inline void lc_read(LcReader& r, unsigned& v) { v = (unsigned)stoul(r.token()); }
+inline void lc_read(LcReader& r, unsigned long& v) { v = stoul(r.token()); }
+inline void lc_read(LcReader& r, unsigned long long& v) { v = stoull(r.token()); }
+inline void lc_read(LcReader& r, float& v) { v = stof(r.token()); }
+inline void lc_read(LcReader& r, double& v) { v = stod(r.token()); }
+inline void lc_read(LcReader& r, long double& v) { v = stold(r.token()); }
+inline void lc_read(LcReader& r, bool& v) { string t = r.token(); v = t == "true" || t == "1"; }
+inline void lc_read(LcReader& r, string& v) { v = r.quote_next() ? r.quoted() : r.token(); }
+inline void lc_read(LcReader& r, char& v) { string t = r.quote_next() ? r.quoted() : r.token(); v = t.empty() ? '\0' : t[0]; }
+
+template <typename T>
+void lc_read(LcReader& r, vector<T>& v) {
+    v.clear();
+    r.expect('[');
+    if (r.peek(']')) { r.i++; return; }
+    while (true) {
+        T item;
+        lc_read(r, item);
+        v.push_back(item);
+        if (r.peek(',')) { r.i++; continue; }
+        r.expect(']');
+        return;
+    }
+}
+
+inline string lc_write(int v) { return to_string(v); }
+inline string lc_write(short v) { return to_string(v); }
+inline string lc_write(long v) { return to_string(v); }
+inline string lc_write(long long v) { return to_string(v); }
+inline string lc_write(unsigned v) { return to_string(v); }
+inline string lc_write(unsigned long v) { return to_string(v); }
+inline string lc_write(unsigned long long v) { return to_string(v); }
+inline string lc_write(long double v) { ostringstream out; out << fixed << setprecision(5) << v; return out.str(); }
+inline string lc_write(double v) { return lc_write((long double)v); }
+inline string lc_write(float v) { return lc_write((long double)v); }
+inline string lc_write(bool v) { return v ? "true" : "false"; }
+inline string lc_write(const string& v) {
+    string out = "\"";
+    for (char c : v) {
+        if (c == '"' || c == '\\') { out += '\\'; out += c; }
+        else if (c == '\n') out += "\\n";
+        else if (c == '\t') out += "\\t";
+        else out += c;
+    }
+    return out + "\"";
+}
+inline string lc_write(char v) { return lc_write(string(1, v)); }
+inline string lc_write(const vector<bool>& v) {
+    string out = "[";
+    for (size_t k = 0; k < v.size(); k++) { if (k) out += ","; out += lc_write((bool)v[k]); }
+    return out + "]";
+}
+
+template <typename T>
+string lc_write(const vector<T>& v) {
+    string out = "[";
+    for (size_t k = 0; k < v.size(); k++) { if (k) out += ","; out += lc_write(v[k]); }
+    return out + "]";
+}
+'''
+
+_LIST_RUNTIME = r'''
+inline void lc_read(LcReader& r, ListNode*& head) {
+    vector<int> values;
+    lc_read(r, values);
+    ListNode dummy;
+    ListNode* tail = &dummy;
+    for (int x : values) { tail->next = new ListNode(x); tail = tail->next; }
+    head = dummy.next;
+}
+
+inline string lc_write(ListNode* head) {
+    string out = "[";
+    for (size_t k = 0; head && k < 1000000; head = head->next, k++) { if (k) out += ","; out += to_string(head->val); }
+    return out + "]";
+}
+'''
+
+_TREE_RUNTIME = r'''
+#include <queue>
+
+inline void lc_read(LcReader& r, TreeNode*& root) {
+    vector<string> tokens;
+    lc_read(r, tokens);
+    root = nullptr;
+    if (tokens.empty() || tokens[0] == "null") return;
+    root = new TreeNode(stoi(tokens[0]));
+    queue<TreeNode*> pending;
+    pending.push(root);
+    size_t k = 1;
+    while (!pending.empty() && k < tokens.size()) {
+        TreeNode* node = pending.front();
+        pending.pop();
+        if (tokens[k] != "null") { node->left = new TreeNode(stoi(tokens[k])); pending.push(node->left); }
+        if (++k < tokens.size() && tokens[k] != "null") { node->right = new TreeNode(stoi(tokens[k])); pending.push(node->right); }
+        k++;
+    }
+}
+
+inline string lc_write(TreeNode* root) {
+    vector<string> values;
+    queue<TreeNode*> pending;
+    pending.push(root);
+    while (!pending.empty()) {
+        TreeNode* node = pending.front();
+        pending.pop();
+        if (!node) { values.push_back("null"); continue; }
+        values.push_back(to_string(node->val));
+        pending.push(node->left);
+        pending.push(node->right);
+    }
+    while (!values.empty() && values.back() == "null") values.pop_back();
+    string out = "[";
+    for (size_t k = 0; k < values.size(); k++) { if (k) out += ","; out += values[k]; }
+    return out + "]";
+}
+'''
+
+_DRIVER = r'''
+template <typename T>
+T lc_parse(const string& text) {
+    LcReader r(text);
+    T value;
+    lc_read(r, value);
+    return value;
+}
+
+template <typename T>
+string lc_canonical(const string& text) {
+    try { return lc_write(lc_parse<T>(text)); } catch (const exception&) { return text; }
+}
+
+inline string lc_preview(const string& text) {
+    return text.size() <= %(preview)d ? text : text.substr(0, %(preview)d) + "... (" + to_string(text.size()) + " chars)";
+}
+
+inline bool lc_next_case(istream& in, vector<string>& lines) {
+    for (size_t k = 0; k < lines.size(); k++) {
+        if (!getline(in, lines[k])) return false;
+        if (!lines[k].empty() && lines[k].back() == '\r') lines[k].pop_back();
+    }
+    return true;
+}
+'''
+
+
+def _decl(cpp_type: CppType) -> str:
+    """Spelling of a local variable holding a value of cpp_type"""
+    if cpp_type.pointer:
+        return CppType(cpp_type.name, cpp_type.args, pointer=cpp_type.pointer).spelling
+    return cpp_type.base.spelling
+
+
+def supported(cpp_type: CppType) -> bool:
+    """Whether the harness runtime can read and print values of cpp_type"""
+    name = cpp_type.unqualified_name
+    if cpp_type.pointer:
+        return cpp_type.pointer == 1 and not cpp_type.args and name in NODE_TYPES
+    if name == 'vector':
+        return len(cpp_type.args) == 1 and supported(cpp_type.args[0])
+    return not cpp_type.args and name in SCALAR_TYPES
+
+
+def _types(function_signature: Dict[str, Any]) -> Optional[Tuple[CppType, List[Tuple[CppType, str]]]]:
+    try:
+        return_type = parse_type(function_signature['return_type'])
+        parameters = [(parse_type(p['type']), p['name']) for p in function_signature['parameters']]
+    except (SignatureError, KeyError, TypeError):
+        return None
+    if not all(supported(t) for t, _ in parameters):
+        return None
+    if return_type.name == 'void' and not return_type.pointer:
+        # In-place problems (rotate, sortColors) are judged on their first argument, as LeetCode does
+        return (return_type, parameters) if parameters else None
+    return (return_type, parameters) if supported(return_type) else None
+
+
+def _uses(types: Sequence[CppType], name: str) -> bool:
+    return any(t.unqualified_name == name or _uses(t.args, name) for t in types)
+
+
+def _cpp_text(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def harness_source(question_id: Any, function_signature: Dict[str, Any]) -> Optional[str]:
+    """Runtime and main() that judge stdin test cases against Solution::method; None for unsupported types.
+
+    Placed after the user's code (and the ListNode/TreeNode definitions it relies on).
+    """
+    typed = _types(function_signature)
+    if typed is None:
+        return None
+    return_type, parameters = typed
+    method_name = function_signature['method_name']
+    all_types = [return_type] + [t for t, _ in parameters]
+    is_void = return_type.name == 'void'
+    result_type = _decl(parameters[0][0]) if is_void else _decl(return_type)
+    declared = ', '.join(f"{t.spelling} {name}" for t, name in parameters)
+
+    parts = [_RUNTIME]
+    if _uses(all_types, 'ListNode'):
+        parts.append(_LIST_RUNTIME)
+    if _uses(all_types, 'TreeNode'):
+        parts.append(_TREE_RUNTIME)
+    parts.append(_DRIVER % {'preview': PREVIEW_CHARS})
+
+    body = [
+        'int main() {',
+        '    ios::sync_with_stdio(false);',
+        '    int lc_passed = 0, lc_total = 0;',
+        f'    vector<string> lc_lines({len(parameters) + 1});',
+        f'    cout << "=== Test Cases for Problem {_cpp_text(str(question_id))} ===" << endl;',
+        f'    cout << "Method: {method_name}({_cpp_text(declared)}) -> {_cpp_text(return_type.spelling)}" << endl;',
+        f'    cout << "Parameters detected: {len(parameters)}" << endl;',
+    ]
+    for index, (cpp_type, name) in enumerate(parameters):
+        body.append(f'    cout << "  {index + 1}. {_cpp_text(cpp_type.spelling)} {name}" << endl;')
+    body += [
+        '    cout << endl;',
+        '    while (lc_next_case(cin, lc_lines)) {',
+        '        lc_total++;',
+        '        cout << "Test Case " << lc_total << ":" << endl;',
+        '        cout << "  Input: ";',
+    ]
+    for index, (_, name) in enumerate(parameters):
+        separator = ', ' if index else ''
+        body.append(f'        cout << "{separator}{name} = " << lc_preview(lc_lines[{index}]);')
+    body += [
+        '        cout << endl;',
+        f'        string lc_expected = lc_canonical<{result_type}>(lc_lines[{len(parameters)}]);',
+        '        cout << "  Expected: " << lc_preview(lc_expected) << endl;',
+        '        try {',
+    ]
+    for index, (cpp_type, _) in enumerate(parameters):
+        body.append(f'            {_decl(cpp_type)} lc_arg{index} = lc_parse<{_decl(cpp_type)}>(lc_lines[{index}]);')
+    arguments = ', '.join(f'lc_arg{index}' for index in range(len(parameters)))
+    body.append('            Solution solution;')
+    if is_void:
+        body.append(f'            solution.{method_name}({arguments});')
+        body.append('            string lc_actual = lc_write(lc_arg0);')
+    else:
+        body.append(f'            string lc_actual = lc_write(solution.{method_name}({arguments}));')
+    body += [
+        '            cout << "  Your Output: " << lc_preview(lc_actual) << endl;',
+        '            if (lc_actual == lc_expected) {',
+        '                cout << "  ✓ PASSED" << endl;',
+        '                lc_passed++;',
+        '            } else {',
+        '                cout << "  ✗ FAILED" << endl;',
+        '            }',
+        '        } catch (const exception& e) {',
+        '            cout << "  Invalid input: " << e.what() << endl;',
+        '            cout << "  ✗ FAILED" << endl;',
+        '        }',
+        '        cout << endl;',
+        '    }',
+        '    cout << "Result: " << lc_passed << "/" << lc_total << " test cases passed" << endl;',
+        f'    cout << "Function signature: {_cpp_text(return_type.spelling)} {method_name}({_cpp_text(declared)})" << endl;',
+        '    return 0;',
+        '}',
+    ]
+    parts.append('\n'.join(body))
+    return '\n'.join(parts)
+
+
+def _value_source(line: str, name: str) -> str:
+    """The literal from an input line, dropping a ``name =`` prefix ("nums = [1,2]" -> "[1,2]")"""
+    if '=' not in line or not re.match(r'\s*[A-Za-z_]\w*\s*=', line):
+        return line
+    try:
+        assignments = parse_assignments(line)
+    except LiteralError:
+        return line
+    for assigned, _, source in assignments:
+        if assigned == name:
+            return source
+    return assignments[0][2] if len(assignments) == 1 else line
+
+
+def group_test_cases(example_testcases: str, parameter_names: Sequence[str]) -> List[Tuple[List[str], str]]:
+    """([input literal per parameter], expected line) groups, grouped as parse_typed_test_cases groups them"""
+    lines = [line.strip() for line in example_testcases.strip().split('\n')]
+    count = len(parameter_names)
+    cases = []
+    i = 0
+    while i + count < len(lines):
+        inputs, expected = lines[i:i + count], lines[i + count]
+        if all(inputs) and expected:
+            cases.append(([_value_source(line, name) for line, name in zip(inputs, parameter_names)], expected))
+        i += count + 1
+    return cases
+
+
+def harness_stdin(cases: Sequence[Tuple[Sequence[str], str]]) -> str:
+    """stdin for harness_source: each case's input lines, then its expected line"""
+    return ''.join(''.join(f"{line}\n" for line in inputs) + f"{expected}\n" for inputs, expected in cases)
+
+
+_REPORT_FIELDS = {'Input': 'input', 'Expected': 'expected', 'Your Output': 'output', 'Invalid input': 'error'}
+_CASE_HEADER = re.compile(r'Test Case (\d+):$')
+
+
+def parse_report(output: str) -> List[Dict[str, Any]]:
+    """Per-case results from a harness run's output: case, input, expected, output, passed (and error)"""
+    cases: List[Dict[str, Any]] = []
+    for line in output.splitlines():
+        header = _CASE_HEADER.match(line)
+        if header:
+            cases.append({'case': int(header.group(1)), 'passed': False})
+            continue
+        if not cases or not line.startswith('  '):
+            continue
+        text = line.strip()
+        if text in ('✓ PASSED', '✗ FAILED'):
+            cases[-1]['passed'] = text == '✓ PASSED'
+            continue
+        label, _, value = text.partition(': ')
+        if label in _REPORT_FIELDS:
+            cases[-1][_REPORT_FIELDS[label]] = value
+    return cases
+
+
+@dataclass(frozen=True)
+class Template:
+    """Everything in a judged program but the user's code: the script around it and the stdin"""
+
+    prefix: str
+    suffix: str
+    stdin: str
+
+    def render(self, code: str) -> Tuple[str, str]:
+        return f"{self.prefix}{code}{self.suffix}", self.stdin
+
+
+TemplateKey = Tuple[str, str, str]
+
+_lock = threading.Lock()
+_templates: 'OrderedDict[TemplateKey, Optional[Template]]' = OrderedDict()
+_hits = 0
+_misses = 0
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def template_key(problem: Any, function_signature: Dict[str, Any], example_testcases: str) -> TemplateKey:
+    """(problem, signature hash, test-set hash)"""
+    signature = json.dumps([
+        function_signature['return_type'],
+        function_signature['method_name'],
+        [[p['type'], p['name']] for p in function_signature['parameters']],
+    ])
+    return str(problem), _digest(signature), _digest(example_testcases or '')
+
+
+def cached_template(key: TemplateKey, build: Callable[[], Optional[Template]]) -> Optional[Template]:
+    """The template for key, built on first use; unsupported signatures (None) are remembered too"""
+    global _hits, _misses
+    with _lock:
+        if key in _templates:
+            _templates.move_to_end(key)
+            _hits += 1
+            return _templates[key]
+        _misses += 1
+    template = build()
+    with _lock:
+        _templates[key] = template
+        _templates.move_to_end(key)
+        while len(_templates) > MAX_TEMPLATES:
+            _templates.popitem(last=False)
+    return template
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        total = _hits + _misses
+        return {
+            'hits': _hits,
+            'misses': _misses,
+            'hit_rate': _hits / total if total else 0.0,
+            'size': len(_templates),
+            'bytes': sum(len(t.prefix) + len(t.suffix) + len(t.stdin) for t in _templates.values() if t),
+        }
+
+
+def clear() -> None:
+    global _hits, _misses
+    with _lock:
+        _templates.clear()
+        _hits = _misses = 0
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from . import resilience
+
+
+@dataclass
+class HostMetrics:
+    requests: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(self.total_seconds * 1000 / self.requests, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 1),
+        }
+
+
+class HttpClient:
+    """Process-wide outbound HTTP client with keep-alive connection pools per host.
+
+    The adapter (and its urllib3 pool manager) is shared by every thread; each thread gets
+    its own lightweight Session mounted on it so cookies and headers never leak between
+    concurrent requests. Each host has a circuit breaker, and hosts listed in
+    adaptive_timeout_hosts get timeouts derived from their observed latency.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20, pool_block: bool = False,
+                 adaptive_timeout_hosts: Iterable[str] = ()) -> None:
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.adaptive_timeout_hosts = set(adaptive_timeout_hosts)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, HostMetrics] = {}
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            self._local.session = session
+        return session
+
+    def _record(self, host: str, elapsed: float, failed: bool) -> None:
+        with self._lock:
+            metrics = self._metrics.setdefault(host, HostMetrics())
+            metrics.requests += 1
+            metrics.errors += int(failed)
+            metrics.total_seconds += elapsed
+            metrics.max_seconds = max(metrics.max_seconds, elapsed)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        host = urlsplit(url).netloc
+        upstream = resilience.get_upstream(host)
+        if not upstream.breaker.allow_request():
+            raise resilience.CircuitOpenError(f"Circuit open for {host}; not sending request")
+        if host in self.adaptive_timeout_hosts:
+            kwargs["timeout"] = upstream.timeout(kwargs.get("timeout"))
+        started = time.monotonic()
+        status: Optional[int] = None
+        try:
+            response = self._session().request(method, url, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            elapsed = time.monotonic() - started
+            # Throttling counts against the host like an outage, so the breaker backs off from it
+            failed = status is None or status >= 500 or status == 429
+            self._record(host, elapsed, failed)
+            if failed:
+                upstream.breaker.record_failure()
+            elif status < 400:
+                upstream.breaker.record_success()
+                upstream.latency.record(elapsed)
+            else:
+                # A rejected request (bad query, auth) says nothing about the host's health, and its
+                # latency (often an early reject) would pull the adaptive timeout down
+                upstream.breaker.record_inconclusive()
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {host: m.as_dict() for host, m in self._metrics.items()}
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(
+                    pool_connections=getattr(settings, "OUTBOUND_HTTP_POOL_CONNECTIONS", 10),
+                    pool_maxsize=getattr(settings, "OUTBOUND_HTTP_POOL_MAXSIZE", 20),
+                    pool_block=getattr(settings, "OUTBOUND_HTTP_POOL_BLOCK", False),
+                    adaptive_timeout_hosts=getattr(settings, "OUTBOUND_ADAPTIVE_TIMEOUT_HOSTS", ()),
+                )
+    return _client
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return get_http_client().post(url, **kwargs)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return get_http_client().get(url, **kwargs)
+
+
+def metrics() -> Dict[str, Dict[str, Any]]:
+    return get_http_client().metrics()
@@ -0,0 +1,230 @@
+"""Run requests as jobs: compile_code queues a JudgeJob and returns its id, workers execute it.
+
+LEETCODE_JUDGE_MODE picks who executes:
+- "thread": a bounded pool of LEETCODE_JUDGE_THREADS threads in the web process, plus a sweeper that requeues
+  jobs left running by a dead process, drains jobs left queued by a restart and purges old finished ones
+- "worker": separate `manage.py run_judge_workers` processes polling the table
+- "eager": inline at submit (tests, debugging)
+Workers claim a job with a conditional UPDATE (queued -> running), so a job runs once even when
+several processes poll the same table. Which job a worker claims, and whether a submit is admitted
+at all, is decided by judge_scheduler. Every state change is also sent to the job's channel-layer group
+(job_group), so editor sockets hear about it without polling.
+"""
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from leetcode.models import JudgeJob
+
+from . import judge_scheduler
+from .judge_scheduler import Rejected
+
+# The pipelines a job may run, by key; only these dotted paths are ever imported from a job row
+RUNNERS = {
+    'leetcode': 'leetcode.views.execute_code_jdoodle',
+    'project': 'mysite.views.execute_code_jdoodle',
+}
+UNAVAILABLE = {'success': False, 'error': 'Execution service unavailable. Please try again.', 'error_type': 'api_error'}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_sweeper: Optional[threading.Thread] = None
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+
+def _mode() -> str:
+    return getattr(settings, 'LEETCODE_JUDGE_MODE', 'thread')
+
+
+def job_group(job_id: Any) -> str:
+    return f"judge_job_{str(job_id).replace('-', '')}"
+
+
+def notify(job: JudgeJob) -> None:
+    """Tell sockets following job that its status changed; they re-read the row themselves"""
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    try:
+        async_to_sync(layer.group_send)(job_group(job.pk), {'type': 'judge.update', 'job_id': str(job.pk), 'status': job.status})
+    except Exception:
+        # Followers fall back to re-reading the row; a missing or broken layer must not fail the run
+        pass
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, getattr(settings, 'LEETCODE_JUDGE_THREADS', 4)), thread_name_prefix='judge',
+                )
+    return _executor
+
+
+def ensure_sweeper() -> None:
+    """Thread mode: start this process's sweeper, which runs sweep() on the pool at once and then every
+    LEETCODE_JUDGE_SWEEP_SECONDS, so jobs queued before a restart do not wait for the next submit"""
+    global _sweeper
+    if _sweeper is not None or _mode() != 'thread':
+        return
+    with _executor_lock:
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_forever, name='judge-sweeper', daemon=True)
+            _sweeper.start()
+
+
+def _sweep_forever() -> None:
+    while True:
+        _pool().submit(sweep)
+        time.sleep(max(1, getattr(settings, 'LEETCODE_JUDGE_SWEEP_SECONDS', 60)))
+
+
+def submit(runner: str, code: str, language: str = 'cpp', question_id: Any = '1', title_slug: Optional[str] = None,
+           user: Any = None, session_key: Optional[str] = None) -> JudgeJob:
+    """Queue a run and wake the configured executor; returns immediately (except in eager mode).
+
+    Raises Rejected when the user's flow is over its rate limit or pending-job cap.
+    """
+    if runner not in RUNNERS:
+        raise ValueError(f"Unknown judge runner {runner!r}")
+    ensure_sweeper()
+    user = user if user is not None and getattr(user, 'is_authenticated', False) else None
+    flow = judge_scheduler.flow_for(user, session_key)
+    weight = judge_scheduler.weight_for(user)
+    job = JudgeJob.objects.create(
+        runner=runner, code=code, language=language, question_id=str(question_id), title_slug=title_slug or '',
+        user=user, flow=flow, weight=weight, **judge_scheduler.assign_tags(flow, weight),
+    )
+    judge_scheduler.admit(job)
+    mode = _mode()
+    if mode == 'eager':
+        run_claimed(job.pk, close_connections=False)
+        job.refresh_from_db()
+    elif mode == 'thread':
+        _pool().submit(drain)
+    return job
+
+
+def claim(job_id: Any) -> Optional[JudgeJob]:
+    """Move a queued job to running for this worker; None when another worker got it first"""
+    claimed = JudgeJob.objects.filter(pk=job_id, status=JudgeJob.QUEUED).update(
+        status=JudgeJob.RUNNING, started_at=timezone.now(), worker=worker_name(),
+    )
+    return JudgeJob.objects.get(pk=job_id) if claimed else None
+
+
+def claim_next() -> Optional[JudgeJob]:
+    """Claim the next job in fair order that the concurrency limits allow, or None"""
+    return judge_scheduler.claim_next(worker_name())
+
+
+def execute(job: JudgeJob) -> JudgeJob:
+    """Run a claimed job's pipeline and record its result, unless the job was taken over meanwhile"""
+    notify(job)
+    runner: Callable[..., Optional[Dict[str, Any]]] = import_string(RUNNERS[job.runner])
+    try:
+        result = runner(job.code, job.language, job.question_id, job.title_slug or None)
+        job.result = result if result is not None else dict(UNAVAILABLE)
+        job.status = JudgeJob.DONE
+    except Exception as exc:
+        job.error = f"{type(exc).__name__}: {exc}"
+        job.result = {'success': False, 'error': f'Server error: {exc}', 'error_type': 'runtime_error'}
+        job.status = JudgeJob.FAILED
+    job.finished_at = timezone.now()
+    # A run slower than the stale threshold gets requeued and claimed again; only the current claim (same worker
+    # and start time) may record a result, so this one is dropped rather than overwriting the newer run's
+    recorded = JudgeJob.objects.filter(
+        pk=job.pk, status=JudgeJob.RUNNING, worker=job.worker, started_at=job.started_at,
+    ).update(result=job.result, error=job.error, status=job.status, finished_at=job.finished_at)
+    if not recorded:
+        return JudgeJob.objects.filter(pk=job.pk).first() or job
+    notify(job)
+    return job
+
+
+def run_claimed(job_id: Any, close_connections: bool = True) -> Optional[JudgeJob]:
+    """Claim and execute one job by id, bypassing fair ordering (eager mode)"""
+    try:
+        job = claim(job_id)
+        return execute(job) if job is not None else None
+    finally:
+        if close_connections:
+            close_old_connections()
+
+
+def drain() -> int:
+    """Pool threads: run claimable jobs until none is left.
+
+    Jobs held back by a flow's running cap are picked up here once that flow's job finishes.
+    """
+    done = 0
+    try:
+        while True:
+            job = claim_next()
+            if job is None:
+                return done
+            execute(job)
+            done += 1
+    finally:
+        close_old_connections()
+
+
+def requeue_stale(older_than: timedelta) -> int:
+    """Put jobs whose worker died mid-run back in the queue"""
+    return JudgeJob.objects.filter(status=JudgeJob.RUNNING, started_at__lt=timezone.now() - older_than).update(
+        status=JudgeJob.QUEUED, started_at=None, worker='',
+    )
+
+
+def purge_finished(older_than: Optional[timedelta] = None) -> int:
+    """Delete done and failed jobs created more than older_than (LEETCODE_JUDGE_RETENTION_SECONDS) ago"""
+    if older_than is None:
+        seconds = getattr(settings, 'LEETCODE_JUDGE_RETENTION_SECONDS', 7 * 24 * 3600)
+        if not seconds:
+            return 0
+        older_than = timedelta(seconds=seconds)
+    # created_at rather than finished_at: it is indexed with status, and a job finishes soon after it is created
+    return JudgeJob.objects.filter(
+        status__in=[JudgeJob.DONE, JudgeJob.FAILED], created_at__lt=timezone.now() - older_than,
+    ).delete()[0]
+
+
+def sweep() -> int:
+    """Thread-mode upkeep on a pool thread: requeue jobs a dead process left running, purge old finished jobs,
+    then drain the queue"""
+    try:
+        # Left running, they would hold their flow's running slot and the host-wide one forever
+        requeue_stale(timedelta(seconds=getattr(settings, 'LEETCODE_JUDGE_STALE_SECONDS', 120)))
+        purge_finished()
+    finally:
+        close_old_connections()
+    return drain()
+
+
+def payload(job: JudgeJob) -> Dict[str, Any]:
+    """What the status endpoint returns: the job state, plus the execution result once finished"""
+    ensure_sweeper()
+    data: Dict[str, Any] = {'job_id': str(job.pk), 'status': job.status}
+    if job.status == JudgeJob.QUEUED:
+        data['queue_position'] = judge_scheduler.queue_position(job)
+    if job.finished:
+        data['result'] = job.result
+    return data
@@ -0,0 +1,183 @@
+"""Admission control and fair ordering for judge jobs.
+
+Admission: a flow (one per user, or per session when anonymous) may create LEETCODE_JUDGE_RATE_LIMIT
+jobs per LEETCODE_JUDGE_RATE_WINDOW_SECONDS and hold LEETCODE_JUDGE_USER_MAX_PENDING unfinished
+ones. The job row is inserted first and then counted against every other row of its flow, so of
+two concurrent requests for the last slot the one committing last sees the other and is refused
+(the old cache get/set let both through). created_at is set before the INSERT, so ranking rows by
+it would not do: the earlier timestamp may commit later and miss the row that did not count it.
+
+Ordering: start-time fair queuing. A job's start tag is max(virtual time, its flow's last finish
+tag) and its finish tag adds 1/weight, so a user who queues ten runs gets them interleaved with
+everyone else's instead of ahead of them. Workers claim the smallest start tag whose flow is
+under LEETCODE_JUDGE_USER_MAX_RUNNING, while fewer than LEETCODE_JUDGE_MAX_RUNNING jobs run
+host-wide; both limits are re-checked inside the claiming UPDATE. That check alone is not atomic
+under Postgres' READ COMMITTED (two claims of different rows both see the old running count), so
+claims there take turns on a transaction-scoped advisory lock; SQLite runs one writer at a time.
+"""
+from __future__ import annotations
+
+import math
+from datetime import timedelta
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Min, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import LessThan
+from django.utils import timezone
+
+from leetcode.models import JudgeJob
+
+CANDIDATES = 50  # queued jobs inspected per claim before giving up on capped flows
+CLAIM_LOCK = 0x6a756467  # pg_advisory_xact_lock key shared by every claiming worker
+WAIT_SAMPLES = 200
+
+
+class Rejected(Exception):
+    """The flow is over its rate limit or pending-job cap"""
+
+
+def _setting(name: str, default: Any) -> Any:
+    return getattr(settings, name, default)
+
+
+def flow_for(user: Any = None, session_key: Optional[str] = None) -> str:
+    if user is not None and getattr(user, 'is_authenticated', False):
+        return f"user:{user.pk}"
+    return f"session:{session_key}" if session_key else 'anonymous'
+
+
+def weight_for(user: Any = None) -> float:
+    if user is not None and getattr(user, 'is_staff', False):
+        return float(_setting('LEETCODE_JUDGE_STAFF_WEIGHT', 1.0))
+    return 1.0
+
+
+def _latest(queryset, field: str) -> float:
+    return queryset.order_by(f'-{field}').values_list(field, flat=True).first() or 0.0
+
+
+def assign_tags(flow: str, weight: float) -> Dict[str, float]:
+    """fair_start/fair_finish for a new job of flow"""
+    # One index seek per status on (status, fair_start), instead of aggregating over every job ever run
+    virtual_time = max(
+        _latest(JudgeJob.objects.filter(status=status), 'fair_start')
+        for status in (JudgeJob.RUNNING, JudgeJob.DONE, JudgeJob.FAILED)
+    )
+    # A flow's tags only grow, so its newest job holds its last finish tag (one seek on (flow, created_at))
+    last_finish = JudgeJob.objects.filter(flow=flow).order_by('-created_at').values_list('fair_finish', flat=True).first()
+    start = max(virtual_time, last_finish or 0.0)
+    return {'fair_start': start, 'fair_finish': start + 1.0 / max(weight, 1e-6)}
+
+
+def admit(job: JudgeJob) -> None:
+    """Raise Rejected (after deleting the job) when the freshly inserted job exceeds its flow's limits"""
+    others = JudgeJob.objects.filter(flow=job.flow).exclude(pk=job.pk)
+    window = timezone.now() - timedelta(seconds=_setting('LEETCODE_JUDGE_RATE_WINDOW_SECONDS', 300))
+    rate_limit = _setting('LEETCODE_JUDGE_RATE_LIMIT', 20)
+    max_pending = _setting('LEETCODE_JUDGE_USER_MAX_PENDING', 3)
+    reason = None
+    if others.filter(created_at__gte=window).count() >= rate_limit:
+        reason = 'Rate limit exceeded. Try again later.'
+    elif others.filter(status__in=[JudgeJob.QUEUED, JudgeJob.RUNNING]).count() >= max_pending:
+        reason = f'You already have {max_pending} runs in progress. Wait for one to finish.'
+    if reason:
+        job.delete()
+        raise Rejected(reason)
+
+
+def _running_count(**filters: Any) -> Coalesce:
+    running = JudgeJob.objects.filter(status=JudgeJob.RUNNING, **filters).order_by()
+    return Coalesce(Subquery(running.values('status').annotate(n=Count('pk')).values('n')[:1]), 0)
+
+
+def claim_fair(job_id: Any, flow: str, worker: str) -> Optional[JudgeJob]:
+    """queued -> running, only while the host-wide and per-flow running limits still hold"""
+    claimed = JudgeJob.objects.filter(pk=job_id, status=JudgeJob.QUEUED).filter(
+        LessThan(_running_count(), _setting('LEETCODE_JUDGE_MAX_RUNNING', 8)),
+        LessThan(_running_count(flow=flow), _setting('LEETCODE_JUDGE_USER_MAX_RUNNING', 1)),
+    ).update(status=JudgeJob.RUNNING, started_at=timezone.now(), worker=worker)
+    return JudgeJob.objects.get(pk=job_id) if claimed else None
+
+
+@contextmanager
+def _claim_lock() -> Iterator[None]:
+    """Serialize claims across processes for the rest of the block (Postgres only)"""
+    if connection.vendor != 'postgresql':
+        yield
+        return
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [CLAIM_LOCK])
+        yield
+
+
+def claim_next(worker: str) -> Optional[JudgeJob]:
+    """Claim the queued job with the smallest start tag whose flow may run another job"""
+    with _claim_lock():
+        return _claim_next(worker)
+
+
+def _claim_next(worker: str) -> Optional[JudgeJob]:
+    running = dict(
+        JudgeJob.objects.filter(status=JudgeJob.RUNNING).order_by().values_list('flow').annotate(n=Count('pk'))
+    )
+    if sum(running.values()) >= _setting('LEETCODE_JUDGE_MAX_RUNNING', 8):
+        return None
+    user_cap = _setting('LEETCODE_JUDGE_USER_MAX_RUNNING', 1)
+    candidates = JudgeJob.objects.filter(status=JudgeJob.QUEUED).order_by('fair_start', 'created_at')
+    skipped = set()
+    for job_id, flow in candidates.values_list('pk', 'flow')[:CANDIDATES]:
+        if flow in skipped or running.get(flow, 0) >= user_cap:
+            continue
+        job = claim_fair(job_id, flow, worker)
+        if job is not None:
+            return job
+        # Lost a race for this job or its flow filled up meanwhile: move on to the next flow
+        skipped.add(flow)
+    return None
+
+
+def queue_position(job: JudgeJob) -> int:
+    """Queued jobs ordered ahead of job"""
+    return JudgeJob.objects.filter(status=JudgeJob.QUEUED).filter(
+        Q(fair_start__lt=job.fair_start) | Q(fair_start=job.fair_start, created_at__lt=job.created_at),
+    ).count()
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def stats() -> Dict[str, Any]:
+    """Queue depth, running jobs and recent queue wait times (created -> claimed)"""
+    now = timezone.now()
+    queued = JudgeJob.objects.filter(status=JudgeJob.QUEUED)
+    depth = queued.aggregate(n=Count('pk'), flows=Count('flow', distinct=True), oldest=Min('created_at'))
+    started = JudgeJob.objects.filter(started_at__isnull=False).order_by('-started_at')
+    waits = [(s - c).total_seconds() for c, s in started.values_list('created_at', 'started_at')[:WAIT_SAMPLES]]
+    return {
+        'queued': depth['n'],
+        'queued_flows': depth['flows'],
+        'running': JudgeJob.objects.filter(status=JudgeJob.RUNNING).count(),
+        'oldest_queued_seconds': (now - depth['oldest']).total_seconds() if depth['oldest'] else 0.0,
+        'wait_seconds': {
+            'samples': len(waits),
+            'mean': sum(waits) / len(waits) if waits else 0.0,
+            'p50': _percentile(waits, 0.5),
+            'p99': _percentile(waits, 0.99),
+        },
+        'limits': {
+            'max_running': _setting('LEETCODE_JUDGE_MAX_RUNNING', 8),
+            'user_max_running': _setting('LEETCODE_JUDGE_USER_MAX_RUNNING', 1),
+            'user_max_pending': _setting('LEETCODE_JUDGE_USER_MAX_PENDING', 3),
+            'rate_limit': _setting('LEETCODE_JUDGE_RATE_LIMIT', 20),
+            'rate_window_seconds': _setting('LEETCODE_JUDGE_RATE_WINDOW_SECONDS', 300),
+        },
+    }
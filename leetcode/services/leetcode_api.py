@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
-import requests
 from django.conf import settings
 
+from . import http_client, resilience
+from .singleflight import SingleFlight, request_key
+
+# Identical queries in flight at the same time (same query + variables) share one upstream request
+_inflight = SingleFlight()
+
 
 @dataclass
 class LeetCodeResponse:
@@ -27,16 +37,29 @@ class LeetCodeAPI:
         }
 
     def _post(self, payload: Dict[str, Any]) -> LeetCodeResponse:
+        return _inflight.do(request_key(payload), lambda: self._post_uncoalesced(payload))
+
+    def _post_uncoalesced(self, payload: Dict[str, Any]) -> LeetCodeResponse:
         last_error: Optional[str] = None
-        for _ in range(max(1, self.retries + 1)):
+        status_code = 500
+        attempts = max(1, self.retries + 1)
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(resilience.backoff_delay(attempt - 1))
             try:
-                response = requests.post(self.base_url, data=json.dumps(payload), headers=self.headers, timeout=self.timeout)
+                response = http_client.post(self.base_url, data=json.dumps(payload), headers=self.headers, timeout=self.timeout)
                 if 200 <= response.status_code < 300:
                     return LeetCodeResponse(ok=True, status_code=response.status_code, data=response.json())
                 last_error = f"HTTP {response.status_code}: {response.text[:300]}"
+                if response.status_code < 500 and response.status_code != 429:
+                    # Client errors won't succeed on retry
+                    status_code = response.status_code
+                    break
+            except resilience.CircuitOpenError as exc:
+                return LeetCodeResponse(ok=False, status_code=503, error=str(exc))
             except Exception as exc:  # requests exceptions
                 last_error = str(exc)
-        return LeetCodeResponse(ok=False, status_code=500, error=last_error or "Unknown error")
+        return LeetCodeResponse(ok=False, status_code=status_code, error=last_error or "Unknown error")
 
     def fetch_daily_question(self) -> LeetCodeResponse:
         query = """
@@ -63,6 +86,23 @@ class LeetCodeAPI:
         """
         return self._post({"query": query, "variables": {"titleSlug": title_slug}})
 
+    def fetch_question_content(self, title_slug: str) -> LeetCodeResponse:
+        # Everything the compile path needs (statement, example tests, snippets) in one round-trip
+        query = """
+        query questionContent($titleSlug: String!) {
+          question(titleSlug: $titleSlug) {
+            questionFrontendId
+            title
+            titleSlug
+            difficulty
+            content
+            exampleTestcases
+            codeSnippets { lang langSlug code }
+          }
+        }
+        """
+        return self._post({"query": query, "variables": {"titleSlug": title_slug}})
+
     def fetch_cpp_template(self, title_slug: str) -> Optional[str]:
         resp = self.fetch_problem_details(title_slug)
         if not resp.ok or not resp.data:
@@ -74,24 +114,29 @@ class LeetCodeAPI:
         return None
 
     def fetch_problemset(self, search: str = "", difficulty: Optional[str] = None, skip: int = 0, limit: int = 20) -> LeetCodeResponse:
-        # LeetCode problemset query v2 (public GraphQL)
+        # LeetCode problemset query (public GraphQL); totalNum lets callers page through the whole set
         query = """
-        query problemsetQuestionList($categorySlug: String, $skip: Int, $limit: Int, $filters: QuestionFilterInput) {
-          problemsetQuestionListV2(categorySlug: $categorySlug, skip: $skip, limit: $limit, filters: $filters) {
-            questions {
-              questionFrontendId
+        query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
+          problemsetQuestionList: questionList(categorySlug: $categorySlug, limit: $limit, skip: $skip, filters: $filters) {
+            total: totalNum
+            questions: data {
+              acRate
+              difficulty
+              frontendQuestionId: questionFrontendId
+              paidOnly: isPaidOnly
               title
               titleSlug
-              difficulty
-              acRate
+              topicTags { name }
             }
           }
         }
         """
-        # Many LeetCode schemas change filter inputs frequently; pass no filters and filter client-side for stability
-        filters: Optional[Dict[str, Any]] = None
+        # Many LeetCode schemas change filter inputs frequently; only pass search keywords and filter difficulty client-side
+        filters: Dict[str, Any] = {}
+        if search:
+            filters["searchKeywords"] = search
         variables = {
-            "categorySlug": "all",
+            "categorySlug": "",
             "skip": skip,
             "limit": limit,
             "filters": filters,
@@ -99,3 +144,49 @@ class LeetCodeAPI:
         return self._post({"query": query, "variables": variables})
 
 
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "LEETCODE_ASYNC_WORKERS", 16),
+                    thread_name_prefix="leetcode-api",
+                )
+    return _executor
+
+
+def inflight_stats() -> Dict[str, int]:
+    return _inflight.stats()
+
+
+class AsyncLeetCodeAPI:
+    """asyncio front-end for LeetCodeAPI for use in async views.
+
+    Upstream calls run on a dedicated, bounded thread pool (LEETCODE_ASYNC_WORKERS) sharing the
+    pooled HTTP client, so a slow LeetCode never occupies the ASGI server's sync thread that
+    all sync views are serialized onto.
+    """
+
+    def __init__(self, api: Optional[LeetCodeAPI] = None) -> None:
+        self.api = api or LeetCodeAPI()
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+    async def fetch_daily_question(self) -> LeetCodeResponse:
+        return await self._run(self.api.fetch_daily_question)
+
+    async def fetch_problem_details(self, title_slug: str) -> LeetCodeResponse:
+        return await self._run(self.api.fetch_problem_details, title_slug)
+
+    async def fetch_cpp_template(self, title_slug: str) -> Optional[str]:
+        return await self._run(self.api.fetch_cpp_template, title_slug)
+
+    async def fetch_problemset(self, search: str = "", difficulty: Optional[str] = None, skip: int = 0, limit: int = 20) -> LeetCodeResponse:
+        return await self._run(self.api.fetch_problemset, search=search, difficulty=difficulty, skip=skip, limit=limit)
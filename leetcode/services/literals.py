@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import json
+import re
+from itertools import repeat
+from typing import Any, List, Optional, Tuple
+
+from .cpp_signature import CppType, SignatureError, parse_type
+
+INT_TYPES = frozenset({
+    'int', 'long', 'long long', 'short', 'unsigned', 'unsigned int', 'unsigned long', 'unsigned long long',
+    'size_t', 'int64_t', 'int32_t', 'uint64_t', 'uint32_t',
+})
+FLOAT_TYPES = frozenset({'double', 'float', 'long double'})
+SEQUENCE_TYPES = frozenset({'vector', 'list', 'deque', 'array', 'set', 'unordered_set', 'multiset'})
+
+_SPACE = re.compile(r'\s*')
+_NUMBER = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_STRING = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"', re.S)
+_CHAR = re.compile(r"'([^'\\]*(?:\\.[^'\\]*)*)'", re.S)
+_WORD = re.compile(r'true|false|null', re.I)
+_BARE = re.compile(r'[^,\[\]\s](?:[^,\[\]]*[^,\[\]\s])?')
+_NAME = re.compile(r'\s*([A-Za-z_]\w*)\s*=')
+_INT_BODY = re.compile(r'[-\d\s,]*')
+
+_WORDS = {'true': True, 'false': False, 'null': None}
+
+
+class LiteralError(ValueError):
+    pass
+
+
+def _unescape(body: str) -> str:
+    if '\\' not in body:
+        return body
+    try:
+        return json.loads(f'"{body}"')
+    except ValueError:
+        return body
+
+
+def _parse_value(text: str, pos: int) -> Tuple[Any, int]:
+    pos = _SPACE.match(text, pos).end()
+    if pos >= len(text):
+        raise LiteralError('expected a value')
+    first = text[pos]
+    if first == '[':
+        return _parse_array(text, pos + 1)
+    if first == '"':
+        end = text.find('"', pos + 1)
+        if end != -1 and '\\' not in text[pos + 1:end]:
+            return text[pos + 1:end], end + 1
+        match = _STRING.match(text, pos)
+        if match:
+            return _unescape(match.group(1)), match.end()
+    elif first == "'":
+        match = _CHAR.match(text, pos)
+        if match:
+            return _unescape(match.group(1)), match.end()
+    else:
+        match = _NUMBER.match(text, pos)
+        if match and (match.end() == len(text) or not (text[match.end()].isalnum() or text[match.end()] == '_')):
+            number = match.group()
+            return (float(number) if '.' in number or 'e' in number or 'E' in number else int(number)), match.end()
+        match = _WORD.match(text, pos)
+        if match and (match.end() == len(text) or not text[match.end()].isalnum()):
+            return _WORDS[match.group().lower()], match.end()
+    # Unquoted text ("abc", "#"): kept as a string up to the next separator
+    match = _BARE.match(text, pos)
+    if not match:
+        raise LiteralError(f"unexpected {text[pos]!r} at {pos}")
+    return match.group(), match.end()
+
+
+def _reject_constant(name: str) -> Any:
+    raise ValueError(name)
+
+
+# NaN/Infinity are bare words in LeetCode's format, not numbers
+_JSON = json.JSONDecoder(parse_constant=_reject_constant)
+
+
+def _flat_array(text: str, pos: int) -> Optional[Tuple[List[Any], int]]:
+    """Arrays without nested arrays are handed to the C JSON decoder whole"""
+    close = text.find(']', pos)
+    if close == -1:
+        return None
+    body = text[pos:close]
+    if '[' in body or "'" in body:
+        return None
+    try:
+        return _JSON.decode(text[pos - 1:close + 1]), close + 1
+    except ValueError:
+        pass
+    if _INT_BODY.fullmatch(body) and body.strip():
+        try:
+            return list(map(int, body.split(','))), close + 1  # leading zeros ("007") are not JSON
+        except ValueError:
+            pass
+    # Bare words, or a ']' inside a string cut body short: the general parser handles those
+    return None
+
+
+def _parse_array(text: str, pos: int) -> Tuple[List[Any], int]:
+    flat = _flat_array(text, pos)
+    if flat is not None:
+        return flat
+
+    items: List[Any] = []
+    pos = _SPACE.match(text, pos).end()
+    if pos < len(text) and text[pos] == ']':
+        return items, pos + 1
+    while True:
+        value, pos = _parse_value(text, pos)
+        items.append(value)
+        pos = _SPACE.match(text, pos).end()
+        if pos >= len(text):
+            raise LiteralError('unterminated array')
+        if text[pos] == ',':
+            pos += 1
+        elif text[pos] == ']':
+            return items, pos + 1
+        else:
+            raise LiteralError(f"expected ',' or ']' at {pos}")
+
+
+def parse(text: str) -> Any:
+    """Parse one LeetCode literal: nested arrays, strings, chars, booleans, null and numbers"""
+    value, pos = _parse_value(text, 0)
+    if _SPACE.match(text, pos).end() != len(text):
+        raise LiteralError(f"trailing text at {pos}")
+    return value
+
+
+def parse_assignments(text: str) -> List[Tuple[str, Any, str]]:
+    """(name, value, source) for each ``name = literal`` in "nums = [2,7,11,15], target = 9" """
+    assignments = []
+    pos = 0
+    while pos < len(text):
+        match = _NAME.match(text, pos)
+        if not match:
+            raise LiteralError(f"expected 'name =' at {pos}")
+        start = _SPACE.match(text, match.end()).end()
+        value, end = _parse_value(text, start)
+        assignments.append((match.group(1), value, text[start:end]))
+        pos = _SPACE.match(text, end).end()
+        if pos < len(text):
+            if text[pos] != ',':
+                raise LiteralError(f"expected ',' at {pos}")
+            pos += 1
+    return assignments
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def coerce(value: Any, cpp_type: CppType, source: Optional[str] = None) -> Any:
+    """Shape a parsed value for cpp_type: lists for containers, str/int/float/bool for scalars.
+
+    Pointer and unknown types (ListNode*, TreeNode*, ...) keep their source text.
+    """
+    if cpp_type.pointer:
+        return source if source is not None else json.dumps(value, separators=(',', ':'))
+    name = cpp_type.unqualified_name
+    if name in SEQUENCE_TYPES:
+        if not isinstance(value, list):
+            return []
+        if not cpp_type.args:
+            return value
+        element = cpp_type.args[0]
+        if not element.pointer and element.name in INT_TYPES and all(map(isinstance, value, repeat(int))):
+            return value
+        if not element.pointer and element.unqualified_name in ('string', 'char') and all(map(isinstance, value, repeat(str))):
+            return value
+        return [coerce(item, element) for item in value]
+    if name == 'string':
+        if isinstance(value, str):
+            return value
+        return source if source is not None else json.dumps(value, separators=(',', ':'))
+    if name == 'char':
+        return value[:1] if isinstance(value, str) else str(value)[:1]
+    if name == 'bool':
+        return value if isinstance(value, bool) else str(value).lower() in ('true', '1')
+    if name in INT_TYPES:
+        return _to_int(value)
+    if name in FLOAT_TYPES:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+    return source if source is not None else value
+
+
+def coerce_to(value: Any, type_spelling: str, source: Optional[str] = None) -> Any:
+    """coerce() for a type given by its spelling; unparseable types keep the source text"""
+    try:
+        cpp_type = parse_type(type_spelling)
+    except SignatureError:
+        return source if source is not None else value
+    return coerce(value, cpp_type, source)
+
+
+def convert(text: str, type_spelling: str) -> Any:
+    """Parse text and coerce it to the C++ type spelled type_spelling, in one pass"""
+    text = text.strip()
+    try:
+        value = parse(text)
+    except LiteralError:
+        value = text
+    return coerce_to(value, type_spelling, text)
@@ -0,0 +1,177 @@
+"""Per-upstream circuit breakers, latency-derived timeouts and retry back-off.
+
+Every outbound request goes through the Upstream registered for its host (see http_client):
+the breaker opens after consecutive failures so callers fail fast instead of waiting on a dead
+host, lets a single probe through once the reset timeout elapses (half-open), and closes again
+when the probe succeeds. Timeouts follow the observed latency distribution of the host.
+"""
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import requests
+from django.conf import settings
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the upstream's breaker is open.
+
+    A ConnectionError subclass so existing `except requests.exceptions.RequestException`
+    handlers treat it like any other unreachable-host failure.
+    """
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                # Exactly one probe at a time decides whether the upstream is back
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_inconclusive(self) -> None:
+        """The upstream answered, but not in a way that shows whether it is healthy; a probe may try again"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class LatencyTracker:
+    """Sliding window of successful request latencies"""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, math.ceil(pct / 100 * len(samples)) - 1))
+        return samples[index]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+class Upstream:
+    """Breaker + latency tracker for one host"""
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 min_samples: int = 20, timeout_multiplier: float = 3.0, min_timeout: float = 2.0) -> None:
+        self.host = host
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = LatencyTracker()
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+
+    def timeout(self, ceiling: Optional[float]) -> Optional[float]:
+        """Timeout for the next request: a multiple of observed p99, never above the caller's ceiling"""
+        if len(self.latency) < self.min_samples:
+            return ceiling
+        adaptive = max(self.min_timeout, self.latency.percentile(99) * self.timeout_multiplier)
+        return adaptive if ceiling is None else min(ceiling, adaptive)
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.latency.percentile(50)
+        p99 = self.latency.percentile(99)
+        return {
+            "state": self.breaker.state,
+            "rejected": self.breaker.rejected,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+        }
+
+
+def backoff_delay(attempt: int, base: float = 0.2, cap: float = 2.0) -> float:
+    """Exponential back-off with full jitter for retry number attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+_upstreams: Dict[str, Upstream] = {}
+_upstreams_lock = threading.Lock()
+
+
+def get_upstream(host: str) -> Upstream:
+    upstream = _upstreams.get(host)
+    if upstream is None:
+        with _upstreams_lock:
+            upstream = _upstreams.get(host)
+            if upstream is None:
+                upstream = _upstreams[host] = Upstream(
+                    host,
+                    failure_threshold=getattr(settings, "OUTBOUND_BREAKER_FAILURES", 5),
+                    reset_timeout=getattr(settings, "OUTBOUND_BREAKER_RESET_SECONDS", 30),
+                )
+    return upstream
+
+
+def is_open(host: str) -> bool:
+    return get_upstream(host).breaker.state == OPEN
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    with _upstreams_lock:
+        upstreams = list(_upstreams.values())
+    return {u.host: u.stats() for u in upstreams}
+
+
+def reset() -> None:
+    with _upstreams_lock:
+        _upstreams.clear()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import astuple, dataclass
+from typing import List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import BooleanField, QuerySet
+from django.db.models.expressions import RawSQL
+
+from ..models import Problem, ProblemTag
+from . import catalog
+
+COUNT_TIMEOUT = 24 * 3600
+DIFFICULTIES = ('Easy', 'Medium', 'Hard')
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+@dataclass(frozen=True)
+class QuestionFilters:
+    search: str = ''
+    difficulty: str = ''
+    tag: str = ''
+    include_paid: bool = False
+
+    @classmethod
+    def from_params(cls, params) -> 'QuestionFilters':
+        difficulty = (params.get('difficulty') or '').strip().capitalize()
+        return cls(
+            search=(params.get('search') or '').strip(),
+            difficulty=difficulty if difficulty in DIFFICULTIES else '',
+            tag=(params.get('tag') or '').strip(),
+            include_paid=(params.get('include_paid') or '').lower() in ('1', 'true', 'on', 'yes'),
+        )
+
+    def cache_token(self) -> str:
+        return hashlib.sha1(repr(astuple(self)).encode('utf-8')).hexdigest()
+
+
+def _has_fts_table() -> bool:
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'leetcode_problem_fts'")
+        return cursor.fetchone() is not None
+
+
+def _apply_search(qs: QuerySet, text: str) -> QuerySet:
+    # Prefix match on every word, so results update as the user types
+    tokens = [t.lower() for t in _TOKEN_RE.findall(text)]
+    if not tokens:
+        return qs
+    if connection.vendor == 'postgresql':
+        query = ' & '.join(f'{t}:*' for t in tokens)
+        return qs.alias(fts=RawSQL(
+            "to_tsvector('simple', title || ' ' || tags::text) @@ to_tsquery('simple', %s)",
+            [query], output_field=BooleanField(),
+        )).filter(fts=True)
+    if _has_fts_table():
+        query = ' AND '.join(f'"{t}"*' for t in tokens)
+        return qs.alias(fts=RawSQL(
+            "frontend_id IN (SELECT rowid FROM leetcode_problem_fts WHERE leetcode_problem_fts MATCH %s)",
+            [query], output_field=BooleanField(),
+        )).filter(fts=True)
+    for token in tokens:
+        qs = qs.filter(title__icontains=token)
+    return qs
+
+
+def filtered_queryset(filters: QuestionFilters) -> QuerySet:
+    qs = Problem.objects.all()
+    if not filters.include_paid:
+        qs = qs.filter(paid_only=False)
+    if filters.difficulty:
+        qs = qs.filter(difficulty=filters.difficulty)
+    if filters.tag:
+        qs = qs.filter(frontend_id__in=ProblemTag.objects.filter(name=filters.tag).values('problem_id'))
+    if filters.search:
+        qs = _apply_search(qs, filters.search)
+    return qs.order_by('frontend_id')
+
+
+def count(filters: QuestionFilters) -> int:
+    """Number of matching problems, cached until the catalog next changes"""
+    key = f"leetcode:catalog:count:{catalog.catalog_version()}:{filters.cache_token()}"
+    total = cache.get(key)
+    if total is None:
+        total = filtered_queryset(filters).count()
+        cache.set(key, total, COUNT_TIMEOUT)
+    return total
+
+
+def search_problems(filters: QuestionFilters, skip: int = 0, limit: int = 50) -> Tuple[int, List[Problem]]:
+    total = count(filters)
+    if not total or skip >= total:
+        return total, []
+    return total, list(filtered_queryset(filters)[skip:skip + limit])
+
+
+def available_tags() -> List[str]:
+    key = f"leetcode:catalog:tags:{catalog.catalog_version()}"
+    tags: Optional[List[str]] = cache.get(key)
+    if tags is None:
+        tags = list(ProblemTag.objects.order_by('name').values_list('name', flat=True).distinct())
+        cache.set(key, tags, COUNT_TIMEOUT)
+    return tags
+
+
+# Public field name -> Problem column for the JSON list API
+API_FIELDS = {
+    'id': 'frontend_id',
+    'title': 'title',
+    'slug': 'title_slug',
+    'difficulty': 'difficulty',
+    'ac_rate': 'ac_rate',
+    'paid_only': 'paid_only',
+    'tags': 'tags',
+}
+DEFAULT_API_FIELDS = ('id', 'title', 'slug', 'difficulty')
+
+
+def parse_fields(param: str) -> Tuple[str, ...]:
+    """Requested projection, in API_FIELDS order; unknown names are ignored and id is always included"""
+    requested = {name.strip() for name in (param or '').split(',') if name.strip()}
+    if not requested & API_FIELDS.keys():
+        return DEFAULT_API_FIELDS
+    return tuple(name for name in API_FIELDS if name in requested or name == 'id')
+
+
+def keyset_page(filters: QuestionFilters, after: int, limit: int,
+                fields: Tuple[str, ...] = DEFAULT_API_FIELDS) -> Tuple[List[dict], Optional[int]]:
+    """One page of problems with frontend_id > after, and the cursor for the next page (None at the end)"""
+    columns = [API_FIELDS[name] for name in fields]
+    # One extra row tells us whether another page exists without a COUNT
+    rows = list(filtered_queryset(filters).filter(frontend_id__gt=after).values_list(*columns)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    results = [dict(zip(fields, row)) for row in rows]
+    next_cursor = rows[-1][0] if has_more else None
+    return results, next_cursor
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+def request_key(payload: Dict[str, Any]) -> str:
+    """Stable key for a GraphQL payload (query + variables)"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is in flight
+    block until it finishes and receive the same result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"executions": self.executions, "shared": self.shared, "in_flight": len(self._calls)}
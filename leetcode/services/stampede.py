@@ -0,0 +1,99 @@
+"""Cache-stampede protection for Django cache entries.
+
+Entries are stored in an envelope recording how long the value took to compute. Readers
+refresh probabilistically before expiry (XFetch: the closer to expiry and the more expensive
+the value, the likelier an early refresh), and only the reader holding a short cache lock
+recomputes; everyone else keeps serving the current value or waits briefly for the holder.
+Every function works on the "default" cache unless given another CACHES alias.
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+import uuid
+from typing import Any, Callable, Optional
+
+from django.core.cache import caches
+
+BETA = 1.0
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 10.0
+POLL_INTERVAL = 0.05
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}:lock"
+
+
+def _envelope(value: Any, delta: float, timeout: int) -> dict:
+    return {"value": value, "delta": delta, "expires": time.time() + timeout}
+
+
+def _read(key: str, alias: str = "default") -> Optional[dict]:
+    """The envelope stored under key; anything else (a plain value written before envelopes) counts as a miss"""
+    envelope = caches[alias].get(key)
+    if isinstance(envelope, dict) and envelope.keys() >= {"value", "delta", "expires"}:
+        return envelope
+    return None
+
+
+def _should_refresh(envelope: Optional[dict], beta: float) -> bool:
+    if not envelope:
+        return True
+    # -log(U) is exponentially distributed, so early refreshes spread out instead of lining up
+    return time.time() - envelope["delta"] * beta * math.log(random.random() or 1e-12) >= envelope["expires"]
+
+
+def peek(key: str, alias: str = "default") -> Any:
+    """Current cached value for key (even if due for an early refresh), or None"""
+    envelope = _read(key, alias)
+    return envelope["value"] if envelope else None
+
+
+def put(key: str, value: Any, timeout: int, alias: str = "default") -> None:
+    caches[alias].set(key, _envelope(value, 0.0, timeout), timeout)
+
+
+def get_or_compute(
+    key: str, compute: Callable[[], Any], timeout: int, beta: float = BETA, alias: str = "default",
+) -> Any:
+    """Return the cached value for key, recomputing it under a lock when missing or about to expire.
+
+    None results are returned but not cached, so failures are retried by the next caller; callers waiting on
+    the lock compute for themselves as soon as it is released without a value.
+    """
+    cache = caches[alias]
+    envelope = _read(key, alias)
+    if not _should_refresh(envelope, beta):
+        return envelope["value"]
+
+    token = uuid.uuid4().hex
+    locked = cache.add(_lock_key(key), token, LOCK_TIMEOUT)
+    if not locked:
+        if envelope:
+            return envelope["value"]
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            # Checked before the value: the holder stores the value first and only then releases the lock
+            released = cache.get(_lock_key(key)) is None
+            envelope = _read(key, alias)
+            if envelope:
+                return envelope["value"]
+            if released:
+                # The holder got None, which is never stored; waiting out the deadline would only add latency
+                break
+        # The lock holder is taking too long; compute without it rather than fail, leaving its lock alone
+
+    try:
+        started = time.monotonic()
+        value = compute()
+        if value is not None:
+            cache.set(key, _envelope(value, time.monotonic() - started, timeout), timeout)
+        return value
+    finally:
+        # Only release our own lock: it may have expired during a slow compute and been taken by another caller
+        if locked and cache.get(_lock_key(key)) == token:
+            cache.delete(_lock_key(key))
+
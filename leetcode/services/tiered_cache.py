@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import stampede
+
+
+class TwoTierCache:
+    """Bounded in-process LRU+TTL cache (L1) in front of the shared Django cache (L2).
+
+    L1 keeps hot entries per worker without a cache round-trip and is capped at max_entries;
+    its short TTL bounds how long workers can disagree. L2 (the CACHES alias) is shared by every
+    process and goes through the stampede helper, so concurrent misses trigger one compute.
+    """
+
+    def __init__(
+        self, namespace: str, max_entries: int = 512, l1_ttl: int = 60, l2_ttl: int = 300, alias: str = "default",
+    ) -> None:
+        self.namespace = namespace
+        self.alias = alias
+        self.max_entries = max(1, max_entries)
+        self.l1_ttl = l1_ttl
+        self.l2_ttl = l2_ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _l2_key(self, key: str) -> str:
+        return f"leetcode:{self.namespace}:{key}"
+
+    def _l1_get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            self.l1_hits += 1
+            return value
+
+    def _l1_set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.l1_ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key: str) -> Any:
+        value = self._l1_get(key)
+        if value is not None:
+            return value
+        value = stampede.peek(self._l2_key(key), self.alias)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.l2_hits += 1
+        if value is not None:
+            self._l1_set(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._l1_set(key, value)
+        stampede.put(self._l2_key(key), value, self.l2_ttl, self.alias)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the value for key, computing and storing it on a miss. None is never cached."""
+        value = self._l1_get(key)
+        if value is not None:
+            return value
+        computed = False
+
+        def tracked() -> Any:
+            nonlocal computed
+            computed = True
+            return compute()
+
+        value = stampede.get_or_compute(self._l2_key(key), tracked, self.l2_ttl, alias=self.alias)
+        with self._lock:
+            if computed:
+                self.misses += 1
+            else:
+                self.l2_hits += 1
+        if value is not None:
+            self._l1_set(key, value)
+        return value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        caches[self.alias].delete(self._l2_key(key))
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.l1_hits + self.l2_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "l1_hits": self.l1_hits,
+                "l2_hits": self.l2_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round((self.l1_hits + self.l2_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+
+_caches: Dict[str, TwoTierCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace: str, **sizing: Any) -> TwoTierCache:
+    """Process-wide cache for namespace, sized from LEETCODE_L1_CACHE_SIZE / *_TTL_SECONDS settings
+
+    sizing (max_entries, l1_ttl, l2_ttl, alias) overrides those settings when the cache is first created.
+    """
+    cache = _caches.get(namespace)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(namespace)
+            if cache is None:
+                cache = _caches[namespace] = TwoTierCache(namespace, **{
+                    "max_entries": getattr(settings, "LEETCODE_L1_CACHE_SIZE", 512),
+                    "l1_ttl": getattr(settings, "LEETCODE_L1_CACHE_TTL_SECONDS", 60),
+                    "l2_ttl": getattr(settings, "LEETCODE_CACHE_TTL_SECONDS", 300),
+                    **sizing,
+                })
+    return cache
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    with _caches_lock:
+        return {name: c.stats() for name, c in _caches.items()}
+
+
+def clear_local() -> None:
+    """Drop every L1 entry in this process (L2 is left alone)"""
+    with _caches_lock:
+        for c in _caches.values():
+            c.clear_local()
+
+
+# Problem pages/editor data, C++ templates, and problem bundles (the compile path's test cases)
+def problems() -> TwoTierCache:
+    return get_cache("problem")
+
+
+def templates() -> TwoTierCache:
+    return get_cache("template")
+
+
+def bundles() -> TwoTierCache:
+    return get_cache("bundle")
+
+
+# Execution results are deterministic for a given program and test set, so L1 may keep them as long as L2. Their L2
+# is the "results" cache when configured: Run traffic would otherwise fill the default cache to MAX_ENTRIES, and its
+# culls would evict the bundles, catalog and daily question stored there.
+def results() -> TwoTierCache:
+    ttl = getattr(settings, "LEETCODE_RESULT_CACHE_TTL_SECONDS", 3600)
+    return get_cache(
+        "result", max_entries=getattr(settings, "LEETCODE_RESULT_CACHE_SIZE", 1024), l1_ttl=ttl, l2_ttl=ttl,
+        alias="results" if "results" in settings.CACHES else "default",
+    )
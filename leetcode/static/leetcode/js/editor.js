@@ -31,6 +31,13 @@ let codeEditor = null;
 let outputPanel = null;
 let statusIndicator = null;
 
+// Editor socket: autosave deltas and Run requests, with run progress streamed back
+let editorSocket = null;
+let editorSocketVersion = 0;
+let editorSocketSynced = false;
+let pendingEdits = [];
+let pendingEditTimer = null;
+
 // Initialize CodeMirror
 function initializeCodeMirror() {
     const editorElement = document.getElementById('codeEditor');
@@ -75,6 +82,8 @@ function initializeCodeMirror() {
         }
     });
     
+    codeEditor.on('change', trackEdit);
+
     // Register custom commands
     codeEditor.setOption("extraKeys", {
         ...codeEditor.getOption("extraKeys"),
@@ -418,6 +427,108 @@ ${example.explanation ? `<strong>Explanation:</strong> ${example.explanation}` :
     outputPanel.innerHTML = '<div>Output will appear here...</div>';
     outputPanel.className = 'output-panel';
     statusIndicator.textContent = 'Ready to code';
+
+    connectEditorSocket(questionId);
+}
+
+// One socket per open question; Run falls back to the HTTP endpoint while it is not open
+function connectEditorSocket(questionId) {
+    if (!window.WebSocket || !questionId) {
+        return;
+    }
+    if (editorSocket) {
+        flushEdits();
+        editorSocket.onclose = null;
+        editorSocket.close();
+    }
+    const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${scheme}://${window.location.host}/ws/leetcode/editor/${encodeURIComponent(questionId)}/`);
+    editorSocket = socket;
+    editorSocketVersion = 0;
+    editorSocketSynced = false;
+    pendingEdits = [];
+    socket.onmessage = event => handleEditorMessage(JSON.parse(event.data));
+    socket.onclose = () => {
+        if (editorSocket === socket) {
+            editorSocket = null;
+            // Reconnect after a pause unless the user has moved on to another question
+            setTimeout(() => { if (!editorSocket && currentQuestionId === questionId) connectEditorSocket(questionId); }, 3000);
+        }
+    };
+}
+
+function editorSocketOpen() {
+    return editorSocket && editorSocket.readyState === WebSocket.OPEN;
+}
+
+// Template loads (setValue) are not autosaved; the first real edit sends the full text, later ones send deltas
+function trackEdit(cm, change) {
+    if (change.origin === 'setValue') {
+        editorSocketSynced = false;
+        pendingEdits = [];
+        return;
+    }
+    if (!editorSocketOpen()) {
+        return;
+    }
+    if (!editorSocketSynced) {
+        syncEditorSocket();
+        return;
+    }
+    pendingEdits.push({
+        at: cm.indexFromPos(change.from),
+        remove: change.removed.join('\n').length,
+        insert: change.text.join('\n')
+    });
+    clearTimeout(pendingEditTimer);
+    pendingEditTimer = setTimeout(flushEdits, 300);
+}
+
+function syncEditorSocket() {
+    clearTimeout(pendingEditTimer);
+    pendingEdits = [];
+    editorSocket.send(JSON.stringify({ type: 'sync', code: codeEditor.getValue(), language: currentLanguage }));
+    editorSocketVersion += 1;
+    editorSocketSynced = true;
+}
+
+function flushEdits() {
+    clearTimeout(pendingEditTimer);
+    if (!pendingEdits.length || !editorSocketOpen()) {
+        return;
+    }
+    editorSocket.send(JSON.stringify({
+        type: 'edit', base: editorSocketVersion, ops: pendingEdits, length: codeEditor.getValue().length
+    }));
+    editorSocketVersion += 1;
+    pendingEdits = [];
+}
+
+function handleEditorMessage(message) {
+    switch (message.type) {
+        case 'resync':
+            editorSocketVersion = message.version;
+            syncEditorSocket();
+            break;
+        case 'queued':
+            statusIndicator.textContent = message.queue_position ? `Queued (${message.queue_position} ahead)...` : 'Queued...';
+            break;
+        case 'running':
+            statusIndicator.textContent = 'Running...';
+            break;
+        case 'test':
+            statusIndicator.textContent = `Test ${message.case}: ${message.passed ? 'passed' : 'failed'}`;
+            break;
+        case 'result':
+            showRunResult(message.result);
+            if (message.total) {
+                statusIndicator.textContent = `${message.passed}/${message.total} passed`;
+            }
+            break;
+        case 'error':
+            showRunResult({ success: false, error: message.error });
+            break;
+    }
 }
 
 function changeLanguage() {
@@ -557,6 +668,20 @@ function runCode() {
     
     statusIndicator.textContent = 'Running...';
     statusIndicator.className = 'status running';
+
+    if (editorSocketOpen()) {
+        if (editorSocketSynced) {
+            flushEdits();
+        } else {
+            syncEditorSocket();
+        }
+        editorSocket.send(JSON.stringify({
+            type: 'run',
+            language: language,
+            title_slug: dailyQuestionData ? dailyQuestionData.title_slug : currentTitleSlug
+        }));
+        return;
+    }
     
     // Make AJAX request to compile endpoint
     fetch(LEETCODE_COMPILE_URL, {
@@ -574,34 +699,8 @@ function runCode() {
         })
     })
     .then(response => response.json())
-    .then(result => {
-        if (result.success) {
-            let output = '';
-            if (result.output) {
-                output += `<div style="color: #27ae60;"><strong>Output:</strong><br><pre style="background: #f8f9fa; padding: 10px; border-radius: 4px; white-space: pre-wrap;">${result.output}</pre></div>`;
-            }
-            if (result.memory || result.cpuTime) {
-                output += `<div style="color: #7f8c8d; font-size: 0.9em;"><strong>Stats:</strong> Memory: ${result.memory || 'N/A'}, CPU Time: ${result.cpuTime || 'N/A'}</div>`;
-            }
-            outputPanel.innerHTML = output || '<div>Code executed successfully (no output)</div>';
-            outputPanel.className = 'output-panel success has-content';
-            statusIndicator.textContent = 'Success';
-            statusIndicator.className = 'status success';
-        } else {
-            let errorMessage = result.error;
-            if (result.error_type === 'compilation_error') {
-                errorMessage = `<strong>Compilation Error:</strong><br>${result.error}`;
-            } else if (result.error_type === 'runtime_error') {
-                errorMessage = `<strong>Runtime Error:</strong><br>${result.error}`;
-            } else if (result.error_type === 'api_error') {
-                errorMessage = `<strong>API Error:</strong><br>${result.error}`;
-            }
-            outputPanel.innerHTML = `<div style="color: #e74c3c;">${errorMessage}</div>`;
-            outputPanel.className = 'output-panel error has-content';
-            statusIndicator.textContent = 'Error';
-            statusIndicator.className = 'status error';
-        }
-    })
+    .then(job => waitForJudgeJob(job))
+    .then(result => showRunResult(result))
     .catch(error => {
         outputPanel.innerHTML = `<div style="color: #e74c3c;"><strong>Network Error:</strong> ${error.message}</div>`;
         outputPanel.className = 'output-panel error has-content';
@@ -610,6 +709,51 @@ function runCode() {
     });
 }
 
+// compile_code answers 202 with a queued job; poll its status URL (backing off to 2s) until it finishes
+function waitForJudgeJob(job, delay = 300) {
+    if (!job.job_id) {
+        return Promise.resolve(job);
+    }
+    if (job.status === 'done' || job.status === 'failed') {
+        return Promise.resolve(job.result);
+    }
+    statusIndicator.textContent = job.status === 'running' ? 'Running...'
+        : (job.queue_position ? `Queued (${job.queue_position} ahead)...` : 'Queued...');
+    return new Promise(resolve => setTimeout(resolve, delay))
+        .then(() => fetch(job.status_url, { headers: { 'Accept': 'application/json' } }))
+        .then(response => response.json())
+        .then(next => next.job_id ? waitForJudgeJob(next, Math.min(delay * 1.5, 2000)) : next);
+}
+
+function showRunResult(result) {
+    if (result.success) {
+        let output = '';
+        if (result.output) {
+            output += `<div style="color: #27ae60;"><strong>Output:</strong><br><pre style="background: #f8f9fa; padding: 10px; border-radius: 4px; white-space: pre-wrap;">${result.output}</pre></div>`;
+        }
+        if (result.memory || result.cpuTime) {
+            output += `<div style="color: #7f8c8d; font-size: 0.9em;"><strong>Stats:</strong> Memory: ${result.memory || 'N/A'}, CPU Time: ${result.cpuTime || 'N/A'}</div>`;
+        }
+        outputPanel.innerHTML = output || '<div>Code executed successfully (no output)</div>';
+        outputPanel.className = 'output-panel success has-content';
+        statusIndicator.textContent = 'Success';
+        statusIndicator.className = 'status success';
+    } else {
+        let errorMessage = result.error;
+        if (result.error_type === 'compilation_error') {
+            errorMessage = `<strong>Compilation Error:</strong><br>${result.error}`;
+        } else if (result.error_type === 'runtime_error') {
+            errorMessage = `<strong>Runtime Error:</strong><br>${result.error}`;
+        } else if (result.error_type === 'api_error') {
+            errorMessage = `<strong>API Error:</strong><br>${result.error}`;
+        }
+        outputPanel.innerHTML = `<div style="color: #e74c3c;">${errorMessage}</div>`;
+        outputPanel.className = 'output-panel error has-content';
+        statusIndicator.textContent = 'Error';
+        statusIndicator.className = 'status error';
+    }
+}
+
 function simulateCodeExecution(code) {
     // Simple simulation - in reality, this would be handled by a backend
     if (code.includes('twoSum')) {
@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from leetcode.models import ParsedProblem
+from leetcode.services import artifacts, tiered_cache
+from mysite import views as project_views
+
+
+HTML = ('<p>Given an array of integers <code>nums</code> and an integer <code>target</code>, return indices of the two '
+        'numbers such that they add up to <code>target</code>.</p>'
+        '<p><strong>Example 1:</strong></p><pre><strong>Input:</strong> nums = [2,7,11,15], target = 9\n'
+        '<strong>Output:</strong> [0,1]</pre><p><strong>Constraints:</strong></p><ul><li><code>2 &lt;= nums.length</code></li></ul>')
+
+
+class TestParsedProblemArtifacts(TestCase):
+    def setUp(self):
+        cache.clear()
+        tiered_cache.clear_local()
+
+    def test_parses_once_per_content_hash(self):
+        parser = mock.Mock(wraps=project_views.parse_leetcode_content)
+        first = artifacts.get_parsed_content(HTML, parser, 'two-sum')
+        cache.clear()
+        tiered_cache.clear_local()
+        # A fresh process with a cold cache reads the stored artifact instead of parsing
+        second = artifacts.get_parsed_content(HTML, parser, 'two-sum')
+        self.assertEqual(first, second)
+        parser.assert_called_once()
+        artifact = ParsedProblem.objects.get()
+        self.assertEqual(artifact.content_hash, artifacts.content_hash(HTML))
+        self.assertEqual(artifact.examples[0]['output'], '[0,1]')
+
+    def test_changed_content_is_reparsed(self):
+        parser = mock.Mock(wraps=project_views.parse_leetcode_content)
+        artifacts.get_parsed_content(HTML, parser, 'two-sum')
+        artifacts.get_parsed_content(HTML.replace('target', 'goal'), parser, 'two-sum')
+        self.assertEqual(parser.call_count, 2)
+        self.assertEqual(ParsedProblem.objects.filter(title_slug='two-sum').count(), 2)
+
+    def test_parser_errors_are_not_persisted(self):
+        parser = mock.Mock(return_value={'description': 'Error parsing content: boom', 'examples': [], 'constraints': []})
+        artifacts.get_parsed_content(HTML, parser)
+        self.assertFalse(ParsedProblem.objects.exists())
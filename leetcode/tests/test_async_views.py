@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from leetcode.services.leetcode_api import AsyncLeetCodeAPI, LeetCodeResponse
+from polls.models import UserCodeSubmission
+
+
+DAILY = {'data': {'activeDailyCodingChallengeQuestion': {
+    'date': '2026-10-17', 'link': '/problems/two-sum/',
+    'question': {'frontendQuestionId': '1', 'title': 'Two Sum', 'titleSlug': 'two-sum', 'difficulty': 'Easy', 'acRate': 55.0},
+}}}
+DETAILS = {'data': {'question': {
+    'content': '<p>Find two numbers.</p>', 'exampleTestcaseList': ['[2,7,11,15]\n9'], 'sampleTestCase': '[2,7,11,15]\n9',
+    'codeSnippets': [{'langSlug': 'cpp', 'code': 'class Solution {};'}],
+}}}
+
+
+class TestAsyncLeetCodeViews(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('leetcode.services.daily.ensure_rollover_refresh')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_daily_question_uses_async_client(self):
+        daily = mock.AsyncMock(return_value=LeetCodeResponse(ok=True, status_code=200, data=DAILY))
+        details = mock.AsyncMock(return_value=LeetCodeResponse(ok=True, status_code=200, data=DETAILS))
+        with mock.patch.object(AsyncLeetCodeAPI, 'fetch_daily_question', daily), \
+                mock.patch.object(AsyncLeetCodeAPI, 'fetch_problem_details', details):
+            resp = self.client.get(reverse('leetcode:daily_question'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.context['is_real_question'])
+        self.assertEqual(resp.context['daily_question']['cppTemplate'], 'class Solution {};')
+        details.assert_awaited_once_with('two-sum')
+
+    def test_editor_overrides_template_with_saved_code(self):
+        user = User.objects.create_user('alice', password='pw')
+        UserCodeSubmission.objects.create(user=user, question_id='1', code='// saved', language='cpp')
+        self.client.force_login(user)
+        problem = {'title': 'Two Sum', 'difficulty': 'Easy', 'description': '', 'examples': [],
+                   'constraints': [], 'template': '', 'cppTemplate': '', 'title_slug': 'two-sum'}
+        with mock.patch('leetcode.views.fetch_problem_from_leetcode_api', return_value=problem):
+            resp = self.client.get(reverse('leetcode:question_editor_with_id', args=['1']))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context['current_problem']['cppTemplate'], '// saved')
+        # The cached problem dict must not be mutated by the override
+        self.assertEqual(problem['cppTemplate'], '')
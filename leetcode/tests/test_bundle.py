@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from leetcode.services import catalog, tiered_cache
+from leetcode.services.leetcode_api import LeetCodeAPI, LeetCodeResponse
+from mysite import views as project_views
+
+
+QUESTION = {'data': {'question': {
+    'questionFrontendId': '1', 'title': 'Two Sum', 'titleSlug': 'two-sum', 'difficulty': 'Easy',
+    'content': '<p>Find two numbers.</p>', 'exampleTestcases': '[2,7,11,15]\n9\n[3,2,4]\n6',
+    'codeSnippets': [{'lang': 'C++', 'langSlug': 'cpp',
+                      'code': 'class Solution {\npublic:\n    vector<int> twoSum(vector<int>& nums, int target) {\n        \n    }\n};'}],
+}}}
+USER_CODE = 'class Solution {\npublic:\n    vector<int> twoSum(vector<int>& nums, int target) { return {0, 1}; }\n};'
+
+
+class TestProblemBundle(TestCase):
+    def setUp(self):
+        cache.clear()
+        tiered_cache.clear_local()
+        catalog.upsert_problems([{'frontendQuestionId': '1', 'title': 'Two Sum', 'titleSlug': 'two-sum', 'difficulty': 'Easy'}])
+
+    def _jdoodle_ok(self):
+        return mock.Mock(status_code=200, json=mock.Mock(return_value={'output': 'ok', 'memory': '1', 'cpuTime': '0.01'}))
+
+    def test_compile_makes_one_leetcode_request(self):
+        upstream = mock.Mock(return_value=LeetCodeResponse(ok=True, status_code=200, data=QUESTION))
+        with mock.patch.object(LeetCodeAPI, '_post_uncoalesced', upstream), \
+                mock.patch.object(project_views.http_client, 'post', return_value=self._jdoodle_ok()) as post:
+            result = project_views.execute_code_jdoodle(USER_CODE, 'cpp', '1')
+        self.assertTrue(result['success'])
+        upstream.assert_called_once()
+        # Only the JDoodle call goes through the raw HTTP client
+        post.assert_called_once()
+        self.assertIn('twoSum', post.call_args.kwargs['json']['script'])
+        # Test data travels on stdin rather than being unrolled into the script
+        self.assertEqual(post.call_args.kwargs['json']['stdin'], '[2,7,11,15]\n9\n[3,2,4]\n')
+
+    def test_bundle_is_cached_between_compiles(self):
+        upstream = mock.Mock(return_value=LeetCodeResponse(ok=True, status_code=200, data=QUESTION))
+        with mock.patch.object(LeetCodeAPI, '_post_uncoalesced', upstream), \
+                mock.patch.object(project_views.http_client, 'post', return_value=self._jdoodle_ok()):
+            project_views.execute_code_jdoodle(USER_CODE, 'cpp', '1')
+            project_views.execute_code_jdoodle(USER_CODE, 'cpp', '1')
+        upstream.assert_called_once()
+
+    def test_bundle_detects_method_and_signature_from_snippet(self):
+        with mock.patch.object(LeetCodeAPI, '_post_uncoalesced',
+                               return_value=LeetCodeResponse(ok=True, status_code=200, data=QUESTION)):
+            bundle = project_views.get_problem_bundle('1')
+        self.assertEqual(bundle.title_slug, 'two-sum')
+        self.assertEqual(bundle.method_name, 'twoSum')
+        self.assertEqual([p['name'] for p in bundle.signature['parameters']], ['nums', 'target'])
+        self.assertEqual(bundle.as_simulation_data()['method_name'], 'twoSum')
@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from leetcode.models import Problem
+from leetcode.services import catalog
+from mysite import views as project_views
+
+
+ROWS = [
+    {'frontendQuestionId': '1', 'title': 'Two Sum', 'titleSlug': 'two-sum', 'difficulty': 'Easy',
+     'acRate': 55.1, 'paidOnly': False, 'topicTags': [{'name': 'Array'}, {'name': 'Hash Table'}]},
+    {'frontendQuestionId': '2', 'title': 'Add Two Numbers', 'titleSlug': 'add-two-numbers', 'difficulty': 'Medium',
+     'acRate': 44.0, 'paidOnly': False, 'topicTags': [{'name': 'Linked List'}]},
+]
+
+
+class TestProblemCatalog(TestCase):
+    def test_upsert_and_lookup(self):
+        self.assertEqual(catalog.upsert_problems(ROWS), 2)
+        self.assertEqual(catalog.get_title_slug('2'), 'add-two-numbers')
+        self.assertEqual(catalog.get_problem(1).tags, ['Array', 'Hash Table'])
+        self.assertIsNone(catalog.get_title_slug('999'))
+        self.assertIsNone(catalog.get_title_slug('not-a-number'))
+
+    def test_upsert_updates_existing_rows(self):
+        catalog.upsert_problems(ROWS)
+        catalog.upsert_problems([dict(ROWS[0], acRate=60.0)])
+        self.assertEqual(Problem.objects.count(), 2)
+        self.assertEqual(Problem.objects.get(pk=1).ac_rate, 60.0)
+
+    def test_reassigned_slugs_do_not_abort_the_sync(self):
+        catalog.upsert_problems(ROWS)
+        # Problem 3 takes over "two-sum" while problem 1 is not in this batch: the stale row goes
+        self.assertEqual(catalog.upsert_problems([dict(ROWS[0], frontendQuestionId='3')]), 1)
+        self.assertEqual(catalog.get_title_slug('3'), 'two-sum')
+        self.assertIsNone(catalog.get_problem(1))
+
+        # Two problems swapping slugs in one batch
+        catalog.upsert_problems([dict(ROWS[0], frontendQuestionId='1', titleSlug='add-two-numbers'),
+                                 dict(ROWS[1], frontendQuestionId='2', titleSlug='two-sum'),
+                                 dict(ROWS[0], frontendQuestionId='3', titleSlug='three-sum')])
+        self.assertEqual([catalog.get_title_slug(pk) for pk in (1, 2, 3)], ['add-two-numbers', 'two-sum', 'three-sum'])
+
+    def test_rows_without_slug_are_skipped(self):
+        self.assertEqual(catalog.upsert_problems([{'frontendQuestionId': '3', 'title': 'No slug'}]), 0)
+
+    def test_find_title_slug_uses_catalog_without_network(self):
+        catalog.upsert_problems(ROWS)
+        with mock.patch.object(project_views.http_client, 'post') as post:
+            self.assertEqual(project_views.find_title_slug_by_id('1'), 'two-sum')
+            self.assertEqual(project_views.search_question_by_id('2'), 'add-two-numbers')
+        post.assert_not_called()
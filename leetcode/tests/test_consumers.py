@@ -0,0 +1,133 @@
+import shutil
+import unittest
+from unittest import mock
+
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from leetcode.consumers import apply_ops
+from leetcode.routing import websocket_urlpatterns
+from leetcode.services import harness
+from leetcode.services.bundle import ProblemBundle
+from leetcode.services.execution import LocalBackend
+from leetcode.tests.test_harness import TWO_SUM_CODE, TWO_SUM_SIGNATURE
+from polls.models import UserCodeSubmission
+
+OUTPUT = '''=== Test Cases for Problem 1 ===
+
+Test Case 1:
+  Input: nums = [2,7], target = 9
+  Expected: [0,1]
+  Your Output: [0,1]
+  ✓ PASSED
+
+Test Case 2:
+  Input: nums = [3,3], target = 7
+  Expected: [0,1]
+  Invalid input: bad literal
+  ✗ FAILED
+
+Result: 1/2 test cases passed
+'''
+RESULT = {'success': True, 'output': OUTPUT, 'error': '', 'statusCode': 0, 'memory': '1', 'cpuTime': '0.01'}
+
+
+class TestApplyOps(SimpleTestCase):
+    def test_ops_apply_in_order(self):
+        ops = [{'at': 0, 'remove': 3, 'insert': 'long'}, {'at': 10, 'insert': ';'}]
+        self.assertEqual(apply_ops('int x = 1', ops, 11), 'long x = 1;')
+
+    def test_bad_ops_and_lengths_ask_for_a_resync(self):
+        self.assertIsNone(apply_ops('abc', [{'at': 2, 'remove': 5}]))
+        self.assertIsNone(apply_ops('abc', [{'at': 'x'}]))
+        self.assertIsNone(apply_ops('abc', [{'at': 3, 'insert': 'd'}], 5))
+        self.assertIsNone(apply_ops('// 🙂\n', [{'at': 0, 'insert': 'x'}]))
+
+
+@override_settings(LEETCODE_EDITOR_AUTOSAVE_SECONDS=0, LEETCODE_JUDGE_MODE='eager')
+class TestEditorConsumer(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('editor')
+
+    async def _connect(self, user=None):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), '/ws/leetcode/editor/1/')
+        communicator.scope['user'] = user or self.user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def test_anonymous_sockets_are_refused(self):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), '/ws/leetcode/editor/1/')
+        communicator.scope['user'] = mock.Mock(is_authenticated=False)
+        connected, code = await communicator.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    @override_settings(ALLOWED_HOSTS=['judge.example.com'])
+    async def test_sockets_from_foreign_origins_are_refused(self):
+        from mysite.asgi import application
+        codes = {}
+        for origin in (b'https://evil.example.org', b'https://judge.example.com'):
+            communicator = WebsocketCommunicator(application, '/ws/leetcode/editor/1/', headers=[(b'origin', origin)])
+            connected, codes[origin] = await communicator.connect()
+            self.assertFalse(connected)
+        # The allowed origin gets through to the consumer, which then turns the anonymous socket away
+        self.assertNotEqual(codes[b'https://evil.example.org'], 4401)
+        self.assertEqual(codes[b'https://judge.example.com'], 4401)
+
+    async def test_autosave_applies_deltas(self):
+        communicator = await self._connect()
+        await communicator.send_json_to({'type': 'sync', 'code': 'int x = 1', 'language': 'cpp'})
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'saved', 'version': 1})
+        await communicator.send_json_to({'type': 'edit', 'base': 1, 'ops': [{'at': 9, 'insert': ';'}], 'length': 10})
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'saved', 'version': 2})
+        saved = await UserCodeSubmission.objects.aget(user=self.user, question_id='1')
+        self.assertEqual(saved.code, 'int x = 1;')
+
+        # An edit against a stale version is refused, and the client is asked for the full text
+        await communicator.send_json_to({'type': 'edit', 'base': 1, 'ops': [{'at': 0, 'insert': 'x'}], 'length': 11})
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'resync', 'version': 2})
+        await communicator.disconnect()
+
+    async def test_run_streams_status_tests_and_result(self):
+        communicator = await self._connect()
+        await communicator.send_json_to({'type': 'sync', 'code': 'class Solution {};'})
+        with mock.patch('mysite.views.execute_code_jdoodle', return_value=RESULT) as run:
+            await communicator.send_json_to({'type': 'run', 'language': 'cpp', 'title_slug': 'two-sum'})
+            self.assertEqual((await communicator.receive_json_from())['type'], 'saved')
+            first, second, result = [await communicator.receive_json_from() for _ in range(3)]
+        run.assert_called_once_with('class Solution {};', 'cpp', '1', 'two-sum')
+        self.assertEqual((first['type'], first['case'], first['passed'], first['output']), ('test', 1, True, '[0,1]'))
+        self.assertEqual((second['case'], second['passed'], second['error']), (2, False, 'bad literal'))
+        self.assertEqual((result['type'], result['status'], result['passed'], result['total']), ('result', 'done', 1, 2))
+        self.assertEqual(result['result'], RESULT)
+        await communicator.disconnect()
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ is not installed')
+    async def test_run_reports_the_cases_of_the_real_harness(self):
+        harness.clear()
+        bundle = ProblemBundle(
+            question_id='1', title_slug='two-sum', method_name='twoSum', signature=TWO_SUM_SIGNATURE,
+            example_testcases='[2,7,11,15]\n9\n[0, 1]\n[3,2,4]\n6\n[0,1]',
+        )
+        backend = LocalBackend(binary_cache=None, pool=None)
+        communicator = await self._connect()
+        await communicator.send_json_to({'type': 'sync', 'code': TWO_SUM_CODE, 'language': 'cpp'})
+        with mock.patch('mysite.views.get_problem_bundle', return_value=bundle), \
+                mock.patch('mysite.views.execution.execute', side_effect=backend.execute):
+            await communicator.send_json_to({'type': 'run', 'language': 'cpp', 'title_slug': 'two-sum'})
+            self.assertEqual((await communicator.receive_json_from())['type'], 'saved')
+            first, second, result = [await communicator.receive_json_from(timeout=30) for _ in range(3)]
+        self.assertEqual((first['type'], first['case'], first['passed'], first['output']), ('test', 1, True, '[0,1]'))
+        self.assertEqual((second['case'], second['passed'], second['expected'], second['output']),
+                         (2, False, '[0,1]', '[1,2]'))
+        self.assertEqual((result['type'], result['passed'], result['total']), ('result', 1, 2))
+        await communicator.disconnect()
+
+    async def test_run_without_code_is_an_error(self):
+        communicator = await self._connect()
+        await communicator.send_json_to({'type': 'run'})
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'error', 'error': 'No code provided', 'status': 400})
+        await communicator.disconnect()
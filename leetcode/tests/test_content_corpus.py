@@ -0,0 +1,48 @@
+from django.test import SimpleTestCase
+
+from leetcode.benchmarks import content as content_bench
+
+
+class TestContentCorpus(SimpleTestCase):
+    def test_corpus_outputs_and_allocations_within_baseline(self):
+        documents = content_bench.load_corpus()
+        self.assertTrue(documents)
+        parser = content_bench.default_parser()
+        baseline = content_bench.load_baseline()
+        for document in documents:
+            with self.subTest(document=document.name):
+                self.assertIn(document.name, baseline)
+                # Latency depends on the machine, so only the command enforces it
+                result = content_bench.check_document(document, parser, baseline, latency_tolerance=None)
+                self.assertTrue(result.output_matches, 'parsed output differs from golden file')
+                self.assertEqual(result.regressions, [])
+
+    def test_goldens_are_the_legacy_parser_output(self):
+        reference = content_bench.reference_parser()
+        for document in content_bench.load_corpus():
+            with self.subTest(document=document.name):
+                self.assertEqual(document.golden(), reference(document.html))
+
+    def test_latency_is_compared_as_a_ratio_to_the_reference(self):
+        document = content_bench.load_corpus()[0]
+        parser = content_bench.default_parser()
+        slow_reference = lambda html: [parser(html) for _ in range(4)]
+        baseline = {document.name: {'latency_ratio': 0.5, 'peak_bytes': 10 ** 9}}
+        result = content_bench.check_document(document, parser, baseline, number=3, rounds=2, reference=slow_reference)
+        self.assertLess(result.latency_ratio, 0.5)
+        self.assertEqual(result.regressions, [])
+
+    def test_regressions_are_reported(self):
+        document = content_bench.load_corpus()[0]
+        baseline = {document.name: {'latency_ratio': 0.0001, 'peak_bytes': 1}}
+        result = content_bench.check_document(document, content_bench.default_parser(), baseline, number=1, rounds=1)
+        self.assertFalse(result.ok)
+        self.assertEqual(len(result.regressions), 2)
+
+    def test_changed_output_fails(self):
+        document = content_bench.load_corpus()[0]
+        result = content_bench.check_document(
+            document, lambda html: {'description': '', 'examples': [], 'constraints': []}, {}, latency_tolerance=None,
+        )
+        self.assertIs(result.output_matches, False)
+        self.assertFalse(result.ok)
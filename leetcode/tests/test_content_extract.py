@@ -0,0 +1,99 @@
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from leetcode.services.content_extract import extract_problem_content
+from mysite.views import legacy_parse_leetcode_content
+
+TWO_SUM = """<p>Given an array of integers <code>nums</code>&nbsp;and an integer <code>target</code>, return <em>indices of the two numbers such that they add up to <code>target</code></em>.</p>
+
+<p>You may assume that each input would have <strong><em>exactly</em> one solution</strong>, and you may not use the <em>same</em> element twice.</p>
+
+<p>&nbsp;</p>
+<p><strong class="example">Example 1:</strong></p>
+
+<pre>
+<strong>Input:</strong> nums = [2,7,11,15], target = 9
+<strong>Output:</strong> [0,1]
+<strong>Explanation:</strong> Because nums[0] + nums[1] == 9, we return [0, 1].
+</pre>
+
+<p><strong class="example">Example 2:</strong></p>
+
+<pre>
+<strong>Input:</strong> nums = [3,2,4], target = 6
+<strong>Output:</strong> [1,2]
+</pre>
+
+<p><strong>Constraints:</strong></p>
+
+<ul>
+	<li><code>2 &lt;= nums.length &lt;= 10<sup>4</sup></code></li>
+	<li><strong>Only one valid answer exists.</strong></li>
+</ul>
+"""
+
+EXAMPLE_BLOCKS = """<p>You are given a string <code>s</code> consisting of lowercase letters. Return the length of the longest substring that contains every vowel an even number of times.</p>
+<p><strong class="example">Example 1:</strong></p>
+<div class="example-block">
+<p><strong>Input:</strong> <span class="example-io">s = "eleetminicoworoep"</span></p>
+<p><strong>Output:</strong> <span class="example-io">13</span></p>
+</div>
+<p><strong>Constraints:</strong></p>
+<ul><li><code>1 &lt;= s.length &lt;= 5 x 10^5</code></li></ul>
+"""
+
+WRAPPED = """<div class="content__u3I1 question-content__JfgR"><div><p>Given the <code>root</code> of a binary tree, return <em>the level order traversal of its nodes' values</em>. (i.e., from left to right, level by level).</p>
+<p><strong>Example 1:</strong></p>
+<pre><strong>Input:</strong> root = [3,9,20,null,null,15,7]
+<strong>Output:</strong> [[3],[9,20],[15,7]]</pre>
+<p><strong>Constraints:</strong></p><ul><li>The number of nodes in the tree is in the range <code>[0, 2000]</code>.</li><li><code>-1000 &lt;= Node.val &lt;= 1000</code><br></li></ul></div></div>
+"""
+
+UNCLOSED = """<div class="question-content"><p>Unclosed paragraph with a lot of text that goes on and on for the sake of length, more than one hundred characters in total.
+<div><span>Example 1</span></div><p>Input: a = 1
+Output: 2</div><ul><li>1 ≤ n ≤ 10<li>nested range note</ul>
+"""
+
+
+ENTITIES_AND_MARKUP = """<!DOCTYPE html><div class="content  extra"><p>Return &quot;none&quot; when a &lt; b &amp;&amp; b&nbsp;&gt; c, for all of the values given in the input array below.<br>
+<img alt='say "hi"' src="x.png"><div/></p><!-- Example 1: hidden -->
+<p><strong class="example">Example 1:</strong></p>
+<div class="example-block">
+<p><strong>Input:</strong> <span class="example-io">s = &quot;a&quot;</span></p>
+
+<p><strong>Output:</strong> <span class="example-io">1</span></p>
+</div>
+<script>if (a < b && c) {}</script></div>
+"""
+
+CORPUS = Path(__file__).resolve().parent.parent / 'benchmarks' / 'corpus'
+
+
+class TestExtractProblemContent(SimpleTestCase):
+    def test_matches_legacy_parser(self):
+        for html in (TWO_SUM, EXAMPLE_BLOCKS, WRAPPED, UNCLOSED, ENTITIES_AND_MARKUP, '<p>Return x.</p>'):
+            with self.subTest(html=html[:40]):
+                self.assertEqual(extract_problem_content(html), legacy_parse_leetcode_content(html))
+
+    def test_matches_legacy_parser_on_benchmark_corpus(self):
+        pages = sorted(CORPUS.glob('*.html'))
+        self.assertTrue(pages)
+        for page in pages:
+            with self.subTest(page=page.stem):
+                html = page.read_text(encoding='utf-8')
+                self.assertEqual(extract_problem_content(html), legacy_parse_leetcode_content(html))
+
+    def test_two_sum(self):
+        parsed = extract_problem_content(TWO_SUM)
+        self.assertEqual(parsed['examples'][0], {
+            'input': 'nums = [2,7,11,15], target = 9',
+            'output': '[0,1]',
+            'explanation': 'Because nums[0] + nums[1] == 9, we return [0, 1].',
+        })
+        self.assertEqual(len(parsed['examples']), 2)
+        self.assertEqual(parsed['constraints'], ['2 <= nums.length <= 104'])
+        self.assertTrue(parsed['description'].startswith('<p>Given an array of integers'))
+
+    def test_empty_content(self):
+        self.assertEqual(extract_problem_content('')['description'], 'No description available')
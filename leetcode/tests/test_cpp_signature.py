@@ -0,0 +1,119 @@
+from django.test import SimpleTestCase
+
+from leetcode.services import cpp_signature
+from leetcode.services.cpp_signature import CppType, SignatureError
+from mysite import views as project_views
+
+TWO_SUM = """class Solution {
+public:
+    vector<int> twoSum(vector<int>& nums, int target) {
+        
+    }
+};"""
+
+LEVEL_ORDER = """/**
+ * Definition for a binary tree node.
+ * struct TreeNode {
+ *     TreeNode(int x) : val(x), left(nullptr), right(nullptr) {}
+ * };
+ */
+class Solution {
+public:
+    vector<vector<int>> levelOrder(TreeNode* root) {
+        
+    }
+};"""
+
+LRU_CACHE = """class LRUCache {
+public:
+    LRUCache(int capacity) {
+        
+    }
+    
+    int get(int key) {
+        
+    }
+    
+    void put(int key, int value) {
+        
+    }
+};"""
+
+USER_CODE = """#include <bits/stdc++.h>
+using namespace std;
+struct ListNode { int val; ListNode *next; ListNode(int x) : val(x), next(NULL) {} };
+vector<int> cache(10);
+template <typename T>
+T clampValue(const T& v, T lo, T hi) { return max(lo, min(v, hi)); }
+class Solution {
+    unordered_map<string, pair<int, int>> memo;
+    int helper(const string &s, int i = 0) const { if (s[i] == '{') return 1; return helper(s, i + 1); }
+public:
+    ListNode *addTwoNumbers(ListNode *l1, ListNode* l2) {
+        vector<int> digits(5, 0);
+        for (int i = 0; i < 3; i++) { digits.push_back(i); }
+        return nullptr;
+    }
+    long long countPairs(vector<long long> const &a, unsigned int k, int grid[][3]);
+};
+int main() { Solution s; return 0; }
+"""
+
+
+class TestCppSignature(SimpleTestCase):
+    def setUp(self):
+        cpp_signature.clear()
+
+    def test_leetcode_snippets(self):
+        signature = cpp_signature.find_signature(TWO_SUM)
+        self.assertEqual(signature.as_dict(), {
+            'return_type': 'vector<int>',
+            'parameters': [{'type': 'vector<int>&', 'name': 'nums'}, {'type': 'int', 'name': 'target'}],
+            'method_name': 'twoSum',
+        })
+        level_order = cpp_signature.find_signature(LEVEL_ORDER)
+        self.assertEqual(level_order.return_type, CppType('vector', (CppType('vector', (CppType('int'),)),)))
+        self.assertEqual(level_order.parameters[0].type.pointer, 1)
+        # Design problems: constructors are skipped
+        self.assertEqual(cpp_signature.find_signature(LRU_CACHE).method_name, 'get')
+        self.assertEqual(len(cpp_signature.find_signature(LRU_CACHE, 'put').parameters), 2)
+
+    def test_user_code(self):
+        names = [s.method_name for s in cpp_signature.declarations(USER_CODE)]
+        # Calls, locals and constructors inside bodies are not declarations
+        self.assertEqual(names, ['clampValue', 'helper', 'addTwoNumbers', 'countPairs', 'main'])
+        self.assertEqual(cpp_signature.find_signature(USER_CODE).method_name, 'addTwoNumbers')
+        add = cpp_signature.find_signature(USER_CODE, 'addTwoNumbers')
+        self.assertEqual([str(p.type) for p in add.parameters], ['ListNode*', 'ListNode*'])
+        self.assertEqual([p.name for p in add.parameters], ['l1', 'l2'])
+        count = cpp_signature.find_signature(USER_CODE, 'countPairs')
+        self.assertEqual(str(count.return_type), 'long long')
+        self.assertEqual([str(p.type) for p in count.parameters], ['const vector<long long>&', 'unsigned int', 'int*'])
+        helper = cpp_signature.find_signature(USER_CODE, 'helper')
+        self.assertTrue(helper.is_const)
+        self.assertEqual(helper.access, 'private')
+        self.assertEqual(helper.parameters[1].default, '0')
+
+    def test_parse_type(self):
+        parsed = cpp_signature.parse_type('const std::map<int, vector<string>>&')
+        self.assertTrue(parsed.const)
+        self.assertEqual(parsed.reference, '&')
+        self.assertEqual(parsed.name, 'std::map')
+        self.assertEqual(parsed.unqualified_name, 'map')
+        self.assertEqual(str(parsed.args[1]), 'vector<string>')
+        self.assertEqual(str(parsed.base), 'std::map<int, vector<string>>')
+        with self.assertRaises(SignatureError):
+            cpp_signature.parse_type('vector<int')
+
+    def test_memoized_by_snippet(self):
+        first = cpp_signature.declarations(TWO_SUM)
+        self.assertIs(cpp_signature.declarations(TWO_SUM), first)
+        self.assertEqual(cpp_signature.stats()['hits'], 1)
+        self.assertEqual(cpp_signature.stats()['misses'], 1)
+
+    def test_view_helpers_delegate(self):
+        self.assertEqual(project_views.detect_method_name_from_code(TWO_SUM), 'twoSum')
+        self.assertEqual(project_views.detect_method_name_from_code('int x;'), 'solve')
+        self.assertEqual(project_views.detect_function_signature(TWO_SUM, 'twoSum')['parameters'][0]['name'], 'nums')
+        self.assertIsNone(project_views.detect_function_signature(TWO_SUM, 'missing'))
+        self.assertEqual(project_views.detect_parameter_type_from_code(TWO_SUM, 'twoSum'), 'vector')
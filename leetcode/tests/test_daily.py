@@ -0,0 +1,107 @@
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from leetcode.services import daily
+from leetcode.services.leetcode_api import AsyncLeetCodeAPI, LeetCodeResponse
+from leetcode.tests.test_async_views import DAILY, DETAILS
+
+
+GOOD = {'daily_question': {'title': 'Yesterday'}, 'is_real_question': True, 'api_error': None}
+
+
+def upstream(ok=True):
+    if ok:
+        return (mock.AsyncMock(return_value=LeetCodeResponse(ok=True, status_code=200, data=DAILY)),
+                mock.AsyncMock(return_value=LeetCodeResponse(ok=True, status_code=200, data=DETAILS)))
+    failure = mock.AsyncMock(return_value=LeetCodeResponse(ok=False, status_code=500, error='down'))
+    return failure, failure
+
+
+class TestDailyQuestionSWR(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(daily, 'ensure_rollover_refresh')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _patch_api(self, ok=True):
+        fetch_daily, fetch_details = upstream(ok)
+        return (mock.patch.object(AsyncLeetCodeAPI, 'fetch_daily_question', fetch_daily),
+                mock.patch.object(AsyncLeetCodeAPI, 'fetch_problem_details', fetch_details),
+                fetch_daily)
+
+    def test_cold_cache_fetches_once_then_serves_cache(self):
+        p1, p2, fetch_daily = self._patch_api()
+        with p1, p2:
+            self.client.get(reverse('leetcode:daily_question'))
+            resp = self.client.get(reverse('leetcode:daily_question'))
+        self.assertEqual(resp.context['daily_question']['title'], 'Two Sum')
+        fetch_daily.assert_awaited_once()
+
+    def test_stale_entry_is_served_while_refreshing_in_background(self):
+        cache.set(daily.CACHE_KEY, {'context': GOOD, 'fetched_at': time.time() - 3600, 'day': '2000-01-01'}, 60)
+        with mock.patch.object(daily, 'spawn_refresh') as spawn:
+            resp = self.client.get(reverse('leetcode:daily_question'))
+        self.assertEqual(resp.context['daily_question']['title'], 'Yesterday')
+        spawn.assert_called_once()
+
+    def test_fresh_entry_does_not_refresh(self):
+        cache.set(daily.CACHE_KEY, {'context': GOOD, 'fetched_at': time.time(), 'day': daily._utc_today()}, 60)
+        with mock.patch.object(daily, 'spawn_refresh') as spawn:
+            self.client.get(reverse('leetcode:daily_question'))
+        spawn.assert_not_called()
+
+    def test_failed_refresh_keeps_last_known_good(self):
+        entry = {'context': GOOD, 'fetched_at': 0, 'day': '2000-01-01'}
+        cache.set(daily.CACHE_KEY, entry, 60)
+        p1, p2, _ = self._patch_api(ok=False)
+        with p1, p2:
+            context = async_to_sync(daily.refresh)()
+            # The lock stays held after a failure, so an immediate retry is skipped
+            self.assertIsNone(async_to_sync(daily.refresh)())
+        self.assertEqual(context['api_error'], 'down')
+        self.assertEqual(cache.get(daily.CACHE_KEY), entry)
+
+    def test_cold_cache_failure_shows_error_without_caching(self):
+        p1, p2, _ = self._patch_api(ok=False)
+        with p1, p2:
+            resp = self.client.get(reverse('leetcode:daily_question'))
+        self.assertFalse(resp.context['is_real_question'])
+        self.assertIsNone(cache.get(daily.CACHE_KEY))
+
+    def test_entry_of_another_shape_is_a_miss(self):
+        # What earlier releases stored under the old key, and any other foreign value
+        cache.set(daily.CACHE_KEY, {'daily_question': {'title': 'Old'}, 'is_real_question': True}, 60)
+        p1, p2, fetch_daily = self._patch_api()
+        with p1, p2:
+            resp = self.client.get(reverse('leetcode:daily_question'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context['daily_question']['title'], 'Two Sum')
+        fetch_daily.assert_awaited_once()
+
+    def test_failed_details_fetch_is_not_cached(self):
+        fetch_daily, _ = upstream()
+        failure = mock.AsyncMock(return_value=LeetCodeResponse(ok=False, status_code=500, error='down'))
+        with mock.patch.object(AsyncLeetCodeAPI, 'fetch_daily_question', fetch_daily), \
+                mock.patch.object(AsyncLeetCodeAPI, 'fetch_problem_details', failure):
+            context = async_to_sync(daily.refresh)()
+        self.assertEqual(context['api_error'], 'down')
+        self.assertIsNone(cache.get(daily.CACHE_KEY))
+
+    def test_stale_requests_start_one_refresh_thread(self):
+        with mock.patch.object(daily.threading, 'Thread') as thread:
+            daily.spawn_refresh()
+            daily.spawn_refresh()
+        thread.assert_called_once()
+        self.assertIsNotNone(cache.get(daily.LOCK_KEY))
+
+    def test_rollover_timer_fires_after_next_utc_midnight(self):
+        with self.settings(LEETCODE_DAILY_REFRESH_DELAY_SECONDS=30):
+            delay = daily._seconds_until_rollover()
+        self.assertGreater(delay, 30)
+        self.assertLessEqual(delay, 24 * 3600 + 30)
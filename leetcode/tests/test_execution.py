@@ -0,0 +1,363 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import requests
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from leetcode.services import execution, http_client, tiered_cache
+from leetcode.services.execution import BinaryCache, ExecutionBackend, LocalBackend, result_cache
+from leetcode.services.execution.binary_cache import binary_key
+from leetcode.services.execution.pool import SandboxPool
+from leetcode.services.execution.sandbox import Limits, run_limited
+
+HELLO = '#include <iostream>\nint main() { std::string s; std::cin >> s; std::cout << "hi " << s << std::endl; }'
+FORKS_AND_EXITS = (
+    '#include <cstdio>\n#include <unistd.h>\n'
+    'int main() { pid_t child = fork(); if (child == 0) { sleep(30); return 0; } printf("%d", child); }'
+)
+
+
+def _running(pid, wait_seconds=2.0):
+    """Whether pid is still alive (not gone or a zombie) after giving a pending SIGKILL time to land"""
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        try:
+            with open(f'/proc/{pid}/stat') as stat:
+                alive = stat.read().rsplit(')', 1)[1].split()[0] != 'Z'
+        except FileNotFoundError:
+            alive = False
+        if not alive or time.monotonic() > deadline:
+            return alive
+        time.sleep(0.01)
+
+
+class TestBackendSelection(SimpleTestCase):
+    def tearDown(self):
+        execution.reset()
+
+    @override_settings(LEETCODE_EXECUTION_BACKEND='local')
+    def test_local_backend_runs_cpp_only(self):
+        execution.reset()
+        self.assertIsInstance(execution.get_backend('cpp'), LocalBackend)
+        self.assertIsInstance(execution.get_backend('python3'), execution.JDoodleBackend)
+
+    @override_settings(LEETCODE_EXECUTION_BACKEND='judge0')
+    def test_unknown_backend(self):
+        with self.assertRaises(ImproperlyConfigured):
+            execution.get_backend('cpp')
+
+
+class TestJDoodleBackend(SimpleTestCase):
+    def test_sends_stdin_and_maps_result(self):
+        response = mock.Mock(status_code=200, json=mock.Mock(return_value={
+            'output': 'hi x\n', 'statusCode': 200, 'memory': '3000', 'cpuTime': '0.01',
+        }))
+        with mock.patch.object(http_client, 'post', return_value=response) as post:
+            result = execution.JDoodleBackend().execute(HELLO, 'cpp', 'x\n')
+        self.assertEqual(post.call_args.kwargs['json']['stdin'], 'x\n')
+        self.assertEqual(result, {
+            'success': True, 'output': 'hi x\n', 'error': '', 'statusCode': 0, 'memory': '3000', 'cpuTime': '0.01',
+        })
+
+    def test_unreachable_api_returns_none(self):
+        with mock.patch.object(http_client, 'post', side_effect=requests.exceptions.ConnectionError()):
+            self.assertIsNone(execution.JDoodleBackend().execute(HELLO, 'cpp'))
+
+    def test_failed_runs_in_a_200_answer_are_failures(self):
+        answers = [
+            ({'output': 'hi\nJDoodle - Timeout \nIf your program reads input...', 'statusCode': 200}, 'timeout_error'),
+            ({'output': 'hi\nCommand terminated by signal 11\n', 'statusCode': 200}, 'runtime_error'),
+            ({'output': 'boom', 'statusCode': 200, 'isExecutionSuccess': False}, 'runtime_error'),
+            ({'output': "jdoodle.cpp:1: error: 'x' was not declared", 'statusCode': 200, 'isCompiled': False},
+             'compilation_error'),
+            ({'output': '', 'statusCode': 429}, 'api_error'),
+        ]
+        for answer, error_type in answers:
+            with self.subTest(answer=answer):
+                response = mock.Mock(status_code=200, json=mock.Mock(return_value=answer))
+                with mock.patch.object(http_client, 'post', return_value=response):
+                    result = execution.JDoodleBackend().execute(HELLO, 'cpp')
+                self.assertFalse(result['success'])
+                self.assertEqual(result['error_type'], error_type)
+        self.assertEqual(result['error'], 'JDoodle answered with status 429')
+
+
+@unittest.skipUnless(shutil.which('g++'), 'g++ is not installed')
+class TestLocalBackend(SimpleTestCase):
+    def setUp(self):
+        self.backend = self._backend(cpu_seconds=1, wall_seconds=3, memory_mb=64)
+
+    def _backend(self, **limits):
+        return LocalBackend(binary_cache=None, pool=None, **limits)
+
+    def test_runs_with_stdin(self):
+        result = self.backend.execute(HELLO, 'cpp', 'there\n')
+        self.assertTrue(result['success'])
+        self.assertEqual(result['output'], 'hi there\n')
+        self.assertGreater(result['memory'], 0)
+
+    def test_compilation_error(self):
+        result = self.backend.execute('int main() { return x; }', 'cpp')
+        self.assertEqual(result['error_type'], 'compilation_error')
+        self.assertIn("'x' was not declared", result['error'])
+
+    def test_cpu_limit(self):
+        result = self.backend.execute('int main() { volatile unsigned long i = 0; while (true) i++; }', 'cpp')
+        self.assertEqual(result['error_type'], 'timeout_error')
+
+    def test_wall_clock_limit(self):
+        backend = self._backend(cpu_seconds=5, wall_seconds=0.5)
+        result = backend.execute('#include <unistd.h>\nint main() { sleep(10); }', 'cpp')
+        self.assertEqual(result['error_type'], 'timeout_error')
+
+    def test_memory_limit(self):
+        code = '#include <vector>\nint main() { std::vector<char> v(512u << 20, 1); return v[7]; }'
+        result = self.backend.execute(code, 'cpp')
+        self.assertEqual(result['error_type'], 'runtime_error')
+        self.assertIn('Memory limit exceeded', result['error'])
+
+    def test_crash(self):
+        result = self.backend.execute('int main() { int* p = nullptr; return *p; }', 'cpp')
+        self.assertEqual(result['error_type'], 'runtime_error')
+        self.assertIn('SIGSEGV', result['error'])
+
+    @unittest.skipUnless(os.path.isdir('/proc'), 'needs /proc')
+    def test_forked_processes_do_not_outlive_the_run(self):
+        result = self.backend.execute(FORKS_AND_EXITS, 'cpp')
+        self.assertTrue(result['success'])
+        self.assertFalse(_running(int(result['output'])))
+
+
+class TestSandbox(SimpleTestCase):
+    def test_limits_include_a_process_cap(self):
+        workdir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, workdir, True)
+        limits = Limits(cpu_seconds=1, wall_seconds=5, memory_bytes=256 << 20, output_bytes=4096, processes=77)
+        script = 'import resource; print(*resource.getrlimit(resource.RLIMIT_NPROC))'
+        completed = run_limited([sys.executable, '-c', script], workdir, limits)
+        self.assertEqual(completed.stdout.split(), ['77', '77'])
+
+
+class TestPooledLocalBackend(TestLocalBackend):
+    """Every TestLocalBackend case again, run by warm sandbox workers"""
+
+    def _backend(self, **limits):
+        root = Path(tempfile.mkdtemp())
+        pool = SandboxPool(root, size=1, max_runs=2, wait_seconds=5)
+        self.addCleanup(shutil.rmtree, root, True)
+        self.addCleanup(pool.close)
+        return LocalBackend(binary_cache=None, pool=pool, **limits)
+
+    def test_workers_are_reused_then_recycled(self):
+        pool = self.backend.pool
+        first = pool._idle.queue[0]
+        self.backend.execute(HELLO, 'cpp', 'a\n')
+        self.assertIs(pool._idle.queue[0], first)
+        # Each lease starts from an empty working directory
+        self.assertEqual(list(first.workdir.iterdir()), [])
+        self.assertEqual(self.backend.execute(HELLO, 'cpp', 'b\n')['output'], 'hi b\n')
+        replacement = pool._idle.queue[0]
+        self.assertIsNot(replacement, first)
+        self.assertIsNotNone(first.process.poll())
+        self.assertFalse(first.workdir.exists())
+        stats = self.backend.stats()['pool']
+        self.assertEqual((stats['size'], stats['busy'], stats['idle'], stats['leases'], stats['recycles']), (1, 0, 1, 2, 1))
+        self.assertGreater(stats['utilization'], 0)
+
+    def test_a_dead_worker_is_replaced(self):
+        worker = self.backend.pool._idle.queue[0]
+        worker.process.kill()
+        worker.process.wait()
+        self.assertEqual(self.backend.execute(HELLO, 'cpp', 'x\n')['error_type'], 'api_error')
+        self.assertEqual(self.backend.execute(HELLO, 'cpp', 'y\n')['output'], 'hi y\n')
+        self.assertEqual(self.backend.stats()['pool']['failures'], 1)
+
+    def test_run_stage_errors_are_reported(self):
+        with mock.patch.object(self.backend, 'run', side_effect=OSError('Resource temporarily unavailable')):
+            result = self.backend.execute(HELLO, 'cpp', 'x\n')
+        self.assertEqual(result['error_type'], 'api_error')
+        self.assertIn('Resource temporarily unavailable', result['error'])
+
+    def test_a_worker_that_cannot_be_replaced_is_retried_later(self):
+        pool = self.backend.pool
+        pool._idle.queue[0].broken = True
+        with mock.patch('leetcode.services.execution.pool.SandboxWorker', side_effect=OSError('fork failed')):
+            self.assertEqual(self.backend.execute(HELLO, 'cpp', 'x\n')['output'], 'hi x\n')
+        self.assertEqual((pool.stats()['idle'], pool.stats()['missing'], pool.stats()['spawn_failures']), (0, 1, 1))
+        self.assertEqual(self.backend.execute(HELLO, 'cpp', 'y\n')['output'], 'hi y\n')
+        self.assertEqual((pool.stats()['idle'], pool.stats()['missing']), (1, 0))
+
+    def test_busy_pool_times_out(self):
+        pool = self.backend.pool
+        pool.wait_seconds = 0.1
+        with pool.lease():
+            result = self.backend.execute(HELLO, 'cpp')
+        self.assertEqual(result['error_type'], 'api_error')
+        self.assertEqual((pool.stats()['waits'], pool.stats()['timeouts']), (1, 1))
+
+
+class TestBinaryCache(SimpleTestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _binary(self, name, size):
+        path = self.directory / name
+        path.write_bytes(b'x' * size)
+        return path
+
+    def test_key_covers_source_flags_and_toolchain(self):
+        key = binary_key('int main(){}', ['-O2'], 'g++ 12')
+        self.assertEqual(key, binary_key('int main(){}', ['-O2'], 'g++ 12'))
+        self.assertNotEqual(key, binary_key('int main(){}', ['-O0'], 'g++ 12'))
+        self.assertNotEqual(key, binary_key('int main(){}', ['-O2'], 'g++ 13'))
+
+    def test_least_recently_used_binaries_are_evicted(self):
+        # 100-byte binaries take 132 bytes each with their digest
+        cache = BinaryCache(self.directory / 'cache', max_bytes=300)
+        for index, key in enumerate(('a', 'b', 'c')):
+            cache.store(key, self._binary(f'{key}.out', 100))
+            os.utime(cache.directory / f'{key}.bin', (1000 + index, 1000 + index))
+        # 'a' was evicted when 'c' pushed the cache past 300 bytes; reading 'b' makes 'c' the oldest
+        self.assertFalse(cache.fetch('a', self.directory / 'a.run'))
+        self.assertTrue(cache.fetch('b', self.directory / 'b.run'))
+        cache.store('d', self._binary('d.out', 100))
+        self.assertFalse((cache.directory / 'c.bin').exists())
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['bytes'], stats['hits'], stats['misses']), (2, 264, 1, 1))
+        self.assertEqual((stats['stores'], stats['evictions']), (4, 2))
+
+    def test_runs_get_a_copy_of_a_read_only_entry(self):
+        cache = BinaryCache(self.directory / 'cache', max_bytes=1024)
+        cache.store('a', self._binary('a.out', 100))
+        entry = cache.directory / 'a.bin'
+        self.assertEqual(entry.stat().st_mode & 0o777, 0o444)
+        fetched = self.directory / 'a.run'
+        self.assertTrue(cache.fetch('a', fetched))
+        self.assertEqual((fetched.read_bytes(), fetched.stat().st_mode & 0o777), (b'x' * 100, 0o755))
+        self.assertNotEqual(fetched.stat().st_ino, entry.stat().st_ino)
+        # What a run does to its copy never reaches the cache
+        fetched.write_bytes(b'tampered')
+        self.assertTrue(cache.fetch('a', self.directory / 'a2.run'))
+        self.assertEqual((self.directory / 'a2.run').read_bytes(), b'x' * 100)
+
+    def test_corrupt_entries_are_dropped(self):
+        cache = BinaryCache(self.directory / 'cache', max_bytes=1024)
+        cache.store('a', self._binary('a.out', 100))
+        entry = cache.directory / 'a.bin'
+        entry.chmod(0o644)
+        entry.write_bytes(entry.read_bytes()[:-10])
+        self.assertFalse(cache.fetch('a', self.directory / 'a.run'))
+        self.assertFalse(entry.exists())
+        self.assertFalse((self.directory / 'a.run').exists())
+        self.assertEqual((cache.stats()['corrupt'], cache.stats()['misses']), (1, 1))
+
+    @unittest.skipUnless(shutil.which('g++'), 'g++ is not installed')
+    def test_identical_source_skips_compilation(self):
+        backend = LocalBackend(binary_cache=BinaryCache(self.directory, 64 * 1024 * 1024), pool=None)
+        self.assertEqual(backend.execute(HELLO, 'cpp', 'a\n')['output'], 'hi a\n')
+        with mock.patch.object(backend, 'compile') as compile_:
+            self.assertEqual(backend.execute(HELLO, 'cpp', 'b\n')['output'], 'hi b\n')
+        compile_.assert_not_called()
+        stats = backend.stats()['binary_cache']
+        self.assertEqual((stats['hits'], stats['misses'], stats['stores'], stats['entries']), (1, 1, 1, 1))
+
+
+class TestResultCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches['results'].clear()
+        tiered_cache.clear_local()
+        self.backend = mock.Mock(spec=ExecutionBackend, **{'fingerprint.return_value': 'fake:5'})
+        patcher = mock.patch.object(execution, 'get_backend', return_value=self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_identical_runs_reach_the_executor_once(self):
+        self.backend.execute.return_value = execution.success('hi a\n')
+        first = execution.execute(HELLO, 'cpp', 'a\n')
+        first['output'] = 'changed by the caller'
+        second = execution.execute(HELLO, 'cpp', 'a\n')
+        self.assertEqual(second, execution.success('hi a\n'))
+        self.backend.execute.assert_called_once_with(HELLO, 'cpp', 'a\n')
+
+        # Another test set, or another executor version, is another run
+        execution.execute(HELLO, 'cpp', 'b\n')
+        self.backend.fingerprint.return_value = 'fake:6'
+        execution.execute(HELLO, 'cpp', 'a\n')
+        self.assertEqual(self.backend.execute.call_count, 3)
+
+    def test_other_processes_share_results(self):
+        self.backend.execute.return_value = execution.failure("'x' was not declared", 'compilation_error')
+        execution.execute(HELLO, 'cpp')
+        tiered_cache.clear_local()
+        self.assertEqual(execution.execute(HELLO, 'cpp')['error_type'], 'compilation_error')
+        self.backend.execute.assert_called_once()
+
+    def test_unavailable_and_load_dependent_results_are_not_kept(self):
+        for result in (None, execution.failure('Time limit exceeded', 'timeout_error'),
+                       execution.failure('Daily limit reached', 'api_error')):
+            with self.subTest(result=result):
+                self.backend.execute.reset_mock()
+                self.backend.execute.return_value = result
+                self.assertEqual(execution.execute(HELLO, 'cpp'), result)
+                self.assertEqual(execution.execute(HELLO, 'cpp'), result)
+                self.assertEqual(self.backend.execute.call_count, 2)
+
+    def test_results_are_kept_apart_from_the_default_cache(self):
+        self.backend.execute.return_value = execution.success('hi')
+        execution.execute(HELLO, 'cpp')
+        self.assertEqual(tiered_cache.results().alias, 'results')
+        key = tiered_cache.results()._l2_key(result_cache.result_key(HELLO, 'cpp', '', 'fake:5'))
+        self.assertIsNotNone(caches['results'].get(key))
+        self.assertIsNone(cache.get(key))
+
+    @override_settings(LEETCODE_RESULT_CACHE_MAX_OUTPUT_BYTES=16)
+    def test_large_outputs_are_not_kept(self):
+        self.backend.execute.return_value = execution.success('x' * 17)
+        execution.execute(HELLO, 'cpp')
+        execution.execute(HELLO, 'cpp')
+        self.assertEqual(self.backend.execute.call_count, 2)
+
+    @override_settings(LEETCODE_RESULT_CACHE_SIZE=0)
+    def test_disabled(self):
+        self.backend.execute.return_value = execution.success('hi')
+        execution.execute(HELLO, 'cpp')
+        execution.execute(HELLO, 'cpp')
+        self.assertEqual(self.backend.execute.call_count, 2)
+
+
+class TestConcurrentResults(TransactionTestCase):
+    def setUp(self):
+        caches['results'].clear()
+        tiered_cache.clear_local()
+        self.backend = mock.Mock(spec=ExecutionBackend, **{'fingerprint.return_value': 'fake:5'})
+        patcher = mock.patch.object(execution, 'get_backend', return_value=self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_identical_runs_share_a_failure(self):
+        release = threading.Event()
+
+        def slow(*args):
+            release.wait(5)
+            return execution.failure('Process terminated by SIGSEGV', 'runtime_error')
+
+        self.backend.execute.side_effect = slow
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(execution.execute, HELLO, 'cpp') for _ in range(2)]
+            time.sleep(0.2)
+            release.set()
+            results = [f.result(timeout=5) for f in futures]
+        self.assertEqual([r['error_type'] for r in results], ['runtime_error'] * 2)
+        self.backend.execute.assert_called_once()
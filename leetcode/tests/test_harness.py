@@ -0,0 +1,140 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from leetcode.services import harness
+from leetcode.services.cpp_signature import parse_type
+from mysite import views as project_views
+
+TWO_SUM_SIGNATURE = {
+    'return_type': 'vector<int>',
+    'parameters': [{'type': 'vector<int>&', 'name': 'nums'}, {'type': 'int', 'name': 'target'}],
+    'method_name': 'twoSum',
+}
+TWO_SUM_CODE = '''#include <algorithm>
+class Solution {
+public:
+    vector<int> twoSum(vector<int>& nums, int target) {
+        for (int i = 0; i < (int)nums.size(); i++)
+            for (int j = i + 1; j < (int)nums.size(); j++)
+                if (nums[i] + nums[j] == target) return {i, j};
+        return {};
+    }
+};'''
+
+
+def _run(script, stdin):
+    with tempfile.TemporaryDirectory() as workdir:
+        source, binary = Path(workdir, 'main.cpp'), Path(workdir, 'main')
+        source.write_text(script)
+        subprocess.run(['g++', '-std=c++17', '-o', str(binary), str(source)], check=True, capture_output=True)
+        return subprocess.run([str(binary)], input=stdin, capture_output=True, text=True, check=True).stdout
+
+
+class TestHarnessGeneration(SimpleTestCase):
+    def setUp(self):
+        harness.clear()
+
+    def test_group_test_cases_strips_names(self):
+        cases = harness.group_test_cases('nums = [2,7,11,15]\n9\n[0,1]\n[3,2,4]\n\n[1,2]\n[3,3]\n6', ['nums', 'target'])
+        # Incomplete groups are skipped, as parse_typed_test_cases skips them
+        self.assertEqual(cases, [(['[2,7,11,15]', '9'], '[0,1]')])
+        self.assertEqual(harness.harness_stdin(cases), '[2,7,11,15]\n9\n[0,1]\n')
+
+    def test_source_does_not_grow_with_test_cases(self):
+        few = project_views.generate_stdin_cpp_wrapper(TWO_SUM_CODE, '1', TWO_SUM_SIGNATURE, '[1,2]\n3\n[0,1]')
+        many = project_views.generate_stdin_cpp_wrapper(
+            TWO_SUM_CODE, '1', TWO_SUM_SIGNATURE, '\n'.join(f'[{i},{i}]\n{2 * i}\n[0,1]' for i in range(500)),
+        )
+        self.assertEqual(few[0], many[0])
+        self.assertEqual(many[1].count('\n'), 1500)
+
+    def test_template_is_cached_per_problem_signature_and_test_set(self):
+        testcases = '[2,7,11,15]\n9\n[0,1]'
+        first = project_views.generate_stdin_cpp_wrapper(TWO_SUM_CODE, '1', TWO_SUM_SIGNATURE, testcases)
+        other_code = TWO_SUM_CODE.replace('return {};', 'return {-1, -1};')
+        with mock.patch.object(harness, 'harness_source', wraps=harness.harness_source) as build:
+            second = project_views.generate_stdin_cpp_wrapper(other_code, '1', TWO_SUM_SIGNATURE, testcases)
+            build.assert_not_called()
+            project_views.generate_stdin_cpp_wrapper(other_code, '1', TWO_SUM_SIGNATURE, testcases + '\n[1,2]\n3\n[0,1]')
+            build.assert_called_once()
+        self.assertEqual(first[0].replace(TWO_SUM_CODE, other_code), second[0])
+        self.assertEqual(first[1], second[1])
+        stats = harness.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 2, 2))
+        self.assertAlmostEqual(stats['hit_rate'], 1 / 3)
+
+    def test_template_is_not_shared_between_question_ids(self):
+        testcases = '[2,7,11,15]\n9\n[0,1]'
+        project_views.generate_stdin_cpp_wrapper(TWO_SUM_CODE, '1', TWO_SUM_SIGNATURE, testcases)
+        script, _ = project_views.generate_stdin_cpp_wrapper(TWO_SUM_CODE, '9001', TWO_SUM_SIGNATURE, testcases)
+        self.assertIn('Problem 9001', script)
+        self.assertNotIn('Problem 1 ', script)
+
+    def test_unsupported_signature_is_cached_as_none(self):
+        signature = {'return_type': 'Node*', 'parameters': [{'type': 'Node*', 'name': 'head'}], 'method_name': 'copy'}
+        for _ in range(2):
+            self.assertIsNone(project_views.generate_stdin_cpp_wrapper('', '138', signature, '[[1,null]]\n[[1,null]]'))
+        self.assertEqual(harness.stats()['hits'], 1)
+
+    def test_unsupported_types_fall_back(self):
+        for signature in (
+            {'return_type': 'Node*', 'parameters': [{'type': 'Node*', 'name': 'head'}], 'method_name': 'copy'},
+            {'return_type': 'int', 'parameters': [{'type': 'unordered_map<int, int>', 'name': 'm'}], 'method_name': 'f'},
+            {'return_type': 'void', 'parameters': [], 'method_name': 'f'},
+        ):
+            with self.subTest(signature=signature['method_name']):
+                self.assertIsNone(harness.harness_source('1', signature))
+        self.assertTrue(harness.supported(parse_type('vector<ListNode*>')))
+
+    def test_parse_report(self):
+        output = ('=== Test Cases for Problem 1 ===\nTest Case 1:\n  Input: s = "a"\n  Expected: 1\n  Your Output: 1\n'
+                  '  ✓ PASSED\n\nTest Case 2:\n  Input: s = ""\n  Expected: 0\n  Your Output: 1\n  ✗ FAILED\n\n'
+                  'Result: 1/2 test cases passed\n')
+        self.assertEqual(harness.parse_report(output), [
+            {'case': 1, 'passed': True, 'input': 's = "a"', 'expected': '1', 'output': '1'},
+            {'case': 2, 'passed': False, 'input': 's = ""', 'expected': '0', 'output': '1'},
+        ])
+        self.assertEqual(harness.parse_report('Compilation failed'), [])
+
+    def test_program_for_code_with_main_is_unchanged(self):
+        code = 'int main() { return 0; }'
+        self.assertEqual(project_views.generate_cpp_program_jdoodle(code, '1', bundle=None), (code, ''))
+
+
+@unittest.skipUnless(shutil.which('g++'), 'g++ is not installed')
+class TestHarnessExecution(SimpleTestCase):
+    def test_judges_cases_from_stdin(self):
+        script, stdin = project_views.generate_stdin_cpp_wrapper(
+            TWO_SUM_CODE, '1', TWO_SUM_SIGNATURE, '[2,7,11,15]\n9\n[0, 1]\n[3,2,4]\n6\n[0,2]',
+        )
+        output = _run(script, stdin)
+        self.assertIn('Your Output: [0,1]\n  ✓ PASSED', output)
+        self.assertIn('Expected: [0,2]\n  Your Output: [1,2]\n  ✗ FAILED', output)
+        self.assertIn('Result: 1/2 test cases passed', output)
+
+    def test_nodes_strings_and_in_place_results(self):
+        programs = [
+            ('class Solution {\npublic:\n    TreeNode* invertTree(TreeNode* root) {\n'
+             '        if (root) { swap(root->left, root->right); invertTree(root->left); invertTree(root->right); }\n'
+             '        return root;\n    }\n};', 'invertTree', '[4,2,7,1,3,null,9]\n[4,7,2,9,null,3,1]'),
+            ('class Solution {\npublic:\n    ListNode* middleNode(ListNode* head) {\n'
+             '        ListNode *slow = head, *fast = head;\n'
+             '        while (fast && fast->next) { slow = slow->next; fast = fast->next->next; }\n'
+             '        return slow;\n    }\n};', 'middleNode', '[1,2,3,4,5]\n[3,4,5]'),
+            ('class Solution {\npublic:\n    void reverseString(vector<char>& s) {\n'
+             '        for (int i = 0, j = (int)s.size() - 1; i < j; i++, j--) swap(s[i], s[j]);\n    }\n};',
+             'reverseString', '["h","i"]\n["i","h"]'),
+            ('class Solution {\npublic:\n    string quote(string s, double x) { return "\\"" + s + "\\""; }\n};',
+             'quote', '"a\\\\b"\n1.5\n"\\"a\\\\b\\""'),
+        ]
+        for code, method_name, testcases in programs:
+            with self.subTest(method=method_name):
+                signature = project_views.detect_function_signature(code, method_name)
+                script, stdin = project_views.generate_stdin_cpp_wrapper(code, '1', signature, testcases)
+                self.assertIn('Result: 1/1 test cases passed', _run(script, stdin))
@@ -0,0 +1,28 @@
+import threading
+
+import requests
+from django.test import SimpleTestCase
+
+from leetcode.services.http_client import HttpClient, get_http_client
+
+
+class TestHttpClient(SimpleTestCase):
+    def test_shared_singleton(self):
+        self.assertIs(get_http_client(), get_http_client())
+
+    def test_threads_share_adapter_but_not_sessions(self):
+        client = HttpClient()
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(client._session()))
+        thread.start()
+        thread.join()
+        main_session = client._session()
+        self.assertIsNot(sessions[0], main_session)
+        self.assertIs(sessions[0].get_adapter('https://leetcode.com'), main_session.get_adapter('https://leetcode.com'))
+
+    def test_failed_requests_are_counted_per_host(self):
+        client = HttpClient()
+        with self.assertRaises(requests.exceptions.RequestException):
+            client.post('http://127.0.0.1:9/graphql', json={}, timeout=1)
+        self.assertEqual(client.metrics()['127.0.0.1:9']['requests'], 1)
+        self.assertEqual(client.metrics()['127.0.0.1:9']['errors'], 1)
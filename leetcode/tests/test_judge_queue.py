@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from leetcode.models import JudgeJob
+from leetcode.services import judge_queue
+
+RESULT = {'success': True, 'output': 'Result: 2/2 test cases passed', 'error': '', 'statusCode': 0,
+          'memory': '1', 'cpuTime': '0.01'}
+
+
+@override_settings(LEETCODE_JUDGE_MODE='worker')
+class TestJudgeQueue(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('runner', password='pw')
+        self.client.force_login(self.user)
+
+    def _compile(self, code='int main() {}'):
+        return self.client.post(reverse('leetcode:compile_code'), data={'code': code, 'question_id': '1'},
+                                content_type='application/json')
+
+    def test_compile_returns_a_job_and_status_follows_it(self):
+        resp = self._compile()
+        self.assertEqual(resp.status_code, 202)
+        job_id = resp.json()['job_id']
+        status_url = resp.json()['status_url']
+        self.assertEqual(status_url, reverse('leetcode:judge_job_status', args=[job_id]))
+        self.assertEqual(self.client.get(status_url).json(),
+                         {'job_id': job_id, 'status': 'queued', 'queue_position': 0, 'status_url': status_url})
+
+        with mock.patch('leetcode.views.execute_code_jdoodle', return_value=RESULT) as run:
+            job = judge_queue.claim_next()
+            judge_queue.execute(job)
+        run.assert_called_once_with('int main() {}', 'cpp', '1', None)
+        data = self.client.get(status_url).json()
+        self.assertEqual((data['status'], data['result']), ('done', RESULT))
+
+    def test_jobs_are_private_to_their_user(self):
+        job_id = self._compile().json()['job_id']
+        other = User.objects.create_user('other', password='pw')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(reverse('leetcode:judge_job_status', args=[job_id])).status_code, 404)
+
+    def test_a_job_is_claimed_once(self):
+        job = judge_queue.submit('leetcode', 'code', user=self.user)
+        self.assertIsNotNone(judge_queue.claim(job.pk))
+        self.assertIsNone(judge_queue.claim(job.pk))
+        self.assertIsNone(judge_queue.claim_next())
+
+    def test_failures_are_recorded(self):
+        job = judge_queue.submit('leetcode', 'code')
+        with mock.patch('leetcode.views.execute_code_jdoodle', side_effect=RuntimeError('boom')):
+            judge_queue.execute(judge_queue.claim(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, JudgeJob.FAILED)
+        self.assertEqual(job.error, 'RuntimeError: boom')
+        self.assertFalse(job.result['success'])
+        with mock.patch('leetcode.views.execute_code_jdoodle', return_value=None):
+            unavailable = judge_queue.execute(judge_queue.claim(judge_queue.submit('leetcode', 'code').pk))
+        self.assertEqual(unavailable.result['error_type'], 'api_error')
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = judge_queue.submit('leetcode', 'code')
+        judge_queue.claim(job.pk)
+        JudgeJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(minutes=10))
+        self.assertEqual(judge_queue.requeue_stale(timedelta(minutes=2)), 1)
+        self.assertEqual(JudgeJob.objects.get(pk=job.pk).status, JudgeJob.QUEUED)
+
+    def test_a_run_taken_over_after_requeueing_does_not_overwrite_the_job(self):
+        job = judge_queue.submit('leetcode', 'code')
+        slow = judge_queue.claim(job.pk)
+        JudgeJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(minutes=10))
+        slow.refresh_from_db()
+        judge_queue.requeue_stale(timedelta(minutes=2))
+        current = judge_queue.claim(job.pk)
+        with mock.patch('leetcode.views.execute_code_jdoodle', return_value={**RESULT, 'output': 'stale'}):
+            self.assertEqual(judge_queue.execute(slow).status, JudgeJob.RUNNING)
+        with mock.patch('leetcode.views.execute_code_jdoodle', return_value=RESULT):
+            judge_queue.execute(current)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (JudgeJob.DONE, RESULT))
+
+    def test_old_finished_jobs_are_purged(self):
+        old_done, old_queued, recent_done = (judge_queue.submit('leetcode', 'code') for _ in range(3))
+        JudgeJob.objects.filter(pk=old_done.pk).update(status=JudgeJob.DONE)
+        JudgeJob.objects.filter(pk=recent_done.pk).update(status=JudgeJob.DONE)
+        JudgeJob.objects.filter(pk__in=[old_done.pk, old_queued.pk]).update(created_at=timezone.now() - timedelta(days=8))
+        with override_settings(LEETCODE_JUDGE_RETENTION_SECONDS=7 * 24 * 3600):
+            self.assertEqual(judge_queue.purge_finished(), 1)
+        self.assertEqual(set(JudgeJob.objects.values_list('pk', flat=True)), {old_queued.pk, recent_done.pk})
+        with override_settings(LEETCODE_JUDGE_RETENTION_SECONDS=0):
+            JudgeJob.objects.update(status=JudgeJob.DONE)
+            self.assertEqual(judge_queue.purge_finished(), 0)
+
+    def test_sweep_runs_jobs_left_queued_by_a_restart(self):
+        job = judge_queue.submit('leetcode', 'code')
+        with mock.patch('leetcode.views.execute_code_jdoodle', return_value=RESULT):
+            self.assertEqual(judge_queue.sweep(), 1)
+        self.assertEqual(JudgeJob.objects.get(pk=job.pk).status, JudgeJob.DONE)
+
+    def test_thread_mode_starts_one_sweeper_per_process(self):
+        self.addCleanup(setattr, judge_queue, '_sweeper', None)
+        with mock.patch.object(judge_queue.threading, 'Thread') as thread:
+            judge_queue.ensure_sweeper()
+            self.assertIsNone(judge_queue._sweeper)  # worker mode: the worker command sweeps
+            with override_settings(LEETCODE_JUDGE_MODE='thread'):
+                judge_queue.ensure_sweeper()
+                judge_queue.ensure_sweeper()
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+    def test_unknown_runner_is_rejected(self):
+        with self.assertRaises(ValueError):
+            judge_queue.submit('os.system', 'rm -rf /')
+
+    @override_settings(LEETCODE_JUDGE_MODE='eager')
+    def test_eager_mode_answers_with_the_result(self):
+        with mock.patch('leetcode.views.execute_code_jdoodle', return_value=RESULT):
+            data = self._compile().json()
+        self.assertEqual((data['status'], data['result']), ('done', RESULT))
+
+
+@override_settings(LEETCODE_JUDGE_MODE='worker')
+class TestJudgeWorkers(TransactionTestCase):
+    # Worker threads use their own connections, so the jobs must be committed
+    def test_worker_command_drains_the_queue(self):
+        for _ in range(3):
+            judge_queue.submit('leetcode', 'code')
+        out = StringIO()
+        with mock.patch('leetcode.views.execute_code_jdoodle', return_value=RESULT):
+            call_command('run_judge_workers', '--once', '--workers', '1', stdout=out)
+        self.assertIn('Executed 3 jobs', out.getvalue())
+        self.assertEqual(JudgeJob.objects.filter(status=JudgeJob.DONE).count(), 3)
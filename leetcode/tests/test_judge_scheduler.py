@@ -0,0 +1,146 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from leetcode.models import JudgeJob
+from leetcode.services import judge_queue, judge_scheduler
+
+
+@override_settings(LEETCODE_JUDGE_MODE='worker', LEETCODE_JUDGE_USER_MAX_PENDING=10, LEETCODE_JUDGE_USER_MAX_RUNNING=1,
+                   LEETCODE_JUDGE_MAX_RUNNING=8)
+class TestJudgeScheduler(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user('alice')
+        self.bob = User.objects.create_user('bob')
+
+    def _submit(self, user, code='code'):
+        return judge_queue.submit('leetcode', code, user=user)
+
+    def _finish(self, job):
+        JudgeJob.objects.filter(pk=job.pk).update(status=JudgeJob.DONE)
+
+    def test_flows_are_interleaved(self):
+        alice_jobs = [self._submit(self.alice, f'a{i}') for i in range(3)]
+        bob_job = self._submit(self.bob, 'b0')
+        order = []
+        with override_settings(LEETCODE_JUDGE_USER_MAX_RUNNING=5):
+            while (job := judge_queue.claim_next()) is not None:
+                order.append(job.code)
+                self._finish(job)
+        # Bob's single run goes right after Alice's first, not behind her whole burst
+        self.assertEqual(order, ['a0', 'b0', 'a1', 'a2'])
+        self.assertEqual(judge_queue.payload(JudgeJob.objects.get(pk=alice_jobs[2].pk))['status'], 'done')
+        self.assertEqual(bob_job.fair_start, alice_jobs[0].fair_start)
+
+    def test_weight_gives_a_larger_share(self):
+        with override_settings(LEETCODE_JUDGE_STAFF_WEIGHT=2.0):
+            self.alice.is_staff = True
+            self.alice.save()
+            for i in range(4):
+                self._submit(self.alice, f'a{i}')
+            for i in range(2):
+                self._submit(self.bob, f'b{i}')
+        order = []
+        with override_settings(LEETCODE_JUDGE_USER_MAX_RUNNING=5):
+            while (job := judge_queue.claim_next()) is not None:
+                order.append(job.code)
+                self._finish(job)
+        self.assertEqual(order, ['a0', 'b0', 'a1', 'a2', 'b1', 'a3'])
+
+    def test_per_user_running_cap(self):
+        self._submit(self.alice, 'a0')
+        self._submit(self.alice, 'a1')
+        self._submit(self.bob, 'b0')
+        first = judge_queue.claim_next()
+        second = judge_queue.claim_next()
+        self.assertEqual((first.code, second.code), ('a0', 'b0'))
+        # Alice's second run waits for her first even though a worker is free
+        self.assertIsNone(judge_queue.claim_next())
+        self._finish(first)
+        self.assertEqual(judge_queue.claim_next().code, 'a1')
+
+    @override_settings(LEETCODE_JUDGE_MAX_RUNNING=1)
+    def test_global_running_limit(self):
+        self._submit(self.alice)
+        self._submit(self.bob)
+        first = judge_queue.claim_next()
+        self.assertIsNotNone(first)
+        self.assertIsNone(judge_queue.claim_next())
+        # The limit is also enforced by the claiming UPDATE itself, for workers racing past the pre-check
+        queued = JudgeJob.objects.get(status=JudgeJob.QUEUED)
+        self.assertIsNone(judge_scheduler.claim_fair(queued.pk, queued.flow, 'w'))
+        self._finish(first)
+        self.assertIsNotNone(judge_scheduler.claim_fair(queued.pk, queued.flow, 'w'))
+
+    def test_claims_take_an_advisory_lock_on_postgres(self):
+        self._submit(self.alice)
+        cursor = mock.MagicMock()
+        fake = mock.Mock(vendor='postgresql', cursor=mock.Mock(return_value=cursor))
+        with mock.patch.object(judge_scheduler, 'connection', fake), \
+                mock.patch.object(judge_scheduler.transaction, 'atomic') as atomic:
+            self.assertIsNotNone(judge_queue.claim_next())
+        atomic.assert_called_once()
+        cursor.__enter__.return_value.execute.assert_called_once_with(
+            'SELECT pg_advisory_xact_lock(%s)', [judge_scheduler.CLAIM_LOCK],
+        )
+
+    def test_orphaned_running_job_is_requeued_by_the_sweep(self):
+        orphan = self._submit(self.alice, 'a0')
+        self._submit(self.alice, 'a1')
+        self.assertEqual(judge_queue.claim_next().pk, orphan.pk)
+        # Its process died: Alice's flow stays at its running cap until the sweep notices
+        JudgeJob.objects.filter(pk=orphan.pk).update(started_at=timezone.now() - timedelta(minutes=10))
+        self.assertIsNone(judge_queue.claim_next())
+        with override_settings(LEETCODE_JUDGE_STALE_SECONDS=120), \
+                mock.patch('leetcode.views.execute_code_jdoodle', return_value={'success': True}):
+            self.assertEqual(judge_queue.sweep(), 2)
+        self.assertEqual(JudgeJob.objects.filter(status=JudgeJob.DONE).count(), 2)
+
+    @override_settings(LEETCODE_JUDGE_RATE_LIMIT=2)
+    def test_rate_limit(self):
+        self._submit(self.alice)
+        self._submit(self.alice)
+        with self.assertRaises(judge_queue.Rejected):
+            self._submit(self.alice)
+        self.assertEqual(JudgeJob.objects.filter(user=self.alice).count(), 2)
+        self._submit(self.bob)
+
+    @override_settings(LEETCODE_JUDGE_USER_MAX_PENDING=1)
+    def test_rows_committed_out_of_timestamp_order_count_against_each_other(self):
+        # The later commit carries the earlier created_at (taken before its INSERT); it must still see the other row
+        self._submit(self.alice)
+        late = JudgeJob.objects.create(runner='leetcode', code='late', flow=judge_scheduler.flow_for(self.alice),
+                                       user=self.alice)
+        JudgeJob.objects.filter(pk=late.pk).update(created_at=timezone.now() - timedelta(seconds=1))
+        late.refresh_from_db()
+        with self.assertRaises(judge_queue.Rejected):
+            judge_scheduler.admit(late)
+        self.assertFalse(JudgeJob.objects.filter(pk=late.pk).exists())
+
+    @override_settings(LEETCODE_JUDGE_USER_MAX_PENDING=1)
+    def test_pending_cap_and_view(self):
+        self.client.force_login(self.alice)
+        url = reverse('leetcode:compile_code')
+        self.assertEqual(self.client.post(url, data={'code': 'x'}, content_type='application/json').status_code, 202)
+        resp = self.client.post(url, data={'code': 'y'}, content_type='application/json')
+        self.assertEqual(resp.status_code, 429)
+        self.assertIn('in progress', resp.json()['error'])
+
+    def test_stats(self):
+        self._submit(self.alice)
+        self._submit(self.bob)
+        judge_queue.claim_next()
+        stats = judge_scheduler.stats()
+        self.assertEqual((stats['queued'], stats['queued_flows'], stats['running']), (1, 1, 1))
+        self.assertEqual(stats['wait_seconds']['samples'], 1)
+        self.client.force_login(self.bob)
+        self.assertEqual(self.client.get(reverse('leetcode:judge_stats')).status_code, 403)
+        self.bob.is_staff = True
+        self.bob.save()
+        data = self.client.get(reverse('leetcode:judge_stats')).json()
+        self.assertEqual(data['queued'], 1)
+        self.assertIn('execution', data)
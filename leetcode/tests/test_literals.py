@@ -0,0 +1,71 @@
+import json
+
+from django.test import SimpleTestCase
+
+from leetcode.services import literals
+from mysite import views as project_views
+
+TWO_SUM_SIGNATURE = {
+    'return_type': 'vector<int>',
+    'parameters': [{'type': 'vector<int>&', 'name': 'nums'}, {'type': 'int', 'name': 'target'}],
+    'method_name': 'twoSum',
+}
+
+
+class TestLiteralParser(SimpleTestCase):
+    def test_parse_values(self):
+        self.assertEqual(literals.parse('[[1,2],[3, -4]]'), [[1, 2], [3, -4]])
+        self.assertEqual(literals.parse('["a\\"b", "c,d", "e]"]'), ['a"b', 'c,d', 'e]'])
+        self.assertEqual(literals.parse("[['5','.'],['3']]"), [['5', '.'], ['3']])
+        self.assertEqual(literals.parse('[true,false,null,1.5,2e3]'), [True, False, None, 1.5, 2000.0])
+        self.assertEqual(literals.parse('[1,null,2,#]'), [1, None, 2, '#'])
+        self.assertEqual(literals.parse('[007,NaN]'), [7, 'NaN'])
+        self.assertEqual(literals.parse(' [ ] '), [])
+        for bad in ('[1,,2]', '[1,2', '["a" "b"]', ''):
+            with self.subTest(bad=bad), self.assertRaises(literals.LiteralError):
+                literals.parse(bad)
+
+    def test_large_flat_array(self):
+        values = list(range(-50000, 50000))
+        self.assertEqual(literals.parse(json.dumps(values)), values)
+        self.assertEqual(literals.convert(json.dumps([str(v) for v in values]), 'vector<string>&')[-1], '49999')
+
+    def test_convert_coerces_to_type(self):
+        self.assertEqual(literals.convert('[2,7,11,15]', 'vector<int>&'), [2, 7, 11, 15])
+        self.assertEqual(literals.convert('[[1,2],[3]]', 'vector<vector<int>>&'), [[1, 2], [3]])
+        self.assertEqual(literals.convert('[[1.5],[2]]', 'vector<vector<double>>'), [[1.5], [2.0]])
+        self.assertEqual(literals.convert('"abc"', 'const string&'), 'abc')
+        self.assertEqual(literals.convert('abc', 'string'), 'abc')
+        self.assertEqual(literals.convert('7', 'string'), '7')
+        self.assertEqual(literals.convert('"x"', 'char'), 'x')
+        self.assertEqual(literals.convert(' 9 ', 'long long'), 9)
+        self.assertEqual(literals.convert('oops', 'int'), 0)
+        self.assertIs(literals.convert('true', 'bool'), True)
+        self.assertEqual(literals.convert('not a list', 'vector<int>'), [])
+        # Pointer and unknown types keep the source text for the harness to build
+        self.assertEqual(literals.convert('[3,9,20,null,null,15,7]', 'TreeNode*'), '[3,9,20,null,null,15,7]')
+        self.assertEqual(literals.convert('[1]', 'Node'), '[1]')
+
+    def test_parse_assignments(self):
+        self.assertEqual(
+            literals.parse_assignments('nums = [2,7,11,15], target = 9, s = "a, b = c"'),
+            [('nums', [2, 7, 11, 15], '[2,7,11,15]'), ('target', 9, '9'), ('s', 'a, b = c', '"a, b = c"')],
+        )
+
+    def test_view_helpers(self):
+        cases = project_views.parse_typed_test_cases('[2,7,11,15]\n9\n[0,1]\n[3,2,4]\n6\n[1,2]', TWO_SUM_SIGNATURE)
+        self.assertEqual([c['input_params'] for c in cases], [
+            {'nums': [2, 7, 11, 15], 'target': 9},
+            {'nums': [3, 2, 4], 'target': 6},
+        ])
+        self.assertEqual(cases[1]['expected_output'], [1, 2])
+        parsed = project_views.parse_parameters_from_string(
+            'nums = [2,7,11,15], target = 9', TWO_SUM_SIGNATURE['parameters'])
+        self.assertEqual(parsed, {'nums': [2, 7, 11, 15], 'target': 9})
+
+    def test_generated_strings_are_escaped(self):
+        parameters = [{'type': 'string', 'name': 's'}]
+        code = project_views.generate_typed_test_data(
+            [{'input_params': {'s': 'say "hi"'}, 'expected_output': 'a\\b'}], parameters, 'string', 'solve')
+        self.assertIn('string s_1 = "say \\"hi\\"";', code)
+        self.assertIn('string expected_1 = "a\\\\b";', code)
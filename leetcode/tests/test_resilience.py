@@ -0,0 +1,121 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from leetcode.services import resilience
+from leetcode.services.http_client import HttpClient
+from leetcode.services.leetcode_api import LeetCodeAPI
+from leetcode.services.resilience import CircuitBreaker, CircuitOpenError, Upstream
+
+
+class TestCircuitBreaker(SimpleTestCase):
+    def test_opens_after_threshold_and_probes_once(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, resilience.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow_request())  # the half-open probe
+        self.assertFalse(breaker.allow_request())  # everyone else still fails fast
+        breaker.record_success()
+        self.assertEqual(breaker.state, resilience.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow_request())
+
+    def test_inconclusive_probe_lets_the_next_one_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow_request())
+        breaker.record_inconclusive()
+        self.assertEqual(breaker.state, resilience.HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+
+    def test_backoff_has_full_jitter_and_cap(self):
+        delays = [resilience.backoff_delay(10, base=0.2, cap=2.0) for _ in range(50)]
+        self.assertTrue(all(0 <= d <= 2.0 for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_timeout_follows_latency_percentile(self):
+        upstream = Upstream('example', min_samples=10, timeout_multiplier=3, min_timeout=0.1)
+        self.assertEqual(upstream.timeout(15), 15)
+        for _ in range(20):
+            upstream.latency.record(0.2)
+        self.assertAlmostEqual(upstream.timeout(15), 0.6)
+        # Never above the caller's ceiling
+        self.assertEqual(upstream.timeout(0.5), 0.5)
+
+
+class TestHttpClientBreaker(SimpleTestCase):
+    def setUp(self):
+        resilience.reset()
+        self.addCleanup(resilience.reset)
+
+    def test_open_circuit_fails_fast_without_sending(self):
+        client = HttpClient(adaptive_timeout_hosts=['down.test'])
+        session = mock.Mock()
+        session.request.side_effect = OSError('unreachable')
+        with self.settings(OUTBOUND_BREAKER_FAILURES=2), mock.patch.object(client, '_session', return_value=session):
+            for _ in range(2):
+                with self.assertRaises(OSError):
+                    client.get('https://down.test/')
+            with self.assertRaises(CircuitOpenError):
+                client.get('https://down.test/')
+        self.assertEqual(session.request.call_count, 2)
+
+    def test_client_errors_neither_close_the_breaker_nor_feed_latency(self):
+        client = HttpClient(adaptive_timeout_hosts=['flaky.test'])
+        session = mock.Mock()
+        session.request.side_effect = [OSError('unreachable'), mock.Mock(status_code=404), mock.Mock(status_code=200)]
+        upstream = resilience.get_upstream('flaky.test')
+        with self.settings(OUTBOUND_BREAKER_FAILURES=2), mock.patch.object(client, '_session', return_value=session):
+            with self.assertRaises(OSError):
+                client.get('https://flaky.test/')
+            client.get('https://flaky.test/missing')
+            self.assertEqual(upstream.breaker._failures, 1)
+            self.assertEqual(len(upstream.latency), 0)
+            client.get('https://flaky.test/')
+        self.assertEqual(upstream.breaker._failures, 0)
+        self.assertEqual(len(upstream.latency), 1)
+
+    def test_throttling_counts_as_failure(self):
+        client = HttpClient()
+        session = mock.Mock()
+        session.request.return_value = mock.Mock(status_code=429)
+        with self.settings(OUTBOUND_BREAKER_FAILURES=2), mock.patch.object(client, '_session', return_value=session):
+            client.get('https://busy.test/')
+            client.get('https://busy.test/')
+            with self.assertRaises(CircuitOpenError):
+                client.get('https://busy.test/')
+
+    def test_leetcode_api_does_not_retry_open_circuit(self):
+        with mock.patch('leetcode.services.http_client.post', side_effect=CircuitOpenError('open')) as post:
+            resp = LeetCodeAPI().fetch_problem_details('two-sum')
+        self.assertFalse(resp.ok)
+        self.assertEqual(resp.status_code, 503)
+        post.assert_called_once()
+
+
+class TestQuestionSelectionFallback(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_open_circuit_with_empty_catalog_fails_fast(self):
+        with mock.patch('leetcode.services.http_client.post', side_effect=CircuitOpenError('open')) as post, \
+                mock.patch('mysite.views.fetch_questions_alternative', return_value=[]):
+            resp = self.client.get(reverse('leetcode:question_selection'))
+        self.assertEqual(resp.context['questions'], [])
+        self.assertIn('open', resp.context['api_error'])
+        post.assert_called_once()
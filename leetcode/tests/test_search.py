@@ -0,0 +1,121 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from leetcode.models import ProblemTag
+from leetcode.services import catalog, search
+from leetcode.services.search import QuestionFilters
+
+
+ROWS = [
+    {'frontendQuestionId': '1', 'title': 'Two Sum', 'titleSlug': 'two-sum', 'difficulty': 'Easy', 'acRate': 50.0,
+     'topicTags': [{'name': 'Array'}, {'name': 'Hash Table'}]},
+    {'frontendQuestionId': '2', 'title': 'Add Two Numbers', 'titleSlug': 'add-two-numbers', 'difficulty': 'Medium',
+     'topicTags': [{'name': 'Linked List'}, {'name': 'Math'}]},
+    {'frontendQuestionId': '3', 'title': 'Longest Substring Without Repeating Characters',
+     'titleSlug': 'longest-substring-without-repeating-characters', 'difficulty': 'Medium',
+     'topicTags': [{'name': 'Hash Table'}, {'name': 'Sliding Window'}]},
+    {'frontendQuestionId': '4', 'title': 'Median of Two Sorted Arrays', 'titleSlug': 'median-of-two-sorted-arrays',
+     'difficulty': 'Hard', 'paidOnly': True, 'topicTags': [{'name': 'Array'}, {'name': 'Binary Search'}]},
+]
+
+
+def titles(filters, **kwargs):
+    return [p.title for p in search.search_problems(filters, **kwargs)[1]]
+
+
+class TestLocalSearch(TestCase):
+    def setUp(self):
+        cache.clear()
+        catalog.upsert_problems(ROWS)
+
+    def test_full_text_prefix_search_on_title_and_tags(self):
+        self.assertEqual(titles(QuestionFilters(search='two')), ['Two Sum', 'Add Two Numbers'])
+        self.assertEqual(titles(QuestionFilters(search='subst')), ['Longest Substring Without Repeating Characters'])
+        # Tags are indexed too
+        self.assertEqual(titles(QuestionFilters(search='sliding')), ['Longest Substring Without Repeating Characters'])
+
+    def test_filters_combine(self):
+        self.assertEqual(titles(QuestionFilters(difficulty='Medium', tag='Hash Table')),
+                         ['Longest Substring Without Repeating Characters'])
+        self.assertEqual(titles(QuestionFilters(tag='Array')), ['Two Sum'])
+        self.assertEqual(titles(QuestionFilters(tag='Array', include_paid=True)), ['Two Sum', 'Median of Two Sorted Arrays'])
+
+    def test_updates_reach_index_and_tag_rows(self):
+        catalog.upsert_problems([dict(ROWS[0], title='Three Sum', topicTags=[{'name': 'Two Pointers'}])])
+        self.assertEqual(titles(QuestionFilters(search='three')), ['Three Sum'])
+        # Old tags are gone from the index
+        self.assertEqual(titles(QuestionFilters(search='hash')), ['Longest Substring Without Repeating Characters'])
+        self.assertEqual(list(ProblemTag.objects.filter(problem_id=1).values_list('name', flat=True)), ['Two Pointers'])
+
+    def test_counts_are_cached_until_catalog_changes(self):
+        filters = QuestionFilters(difficulty='Medium')
+        self.assertEqual(search.count(filters), 2)
+        with mock.patch.object(search, 'filtered_queryset') as qs:
+            self.assertEqual(search.count(filters), 2)
+        qs.assert_not_called()
+        catalog.upsert_problems([{'frontendQuestionId': '5', 'title': 'Longest Palindromic Substring',
+                                  'titleSlug': 'longest-palindromic-substring', 'difficulty': 'Medium'}])
+        self.assertEqual(search.count(filters), 3)
+
+    def test_params_are_normalised(self):
+        filters = QuestionFilters.from_params({'difficulty': 'MEDIUM', 'search': ' two ', 'include_paid': 'on'})
+        self.assertEqual(filters, QuestionFilters(search='two', difficulty='Medium', include_paid=True))
+        self.assertEqual(QuestionFilters.from_params({'difficulty': 'bogus'}).difficulty, '')
+
+    def test_uses_fts_index_on_sqlite(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        self.assertTrue(search._has_fts_table())
+
+
+class TestQuestionSelectionView(TestCase):
+    def setUp(self):
+        cache.clear()
+        catalog.upsert_problems(ROWS)
+
+    def test_served_locally_without_upstream_call(self):
+        with mock.patch('leetcode.services.http_client.post') as post:
+            resp = self.client.get(reverse('leetcode:question_selection'), {'difficulty': 'MEDIUM', 'search': 'two', 'limit': 1})
+        post.assert_not_called()
+        self.assertEqual([q['title'] for q in resp.context['questions']], ['Add Two Numbers'])
+        self.assertEqual(resp.context['total_questions'], 1)
+        self.assertEqual(resp.context['current_difficulty'], 'MEDIUM')
+        self.assertIn('Hash Table', resp.context['available_tags'])
+        self.assertEqual(resp.context['filter_query'], 'difficulty=MEDIUM&search=two')
+
+
+class TestQuestionListAPI(TestCase):
+    def setUp(self):
+        cache.clear()
+        catalog.upsert_problems(ROWS)
+        self.url = reverse('leetcode:question_list_api')
+
+    def test_keyset_pages_walk_the_list(self):
+        first = self.client.get(self.url, {'limit': 2}).json()
+        self.assertEqual([r['id'] for r in first['results']], [1, 2])
+        self.assertEqual(first['next_cursor'], '2')
+        self.assertEqual(first['total'], 3)
+        second = self.client.get(self.url, {'limit': 2, 'cursor': first['next_cursor']}).json()
+        self.assertEqual([r['id'] for r in second['results']], [3])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_field_projection(self):
+        data = self.client.get(self.url, {'fields': 'tags,bogus', 'tag': 'Math'}).json()
+        self.assertEqual(data['fields'], ['id', 'tags'])
+        self.assertEqual(data['results'], [{'id': 2, 'tags': ['Linked List', 'Math']}])
+
+    def test_conditional_get_until_catalog_changes(self):
+        resp = self.client.get(self.url, {'difficulty': 'medium'})
+        etag = resp['ETag']
+        self.assertEqual(self.client.get(self.url, {'difficulty': 'medium'}, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # A different filter is a different representation
+        self.assertNotEqual(self.client.get(self.url, {'difficulty': 'easy'})['ETag'], etag)
+        catalog.upsert_problems([dict(ROWS[1], acRate=10.0)])
+        self.assertEqual(self.client.get(self.url, {'difficulty': 'medium'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'abc'}).status_code, 400)
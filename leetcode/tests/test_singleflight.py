@@ -0,0 +1,111 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+
+from leetcode.services import stampede
+from leetcode.services.leetcode_api import LeetCodeAPI, LeetCodeResponse
+from leetcode.services.singleflight import SingleFlight, request_key
+
+
+class TestSingleFlight(TestCase):
+    def test_concurrent_callers_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def slow():
+            calls.append(1)
+            release.wait(2)
+            return 'value'
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(flight.do, 'k', slow) for _ in range(5)]
+            # Let every caller reach the in-flight call before the leader finishes
+            deadline = time.monotonic() + 2
+            while flight.stats()['shared'] < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+            results = [f.result() for f in futures]
+
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats(), {'executions': 1, 'shared': 4, 'in_flight': 0})
+
+    def test_errors_propagate_and_are_not_remembered(self):
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do('k', lambda: (_ for _ in ()).throw(ValueError('boom')))
+        self.assertEqual(flight.do('k', lambda: 1), 1)
+
+    def test_request_key_ignores_variable_order(self):
+        a = {'query': 'q', 'variables': {'skip': 0, 'limit': 20}}
+        b = {'variables': {'limit': 20, 'skip': 0}, 'query': 'q'}
+        self.assertEqual(request_key(a), request_key(b))
+        self.assertNotEqual(request_key(a), request_key({'query': 'q', 'variables': {'skip': 20, 'limit': 20}}))
+
+    def test_leetcode_api_coalesces_identical_queries(self):
+        release = threading.Event()
+        calls = []
+
+        def upstream(self, payload):
+            calls.append(payload)
+            release.wait(2)
+            return LeetCodeResponse(ok=True, status_code=200, data={'data': {}})
+
+        with mock.patch.object(LeetCodeAPI, '_post_uncoalesced', upstream):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [pool.submit(LeetCodeAPI().fetch_problem_details, 'two-sum') for _ in range(4)]
+                time.sleep(0.1)
+                release.set()
+                self.assertTrue(all(f.result().ok for f in futures))
+        self.assertEqual(len(calls), 1)
+
+
+class TestStampede(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_value_is_computed_once_and_cached(self):
+        compute = mock.Mock(return_value={'a': 1})
+        self.assertEqual(stampede.get_or_compute('k', compute, timeout=60), {'a': 1})
+        self.assertEqual(stampede.get_or_compute('k', compute, timeout=60), {'a': 1})
+        compute.assert_called_once()
+
+    def test_none_is_not_cached(self):
+        compute = mock.Mock(return_value=None)
+        stampede.get_or_compute('k', compute, timeout=60)
+        stampede.get_or_compute('k', compute, timeout=60)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_expired_envelope_is_refreshed(self):
+        cache.set('k', {'value': 'old', 'delta': 0.0, 'expires': time.time() - 1}, 60)
+        self.assertEqual(stampede.get_or_compute('k', lambda: 'new', timeout=60), 'new')
+
+    def test_plain_values_from_before_envelopes_are_misses(self):
+        cache.set('k', {'title': 'cached before envelopes'}, 60)
+        self.assertIsNone(stampede.peek('k'))
+        self.assertEqual(stampede.get_or_compute('k', lambda: 'new', timeout=60), 'new')
+
+    def test_waiter_that_gives_up_keeps_the_holders_lock(self):
+        cache.add('k:lock', 'holder', 30)
+        with mock.patch.object(stampede, 'WAIT_TIMEOUT', 0.1):
+            self.assertEqual(stampede.get_or_compute('k', lambda: 'mine', timeout=60), 'mine')
+        self.assertEqual(cache.get('k:lock'), 'holder')
+
+    def test_waiters_stop_when_the_holder_stores_nothing(self):
+        cache.add('k:lock', 'holder', 30)
+        threading.Timer(0.2, cache.delete, ('k:lock',)).start()
+        started = time.monotonic()
+        self.assertEqual(stampede.get_or_compute('k', lambda: 'mine', timeout=60), 'mine')
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_stale_value_served_while_another_caller_refreshes(self):
+        cache.set('k', {'value': 'old', 'delta': 0.0, 'expires': time.time() - 1}, 60)
+        cache.add('k:lock', 1, 30)
+        compute = mock.Mock(return_value='new')
+        self.assertEqual(stampede.get_or_compute('k', compute, timeout=60), 'old')
+        compute.assert_not_called()
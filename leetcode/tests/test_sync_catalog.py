@@ -0,0 +1,73 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from leetcode.models import CatalogPage, Problem
+from leetcode.services.leetcode_api import LeetCodeAPI, LeetCodeResponse
+
+
+def make_rows(count):
+    return [
+        {'frontendQuestionId': str(i), 'title': f'Problem {i}', 'titleSlug': f'problem-{i}',
+         'difficulty': 'Easy', 'acRate': 50.0, 'paidOnly': False, 'topicTags': []}
+        for i in range(1, count + 1)
+    ]
+
+
+class FakeProblemset:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, api, search='', difficulty=None, skip=0, limit=20):
+        self.calls.append(skip)
+        data = {'data': {'problemsetQuestionList': {'total': len(self.rows), 'questions': self.rows[skip:skip + limit]}}}
+        return LeetCodeResponse(ok=True, status_code=200, data=data)
+
+
+class TestSyncLeetCodeCatalog(TestCase):
+    def sync(self, fake, *args):
+        with mock.patch.object(LeetCodeAPI, 'fetch_problemset', autospec=True, side_effect=fake):
+            call_command('sync_leetcode_catalog', '--page-size', '10', '--workers', '4', *args, stdout=StringIO())
+
+    def test_full_then_noop_sync(self):
+        fake = FakeProblemset(make_rows(45))
+        self.sync(fake)
+        self.assertEqual(Problem.objects.count(), 45)
+        self.assertEqual(CatalogPage.objects.count(), 5)
+        self.assertEqual(len(fake.calls), 5)
+
+        fake.calls.clear()
+        self.sync(fake)
+        # First page plus the old last page only
+        self.assertEqual(sorted(fake.calls), [0, 40])
+
+    def test_incremental_sync_fetches_new_pages(self):
+        fake = FakeProblemset(make_rows(45))
+        self.sync(fake)
+        fake.rows = make_rows(62)
+        fake.calls.clear()
+        self.sync(fake)
+        self.assertEqual(sorted(fake.calls), [0, 40, 50, 60])
+        self.assertEqual(Problem.objects.count(), 62)
+
+    def test_shifted_problemset_falls_back_to_full_sync(self):
+        fake = FakeProblemset(make_rows(50))
+        self.sync(fake)
+        # One problem removed mid-list and one appended: totalNum and page 0 are unchanged
+        fake.rows = [row for row in make_rows(51) if row['frontendQuestionId'] != '15']
+        fake.calls.clear()
+        self.sync(fake)
+        self.assertEqual(sorted(fake.calls), [0, 10, 20, 30, 40])
+        self.assertTrue(Problem.objects.filter(pk=51).exists())
+
+    def test_full_flag_refreshes_every_page(self):
+        fake = FakeProblemset(make_rows(45))
+        self.sync(fake)
+        fake.rows[35]['title'] = 'Renamed'
+        fake.calls.clear()
+        self.sync(fake, '--full')
+        self.assertEqual(len(fake.calls), 5)
+        self.assertEqual(Problem.objects.get(pk=36).title, 'Renamed')
@@ -0,0 +1,54 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from leetcode.services.tiered_cache import TwoTierCache
+
+
+class TestTwoTierCache(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_l1_then_l2_then_compute(self):
+        c = TwoTierCache('test', max_entries=4)
+        compute = mock.Mock(return_value={'title': 'Two Sum'})
+        self.assertEqual(c.get_or_compute('1', compute), {'title': 'Two Sum'})
+        self.assertEqual(c.get_or_compute('1', compute), {'title': 'Two Sum'})
+        # A fresh worker (empty L1) is served from the shared L2
+        other = TwoTierCache('test', max_entries=4)
+        self.assertEqual(other.get_or_compute('1', compute), {'title': 'Two Sum'})
+        compute.assert_called_once()
+        self.assertEqual(c.stats()['misses'], 1)
+        self.assertEqual(c.stats()['l1_hits'], 1)
+        self.assertEqual(other.stats()['l2_hits'], 1)
+
+    def test_lru_eviction_is_bounded_and_counted(self):
+        c = TwoTierCache('test', max_entries=2)
+        c.set('a', 1)
+        c.set('b', 2)
+        c.get('a')  # 'a' is now most recently used
+        c.set('c', 3)
+        stats = c.stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['evictions'], 1)
+        c.clear_local()
+        # Evicted from L1 but still in L2
+        self.assertEqual(c.get('b'), 2)
+
+    def test_l1_entries_expire(self):
+        c = TwoTierCache('test', max_entries=2, l1_ttl=0)
+        c.set('a', 1)
+        cache.clear()
+        time.sleep(0.01)
+        self.assertIsNone(c.get('a'))
+        self.assertEqual(c.stats()['expirations'], 1)
+        self.assertEqual(c.stats()['misses'], 1)
+
+    def test_none_is_not_cached(self):
+        c = TwoTierCache('test')
+        compute = mock.Mock(return_value=None)
+        c.get_or_compute('x', compute)
+        c.get_or_compute('x', compute)
+        self.assertEqual(compute.call_count, 2)
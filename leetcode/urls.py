@@ -6,10 +6,13 @@ app_name = 'leetcode'
 urlpatterns = [
     path('leetcode-home/', views.home, name='home'),
     path('pick-question/', views.question_selection, name='question_selection'),
+    path('api/questions/', views.question_list_api, name='question_list_api'),
     path('editor/', views.question_editor, name='question_editor'),
     path('editor/<str:question_id>/', views.question_editor, name='question_editor_with_id'),
     path('daily-question/', views.daily_question, name='daily_question'),
     path('compile/', views.compile_code, name='compile_code'),
+    path('compile/<uuid:job_id>/', views.judge_job_status, name='judge_job_status'),
+    path('api/judge/stats/', views.judge_stats, name='judge_stats'),
     path('fetch-cpp-template/', views.fetch_cpp_template, name='fetch_cpp_template'),
     path('save-code/', views.save_user_code, name='save_user_code'),
 ]
@@ -1,14 +1,19 @@
+import asyncio
+import hashlib
 import json
-import requests
+from urllib.parse import urlencode
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
+from django.urls import reverse
 from django.http import HttpRequest, HttpResponse, JsonResponse
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from django.core.cache import cache
 from mysite import views as project_views
-from django.conf import settings
-from .services.leetcode_api import LeetCodeAPI
+from .models import JudgeJob
+from .services import catalog, daily, execution, http_client, judge_queue, judge_scheduler, search, tiered_cache
+from .services.leetcode_api import AsyncLeetCodeAPI, LeetCodeAPI
 from polls.models import UserCodeSubmission, UserProfile
 
 
@@ -16,151 +21,43 @@ def home(request: HttpRequest) -> HttpResponse:
     return render(request, 'leetcode/home.html')
 
 
-def daily_question(request: HttpRequest) -> HttpResponse:
-    cache_key = "leetcode:daily_question"
-    cached = cache.get(cache_key)
-    context: dict[str, object]
-    if cached:
-        context = cached
-    else:
-        api = LeetCodeAPI()
-        api_error: str | None = None
-        is_real_question = False
-        daily: dict[str, object] = {
-            'title': 'Daily Question',
-            'date': '',
-            'difficulty': 'Medium',
-            'ac_rate': None,
-            'frontend_id': None,
-            'title_slug': '',
-            'link': '',
-            'description': 'Problem description not available',
-            'examples': [],
-            'constraints': [],
-            'example_testcases': '',
-            'template': '',
-            'cppTemplate': '',
-            'hasRealCppTemplate': False,
-        }
-
-        resp = api.fetch_daily_question()
-        if resp.ok and resp.data:
-            try:
-                active = resp.data['data']['activeDailyCodingChallengeQuestion']
-                daily['date'] = active.get('date') or ''
-                daily['link'] = active.get('link') or ''
-                q = active.get('question') or {}
-                daily['title'] = q.get('title') or daily['title']
-                daily['difficulty'] = q.get('difficulty') or daily['difficulty']
-                daily['ac_rate'] = q.get('acRate')
-                daily['frontend_id'] = q.get('frontendQuestionId')
-                title_slug = q.get('titleSlug') or ''
-                daily['title_slug'] = title_slug
-                is_real_question = True
-
-                # Enrich with problem details
-                if title_slug:
-                    details = api.fetch_problem_details(title_slug)
-                    if details.ok and details.data:
-                        dq = details.data['data']['question']
-                        content = dq.get('content') or ''
-                        daily['description'] = content
-                        samples = dq.get('exampleTestcaseList') or []
-                        ex_list = []
-                        for s in samples:
-                            # Heuristic split; LeetCode gives lines like "Input: ..., Output: ..."
-                            ex_list.append({'input': s, 'output': '', 'explanation': ''})
-                        daily['examples'] = ex_list
-                        daily['example_testcases'] = (dq.get('sampleTestCase') or '')
-                        daily['constraints'] = []
-                        # Templates
-                        cpp = None
-                        snippets = dq.get('codeSnippets') or []
-                        for sn in snippets:
-                            if sn.get('langSlug') == 'cpp':
-                                cpp = sn.get('code')
-                            if sn.get('langSlug') == 'python3' and not daily['template']:
-                                daily['template'] = sn.get('code') or ''
-                        if cpp:
-                            daily['cppTemplate'] = cpp
-                            daily['hasRealCppTemplate'] = True
-                        elif daily['template']:
-                            daily['cppTemplate'] = daily['template']
-            except Exception as exc:  # safety net for unexpected API schema
-                api_error = str(exc)
-        else:
-            api_error = resp.error or 'Failed to fetch daily question'
-
-        context = {
-            'daily_question': daily,
-            'is_real_question': is_real_question,
-            'api_error': api_error,
-        }
+async def daily_question(request: HttpRequest) -> HttpResponse:
+    # Served from cache (stale-while-revalidate); only a cold cache waits on LeetCode
+    context = await daily.aget_context()
+    return await sync_to_async(render)(request, 'leetcode/daily_question.html', context)
 
-        cache.set(cache_key, context, timeout=getattr(__import__('django.conf').conf.settings, 'LEETCODE_CACHE_TTL_SECONDS', 300))
 
-    return render(request, 'leetcode/daily_question.html', context)
-
-
-def question_selection(request: HttpRequest) -> HttpResponse:
-    """Question selection page with LeetCode problems from API (same approach as site)."""
+async def question_selection(request: HttpRequest) -> HttpResponse:
+    """Question selection page, served from the local problem catalog (indexed search and filters)."""
+    filters = search.QuestionFilters.from_params(request.GET)
     try:
-        page = int(request.GET.get('page', 1))
-        limit = int(request.GET.get('limit', 50))
-        skip = (page - 1) * limit
+        page = max(1, int(request.GET.get('page', 1)))
+        limit = max(1, min(int(request.GET.get('limit', 50)), 100))
+    except ValueError:
+        page, limit = 1, 50
+    skip = (page - 1) * limit
+
+    total_questions, problems = await sync_to_async(search.search_problems)(filters, skip, limit)
+    if total_questions or await sync_to_async(catalog.catalog_size)():
+        context = _selection_context(
+            _selection_rows([p.as_question_info() for p in problems], include_paid=True),
+            total_questions, page, limit, filters.difficulty.upper(), filters.search,
+            tag=filters.tag, include_paid=filters.include_paid,
+        )
+        context['available_tags'] = await sync_to_async(search.available_tags)()
+        return await sync_to_async(render)(request, 'leetcode/question_selection.html', context)
 
+    # The catalog has not been synced yet (see sync_leetcode_catalog): ask LeetCode directly
+    try:
         difficulty = request.GET.get('difficulty', '')
         search_term = request.GET.get('search', '')
 
-        url = 'https://leetcode.com/graphql'
-        headers = {
-            'Content-Type': 'application/json',
-            'Referer': 'https://leetcode.com/problemset/all/',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-
-        filters = {}
         # Difficulty is disabled to match stable behavior in site
-        # if difficulty:
-        #     filters['difficulty'] = difficulty
-        if search_term:
-            filters['searchKeywords'] = search_term
-
-        payload = {
-            'query': '''
-                query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
-                    problemsetQuestionList: questionList(
-                        categorySlug: $categorySlug
-                        limit: $limit
-                        skip: $skip
-                        filters: $filters
-                    ) {
-                        total: totalNum
-                        questions: data {
-                            acRate
-                            difficulty
-                            frontendQuestionId: questionFrontendId
-                            paidOnly: isPaidOnly
-                            title
-                            titleSlug
-                            topicTags { name }
-                        }
-                    }
-                }
-            ''',
-            'variables': {
-                'categorySlug': '',
-                'skip': skip,
-                'limit': min(limit, 50),
-                'filters': filters
-            }
-        }
+        api = AsyncLeetCodeAPI()
+        resp = await api.fetch_problemset(search=search_term, skip=skip, limit=min(limit, 50))
 
-        timeout = min(getattr(settings, 'LEETCODE_TIMEOUT_SECONDS', 10), 15)
-        response = requests.post(url, json=payload, headers=headers, timeout=timeout)
-
-        if response.status_code == 200:
-            data = response.json()
+        if resp.ok:
+            data = resp.data
             if data and isinstance(data, dict) and 'data' in data:
                 data_content = data.get('data')
                 if data_content and 'problemsetQuestionList' in data_content:
@@ -169,48 +66,8 @@ def question_selection(request: HttpRequest) -> HttpResponse:
                         total_questions = problemset_data.get('total', 0) if isinstance(problemset_data, dict) else 0
                         questions_data = problemset_data.get('questions', []) if isinstance(problemset_data, dict) else []
 
-                        questions = []
-                        if isinstance(questions_data, list):
-                            for q in questions_data:
-                                if q and isinstance(q, dict) and not q.get('paidOnly', False):
-                                    question_id = q.get('frontendQuestionId', '')
-                                    title = q.get('title', '')
-                                    q_difficulty = q.get('difficulty', '')
-                                    ac_rate = q.get('acRate', 0)
-                                    title_slug = q.get('titleSlug', '')
-                                    topic_tags = q.get('topicTags', [])
-                                    tags = []
-                                    if isinstance(topic_tags, list):
-                                        tags = [tag.get('name', '') for tag in topic_tags if tag and isinstance(tag, dict)]
-
-                                    if question_id and title:
-                                        questions.append({
-                                            'id': question_id,
-                                            'title': title,
-                                            'difficulty': q_difficulty,
-                                            'acceptance_rate': round(float(ac_rate) if ac_rate else 0, 1),
-                                            'title_slug': title_slug,
-                                            'tags': tags,
-                                            'leetcode_url': f"https://leetcode.com/problems/{title_slug}" if title_slug else ''
-                                        })
-
-                        total_pages = (total_questions + limit - 1) // limit if total_questions > 0 else 1
-                        has_previous = page > 1
-                        has_next = page < total_pages
-
-                        context = {
-                            'questions': questions,
-                            'current_page': page,
-                            'total_pages': total_pages,
-                            'total_questions': total_questions,
-                            'has_previous': has_previous,
-                            'has_next': has_next,
-                            'previous_page': page - 1 if has_previous else None,
-                            'next_page': page + 1 if has_next else None,
-                            'current_difficulty': difficulty,
-                            'current_search': search_term,
-                            'limit': limit
-                        }
+                        questions = _selection_rows(questions_data)
+                        context = _selection_context(questions, total_questions, page, limit, difficulty, search_term)
                     else:
                         raise Exception("problemsetQuestionList is None or empty")
                 else:
@@ -218,13 +75,12 @@ def question_selection(request: HttpRequest) -> HttpResponse:
             else:
                 raise Exception(f"Invalid response structure - missing data field: {data}")
         else:
-            error_text = response.text
-            raise Exception(f"API request failed with status {response.status_code}: {error_text}")
+            raise Exception(f"API request failed: {resp.error}")
 
     except Exception as e:
         try:
             # Reuse site's alternative fallback helper
-            questions = project_views.fetch_questions_alternative(page, limit, difficulty, search_term)
+            questions = await sync_to_async(project_views.fetch_questions_alternative, thread_sensitive=False)(page, limit, difficulty, search_term)
             if questions:
                 context = {
                     'questions': questions,
@@ -258,11 +114,105 @@ def question_selection(request: HttpRequest) -> HttpResponse:
                 'api_error': f"API methods failed. Primary: {str(e)[:100]}..., Alternative: {str(e2)[:100]}..."
             }
 
-    return render(request, 'leetcode/question_selection.html', context)
+    return await sync_to_async(render)(request, 'leetcode/question_selection.html', context)
+
+
+def _selection_rows(questions_data, include_paid: bool = False) -> list[dict[str, object]]:
+    """Template rows for a questionList-shaped list (free problems only unless include_paid)"""
+    questions = []
+    if isinstance(questions_data, list):
+        for q in questions_data:
+            if q and isinstance(q, dict) and (include_paid or not q.get('paidOnly', False)):
+                question_id = q.get('frontendQuestionId', '')
+                title = q.get('title', '')
+                q_difficulty = q.get('difficulty', '')
+                ac_rate = q.get('acRate', 0)
+                title_slug = q.get('titleSlug', '')
+                topic_tags = q.get('topicTags', [])
+                tags = []
+                if isinstance(topic_tags, list):
+                    tags = [tag.get('name', '') for tag in topic_tags if tag and isinstance(tag, dict)]
+
+                if question_id and title:
+                    questions.append({
+                        'id': question_id,
+                        'title': title,
+                        'difficulty': q_difficulty,
+                        'acceptance_rate': round(float(ac_rate) if ac_rate else 0, 1),
+                        'title_slug': title_slug,
+                        'tags': tags,
+                        'leetcode_url': f"https://leetcode.com/problems/{title_slug}" if title_slug else ''
+                    })
+    return questions
+
+
+def _selection_context(questions, total_questions, page, limit, difficulty, search_term,
+                       tag: str = '', include_paid: bool = False) -> dict[str, object]:
+    total_pages = (total_questions + limit - 1) // limit if total_questions > 0 else 1
+    has_previous = page > 1
+    has_next = page < total_pages
+    filter_params = {'difficulty': difficulty, 'search': search_term, 'tag': tag, 'include_paid': '1' if include_paid else ''}
+    return {
+        'current_tag': tag,
+        'include_paid': include_paid,
+        # Appended to pagination links so they keep the active filters
+        'filter_query': urlencode({k: v for k, v in filter_params.items() if v}),
+        'questions': questions,
+        'current_page': page,
+        'total_pages': total_pages,
+        'total_questions': total_questions,
+        'has_previous': has_previous,
+        'has_next': has_next,
+        'previous_page': page - 1 if has_previous else None,
+        'next_page': page + 1 if has_next else None,
+        'current_difficulty': difficulty,
+        'current_search': search_term,
+        'limit': limit
+    }
+
+
+def _question_list_params(request: HttpRequest):
+    """(filters, after, limit, fields) from the query string, or None if the cursor/limit are invalid"""
+    try:
+        after = max(0, int(request.GET.get('cursor') or 0))
+        limit = max(1, min(int(request.GET.get('limit') or 50), 200))
+    except ValueError:
+        return None
+    return search.QuestionFilters.from_params(request.GET), after, limit, search.parse_fields(request.GET.get('fields', ''))
+
+
+def _question_list_etag(request: HttpRequest) -> str | None:
+    params = _question_list_params(request)
+    if params is None:
+        return None
+    filters, after, limit, fields = params
+    # The page only changes when the catalog does, so the ETag needs no query
+    raw = f"{catalog.catalog_version()}|{filters.cache_token()}|{after}|{limit}|{','.join(fields)}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+@require_http_methods(["GET", "HEAD"])
+@condition(etag_func=_question_list_etag)
+def question_list_api(request: HttpRequest) -> HttpResponse:
+    """JSON problem list from the local catalog, paged by keyset cursor (the last frontend id seen)"""
+    params = _question_list_params(request)
+    if params is None:
+        return JsonResponse({'error': 'cursor and limit must be integers'}, status=400)
+    filters, after, limit, fields = params
+    results, next_cursor = search.keyset_page(filters, after, limit, fields)
+    response = JsonResponse({
+        'results': results,
+        'next_cursor': str(next_cursor) if next_cursor is not None else None,
+        'total': search.count(filters),
+        'fields': list(fields),
+    })
+    # Always revalidate; unchanged pages come back as 304 via If-None-Match
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @login_required
-def question_editor(request: HttpRequest, question_id: str | None = None) -> HttpResponse:
+async def question_editor(request: HttpRequest, question_id: str | None = None) -> HttpResponse:
     """Question editor page for coding problems"""
     print(f"IN FUNCTION question_editor")
     
@@ -276,38 +226,61 @@ def question_editor(request: HttpRequest, question_id: str | None = None) -> Htt
     # Get title_slug from URL parameter if available
     title_slug = request.GET.get('slug', None)
     
+    user = await request.auser()
+    
+    async def load_user_code() -> str:
+        # Load user's saved code if they're logged in
+        if not user.is_authenticated:
+            return ""
+        try:
+            user_submission = await UserCodeSubmission.objects.aget(user=user, question_id=question_id)
+            return user_submission.code
+        except UserCodeSubmission.DoesNotExist:
+            # No saved code found, use default template
+            return ""
+    
+    async def load_user_profile():
+        # Get user profile for avatar display
+        if not user.is_authenticated:
+            return None
+        user_profile, created = await UserProfile.objects.aget_or_create(user=user)
+        return user_profile
+    
+    # The upstream problem fetch and the two DB lookups are independent, so run them together
+    print(f"Fetching problem {question_id} from LeetCode API...")
+    problem, user_code, user_profile = await asyncio.gather(
+        sync_to_async(fetch_problem_from_leetcode_api, thread_sensitive=False)(question_id, title_slug),
+        load_user_code(),
+        load_user_profile(),
+    )
+    
     # Define problem data
     problems = {}
-    problem = problems.get(question_id)
     if not problem:
-        # Try to fetch the problem dynamically from LeetCode API
-        print(f"Problem {question_id} not found in hardcoded list, fetching from LeetCode API...")
-        problem = fetch_problem_from_leetcode_api(question_id, title_slug)
-        if not problem:
-            print(f"Failed to fetch problem {question_id} from API, creating fallback...")
-            # Create a basic fallback problem
-            problem = {
-                'title': f'Problem {question_id}',
-                'difficulty': 'Medium',
-                'description': f'<p>This is LeetCode problem {question_id}. The full problem details could not be loaded from the API.</p><p>Please visit <a href="https://leetcode.com/problemset/all/" target="_blank">LeetCode</a> to see the complete problem description.</p>',
-                'examples': [
-                    {
-                        'input': 'See LeetCode for examples',
-                        'output': 'See LeetCode for expected output',
-                        'explanation': 'Visit LeetCode for detailed examples and explanations.'
-                    }
-                ],
-                'constraints': [
-                    'Visit LeetCode for full constraints',
-                    f'This is problem {question_id} from LeetCode'
-                ],
-                'template': f'''def solution_{question_id}():
+        print(f"Failed to fetch problem {question_id} from API, creating fallback...")
+        # Create a basic fallback problem
+        problem = {
+            'title': f'Problem {question_id}',
+            'difficulty': 'Medium',
+            'description': f'<p>This is LeetCode problem {question_id}. The full problem details could not be loaded from the API.</p><p>Please visit <a href="https://leetcode.com/problemset/all/" target="_blank">LeetCode</a> to see the complete problem description.</p>',
+            'examples': [
+                {
+                    'input': 'See LeetCode for examples',
+                    'output': 'See LeetCode for expected output',
+                    'explanation': 'Visit LeetCode for detailed examples and explanations.'
+                }
+            ],
+            'constraints': [
+                'Visit LeetCode for full constraints',
+                f'This is problem {question_id} from LeetCode'
+            ],
+            'template': f'''def solution_{question_id}():
     # Problem {question_id} from LeetCode
     # Your code here
     pass
 
 # Test your solution!''',
-                'cppTemplate': f'''#include <iostream>
+            'cppTemplate': f'''#include <iostream>
 using namespace std;
 
 class Solution {{
@@ -322,31 +295,18 @@ int main() {{
     // Test your solution here
     return 0;
 }}'''
-            }
-        
-        # Add the fetched/created problem to the problems dictionary so JavaScript can find it
-        problems[question_id] = problem
+        }
+    else:
+        # Copy so the saved-code override below never leaks into the shared problem cache
+        problem = dict(problem)
     
-    # Load user's saved code if they're logged in
-    user_code = ""
-    if request.user.is_authenticated:
-        try:
-            user_submission = UserCodeSubmission.objects.get(
-                user=request.user, 
-                question_id=question_id
-            )
-            user_code = user_submission.code
-            # Override the template with user's saved code
-            problem['template'] = user_code
-            problem['cppTemplate'] = user_code
-        except UserCodeSubmission.DoesNotExist:
-            # No saved code found, use default template
-            pass
+    # Add the fetched/created problem to the problems dictionary so JavaScript can find it
+    problems[question_id] = problem
     
-    # Get user profile for avatar display
-    user_profile = None
-    if request.user.is_authenticated:
-        user_profile, created = UserProfile.objects.get_or_create(user=request.user)
+    if user_code:
+        # Override the template with user's saved code
+        problem['template'] = user_code
+        problem['cppTemplate'] = user_code
     
     context = {
         'problems': json.dumps(problems),
@@ -357,20 +317,13 @@ int main() {{
         'user_code': user_code,
         'user_profile': user_profile
     }
-    return render(request, 'leetcode/editor.html', context)
+    return await sync_to_async(render)(request, 'leetcode/editor.html', context)
 
 
 @login_required
 @require_http_methods(["POST"])
 def compile_code(request: HttpRequest) -> HttpResponse:
     """Compile and run code using JDoodle API with intelligent simulation fallback"""
-    # Basic rate limit: 20 requests per 5 minutes per user
-    user_key = f"leetcode:rate:compile:{request.user.id}"
-    count = cache.get(user_key, 0)
-    if count >= 20:
-        return JsonResponse({'success': False, 'error': 'Rate limit exceeded. Try again later.'}, status=429)
-    cache.set(user_key, count + 1, timeout=300)
-    
     if request.method != 'POST':
         return JsonResponse({'error': 'Only POST requests allowed'}, status=405)
     
@@ -386,8 +339,12 @@ def compile_code(request: HttpRequest) -> HttpResponse:
         question_id = data.get('question_id', '1')
         title_slug = data.get('title_slug')
 
-        # Use the working approach from my_django_project
-        result = execute_code_jdoodle(code, language, question_id, title_slug)
+        # Queue the run; the editor polls judge_job_status for the result. Rate limit, per-user caps and
+        # fair ordering between users are enforced by the judge scheduler
+        try:
+            job = judge_queue.submit('leetcode', code, language, question_id, title_slug, user=request.user)
+        except judge_queue.Rejected as exc:
+            return JsonResponse({'success': False, 'error': str(exc)}, status=429)
         
         # Save user's code if they're logged in
         if request.user.is_authenticated and code.strip():
@@ -409,7 +366,7 @@ def compile_code(request: HttpRequest) -> HttpResponse:
                 # Log error but don't fail the compilation
                 print(f"Error saving user code: {e}")
         
-        return JsonResponse(result)
+        return JsonResponse(judge_job_response(job), status=202)
             
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
@@ -417,6 +374,32 @@ def compile_code(request: HttpRequest) -> HttpResponse:
         return JsonResponse({'error': f'Server error: {str(e)}'}, status=500)
 
 
+def judge_job_response(job) -> dict:
+    """Job state for the editor, with the URL to poll until it is finished"""
+    data = judge_queue.payload(job)
+    data['status_url'] = reverse('leetcode:judge_job_status', args=[job.pk])
+    return data
+
+
+@login_required
+@require_http_methods(["GET"])
+def judge_job_status(request: HttpRequest, job_id) -> HttpResponse:
+    """Poll a queued Run: {'job_id', 'status', 'result' once done}"""
+    job = JudgeJob.objects.filter(pk=job_id, user=request.user).first()
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(judge_job_response(job))
+
+
+@login_required
+@require_http_methods(["GET"])
+def judge_stats(request: HttpRequest) -> HttpResponse:
+    """Judge queue depth, running jobs and wait-time percentiles (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    return JsonResponse({**judge_scheduler.stats(), 'execution': execution.stats()})
+
+
 @login_required
 @require_http_methods(["POST"])
 def fetch_cpp_template(request: HttpRequest) -> HttpResponse:
@@ -506,62 +489,22 @@ def save_user_code(request: HttpRequest) -> HttpResponse:
     except Exception as e:
         return JsonResponse({'error': f'Server error: {str(e)}'}, status=500)
 
-# Problem cache for dynamic fetching
-_problem_cache = {}
-
 def fetch_problem_from_leetcode_api(question_id, title_slug=None):
     """Fetch problem data from LeetCode API dynamically"""
-    # Check cache first
-    cache_key = f"{question_id}_{title_slug}" if title_slug else question_id
-    if cache_key in _problem_cache:
-        print(f"Using cached problem {cache_key}")
-        return _problem_cache[cache_key]
-    
     try:
-        api = LeetCodeAPI()
+        # Resolve the title_slug from the local catalog when the caller didn't pass one
+        if not title_slug:
+            title_slug = catalog.get_title_slug(question_id)
         
         # If we have a title_slug, use it to fetch problem details
         if title_slug:
-            print(f"Fetching problem details for title_slug: {title_slug}")
-            resp = api.fetch_problem_details(title_slug)
-            if resp.ok and resp.data:
-                question_data = resp.data.get('data', {}).get('question', {})
-                if question_data:
-                    # Process examples from LeetCode API format
-                    examples = []
-                    example_testcases = question_data.get('exampleTestcaseList', [])
-                    if example_testcases:
-                        for i, testcase in enumerate(example_testcases):
-                            # LeetCode testcases are usually in format like "nums = [2,7,11,15], target = 9"
-                            # We'll create a basic example structure
-                            examples.append({
-                                'input': testcase if isinstance(testcase, str) else str(testcase),
-                                'output': 'Expected output (see LeetCode for details)',
-                                'explanation': 'See the full problem on LeetCode for detailed examples and explanations.'
-                            })
-                    
-                    # If no examples from API, create a placeholder
-                    if not examples:
-                        examples = [{
-                            'input': 'See LeetCode for input examples',
-                            'output': 'See LeetCode for expected output',
-                            'explanation': 'Visit LeetCode to see detailed examples and explanations.'
-                        }]
-                    
-                    problem = {
-                        'title': question_data.get('title', f'Problem {question_id}'),
-                        'difficulty': question_data.get('difficulty', 'Medium'),
-                        'description': question_data.get('content', f'Problem {question_id} from LeetCode'),
-                        'examples': examples,
-                        'constraints': [f'Visit LeetCode for full constraints for {question_data.get("title", f"Problem {question_id}")}'],  # LeetCode API doesn't provide constraints in this endpoint
-                        'template': '',  # Will be fetched separately if needed
-                        'cppTemplate': '',  # Will be fetched separately if needed
-                        'title_slug': question_data.get('titleSlug', title_slug)
-                    }
-                    
-                    # Cache the result
-                    _problem_cache[cache_key] = problem
-                    return problem
+            # Per-worker L1 in front of a shared entry per slug; concurrent misses trigger one upstream fetch
+            problem = tiered_cache.problems().get_or_compute(
+                f"editor:{title_slug}",
+                lambda: _fetch_problem_details(question_id, title_slug),
+            )
+            if problem:
+                return problem
         else:
             print(f"No title_slug provided for question {question_id}, cannot fetch from API")
             
@@ -570,8 +513,62 @@ def fetch_problem_from_leetcode_api(question_id, title_slug=None):
     
     return None
 
+
+def _fetch_problem_details(question_id, title_slug):
+    print(f"Fetching problem details for title_slug: {title_slug}")
+    resp = LeetCodeAPI().fetch_problem_details(title_slug)
+    if not resp.ok or not resp.data:
+        return None
+    question_data = resp.data.get('data', {}).get('question', {})
+    if not question_data:
+        return None
+
+    # Process examples from LeetCode API format
+    examples = []
+    example_testcases = question_data.get('exampleTestcaseList', [])
+    if example_testcases:
+        for i, testcase in enumerate(example_testcases):
+            # LeetCode testcases are usually in format like "nums = [2,7,11,15], target = 9"
+            # We'll create a basic example structure
+            examples.append({
+                'input': testcase if isinstance(testcase, str) else str(testcase),
+                'output': 'Expected output (see LeetCode for details)',
+                'explanation': 'See the full problem on LeetCode for detailed examples and explanations.'
+            })
+    
+    # If no examples from API, create a placeholder
+    if not examples:
+        examples = [{
+            'input': 'See LeetCode for input examples',
+            'output': 'See LeetCode for expected output',
+            'explanation': 'Visit LeetCode to see detailed examples and explanations.'
+        }]
+    
+    return {
+        'title': question_data.get('title', f'Problem {question_id}'),
+        'difficulty': question_data.get('difficulty', 'Medium'),
+        'description': question_data.get('content', f'Problem {question_id} from LeetCode'),
+        'examples': examples,
+        'constraints': [f'Visit LeetCode for full constraints for {question_data.get("title", f"Problem {question_id}")}'],  # LeetCode API doesn't provide constraints in this endpoint
+        'template': '',  # Will be fetched separately if needed
+        'cppTemplate': '',  # Will be fetched separately if needed
+        'title_slug': question_data.get('titleSlug', title_slug)
+    }
+
 def fetch_cpp_template_from_leetcode(question_id, title_slug=None):
-    """Fetch C++ code template specifically from LeetCode API"""
+    """Fetch C++ code template specifically from LeetCode API (cached per question)"""
+    key = f"editor:{question_id}:{title_slug or ''}"
+    cached = tiered_cache.templates().get(key)
+    if cached is not None:
+        return cached
+    template = _fetch_cpp_template_from_leetcode(question_id, title_slug)
+    # Generic placeholders stand in for failed fetches, so only real templates are cached
+    if template and not template.get('is_generic'):
+        tiered_cache.templates().set(key, template)
+    return template
+
+
+def _fetch_cpp_template_from_leetcode(question_id, title_slug=None):
     try:
         url = 'https://leetcode.com/graphql'
         headers = {
@@ -632,7 +629,7 @@ def fetch_cpp_template_from_leetcode(question_id, title_slug=None):
                 '''
             }
         
-        response = requests.post(url, json=query, headers=headers, timeout=15)
+        response = http_client.post(url, json=query, headers=headers, timeout=15)
         
         if response.status_code == 200:
             data = response.json()
@@ -687,91 +684,20 @@ int main() {{
         return None
 
 def execute_code_jdoodle(code, language, question_id='1', title_slug=None):
-    """Execute code using JDoodle API (more reliable than Judge0)"""
-    
-    # JDoodle language codes and version indices
-    language_codes = {
-        'cpp': 'cpp',
-        'python3': 'python3',
-        'java': 'java',
-        'javascript': 'nodejs',
-    }
-    
-    # Version indices for different language versions
-    version_indices = {
-        'cpp': '5',  # C++17 (version 5)
-        'python3': '3',  # Python 3.5.1
-        'java': '3',  # Java 1.8
-        'javascript': '2',  # Node.js 0.10.36
-    }
-    
-    language_code = language_codes.get(language, 'cpp')
-    version_index = version_indices.get(language, '5')
+    """Execute code on the configured execution backend (JDoodle unless LEETCODE_EXECUTION_BACKEND=local)"""
     
     # Prepare the code for submission
-    leetcode_data = None
     if language == 'cpp':
-        # Try to get LeetCode API data first
-        leetcode_data = fetch_leetcode_data_for_simulation(question_id, title_slug)
-        
         # Wrap C++ code with test cases
         full_code = generate_cpp_wrapper_jdoodle(code, question_id, title_slug)
         print(f"Generated wrapper for question {question_id}, length: {len(full_code)}")
-        print(f"First 200 chars: {full_code[:200]}")
     else:
         full_code = code
     
-    # JDoodle API endpoint
-    jdoodle_url = "https://api.jdoodle.com/v1/execute"
-    
-    # JDoodle API data with your actual credentials
-    jdoodle_data = {
-        "clientId": getattr(settings, 'JDOODLE_CLIENT_ID', ''),
-        "clientSecret": getattr(settings, 'JDOODLE_CLIENT_SECRET', ''),
-        "script": full_code,
-        "language": language_code,
-        "versionIndex": version_index,
-        "stdin": ""
-    }
-    
-    try:
-        response = requests.post(jdoodle_url, json=jdoodle_data, timeout=30)
-        
-        if response.status_code == 200:
-            result = response.json()
-            
-            if 'output' in result:
-                return {
-        'success': True,
-                    'output': result['output'],
-                    'memory': result.get('memory', ''),
-                    'cpuTime': result.get('cpuTime', '')
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': result.get('error', 'Unknown error from JDoodle'),
-                    'error_type': 'api_error'
-                }
-        else:
-            return {
-                'success': False,
-                'error': f'JDoodle API returned status {response.status_code}',
-                'error_type': 'api_error'
-            }
-            
-    except requests.exceptions.Timeout:
-        return {
-            'success': False,
-            'error': 'Execution timeout - code took too long to run',
-            'error_type': 'timeout_error'
-        }
-    except Exception as e:
-        return {
-            'success': False,
-            'error': f'Execution error: {str(e)}',
-            'error_type': 'runtime_error'
-        }
+    result = execution.execute(full_code, language)
+    if result is None:
+        return execution.failure('Execution service unavailable. Please try again.', 'api_error')
+    return result
 
 def fetch_leetcode_data_for_simulation(question_id, title_slug=None):
     """Fetch LeetCode data for simulation fallback"""
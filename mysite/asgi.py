@@ -12,7 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
-from collab.routing import websocket_urlpatterns
+from channels.security.websocket import AllowedHostsOriginValidator
+from collab.routing import websocket_urlpatterns as collab_websocket_urlpatterns
+from leetcode.routing import websocket_urlpatterns as leetcode_websocket_urlpatterns
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
 
@@ -22,9 +24,12 @@ django_asgi_app = get_asgi_application()
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
-    "websocket": AuthMiddlewareStack(
-        URLRouter(
-            websocket_urlpatterns
+    # Sockets act with the session cookie, so only pages served from ALLOWED_HOSTS may open them
+    "websocket": AllowedHostsOriginValidator(
+        AuthMiddlewareStack(
+            URLRouter(
+                collab_websocket_urlpatterns + leetcode_websocket_urlpatterns
+            )
         )
     ),
 })
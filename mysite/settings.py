@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import os
 import sys
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -279,6 +280,80 @@ LEETCODE_REFERER = os.getenv("LEETCODE_REFERER", "https://leetcode.com")
 LEETCODE_TIMEOUT_SECONDS = int(os.getenv("LEETCODE_TIMEOUT_SECONDS", "15"))
 LEETCODE_RETRY_COUNT = int(os.getenv("LEETCODE_RETRY_COUNT", "2"))
 LEETCODE_CACHE_TTL_SECONDS = int(os.getenv("LEETCODE_CACHE_TTL_SECONDS", "300"))
+LEETCODE_ASYNC_WORKERS = int(os.getenv("LEETCODE_ASYNC_WORKERS", "16"))  # threads backing AsyncLeetCodeAPI
+LEETCODE_L1_CACHE_SIZE = int(os.getenv("LEETCODE_L1_CACHE_SIZE", "512"))  # in-process entries per problem/template cache
+LEETCODE_L1_CACHE_TTL_SECONDS = int(os.getenv("LEETCODE_L1_CACHE_TTL_SECONDS", "60"))  # bounds staleness between workers
+LEETCODE_DAILY_REFRESH_DELAY_SECONDS = int(os.getenv("LEETCODE_DAILY_REFRESH_DELAY_SECONDS", "30"))  # after UTC midnight
+
+# Shared outbound HTTP client (LeetCode GraphQL, JDoodle): keep-alive pools per host
+OUTBOUND_HTTP_POOL_CONNECTIONS = int(os.getenv("OUTBOUND_HTTP_POOL_CONNECTIONS", "10"))  # hosts kept pooled
+OUTBOUND_HTTP_POOL_MAXSIZE = int(os.getenv("OUTBOUND_HTTP_POOL_MAXSIZE", "20"))  # connections per host
+OUTBOUND_HTTP_POOL_BLOCK = os.getenv("OUTBOUND_HTTP_POOL_BLOCK", "false").lower() in ("1", "true", "yes", "on")
+# Circuit breaker per host: open after N consecutive failures, probe again after the reset window
+OUTBOUND_BREAKER_FAILURES = int(os.getenv("OUTBOUND_BREAKER_FAILURES", "5"))
+OUTBOUND_BREAKER_RESET_SECONDS = int(os.getenv("OUTBOUND_BREAKER_RESET_SECONDS", "30"))
+# Hosts whose timeouts shrink to a multiple of observed p99 latency (not JDoodle: run times vary by program)
+OUTBOUND_ADAPTIVE_TIMEOUT_HOSTS = [h for h in os.getenv("OUTBOUND_ADAPTIVE_TIMEOUT_HOSTS", "leetcode.com").split(",") if h]
+
+# Code execution: "jdoodle" (remote API) or "local" (g++ in a temp dir under rlimits; C++ only)
+LEETCODE_EXECUTION_BACKEND = os.getenv("LEETCODE_EXECUTION_BACKEND", "jdoodle")
+JDOODLE_URL = os.getenv("JDOODLE_URL", "https://api.jdoodle.com/v1/execute")
+JDOODLE_CLIENT_ID = os.getenv("JDOODLE_CLIENT_ID", "5a33bce78cbe581c1c432078db8eaa7f")
+JDOODLE_CLIENT_SECRET = os.getenv("JDOODLE_CLIENT_SECRET", "5d2a91048622680e7dfb7165e5afc9be131986d2257916e16a5f1d50e8567289")
+JDOODLE_TIMEOUT_SECONDS = int(os.getenv("JDOODLE_TIMEOUT_SECONDS", "15"))
+LOCAL_EXECUTION_COMPILER = os.getenv("LOCAL_EXECUTION_COMPILER", "g++")
+LOCAL_EXECUTION_COMPILE_SECONDS = int(os.getenv("LOCAL_EXECUTION_COMPILE_SECONDS", "30"))
+LOCAL_EXECUTION_CPU_SECONDS = int(os.getenv("LOCAL_EXECUTION_CPU_SECONDS", "5"))
+LOCAL_EXECUTION_WALL_SECONDS = float(os.getenv("LOCAL_EXECUTION_WALL_SECONDS", "10"))
+LOCAL_EXECUTION_MEMORY_MB = int(os.getenv("LOCAL_EXECUTION_MEMORY_MB", "256"))
+LOCAL_EXECUTION_OUTPUT_BYTES = int(os.getenv("LOCAL_EXECUTION_OUTPUT_BYTES", str(1024 * 1024)))
+# RLIMIT_NPROC for compiles and runs. The kernel counts every process of the user the server runs as, so leave room
+# above what that user normally runs; it bounds fork bombs, not a single run (no effect when running as root)
+LOCAL_EXECUTION_MAX_PROCESSES = int(os.getenv("LOCAL_EXECUTION_MAX_PROCESSES", "512"))
+# Compiled binaries keyed by source + flags + compiler version, shared by every worker on the host (0 MB disables)
+LOCAL_EXECUTION_BINARY_CACHE_DIR = os.getenv(
+    "LOCAL_EXECUTION_BINARY_CACHE_DIR", os.path.join(tempfile.gettempdir(), "leetcode-binaries")
+)
+LOCAL_EXECUTION_BINARY_CACHE_MB = int(os.getenv("LOCAL_EXECUTION_BINARY_CACHE_MB", "256"))
+# Warm sandbox workers with ready working directories; each is replaced after POOL_MAX_RUNS runs (0 workers: a new
+# temp dir and a fork of this process per run). STATIC_LINK builds static binaries, skipping the dynamic loader
+LOCAL_EXECUTION_POOL_SIZE = int(os.getenv("LOCAL_EXECUTION_POOL_SIZE", "4"))
+LOCAL_EXECUTION_POOL_MAX_RUNS = int(os.getenv("LOCAL_EXECUTION_POOL_MAX_RUNS", "50"))
+LOCAL_EXECUTION_POOL_WAIT_SECONDS = float(os.getenv("LOCAL_EXECUTION_POOL_WAIT_SECONDS", "30"))
+LOCAL_EXECUTION_POOL_DIR = os.getenv("LOCAL_EXECUTION_POOL_DIR", os.path.join(tempfile.gettempdir(), "leetcode-sandbox"))
+LOCAL_EXECUTION_STATIC_LINK = os.getenv("LOCAL_EXECUTION_STATIC_LINK", "false").lower() in ("1", "true", "yes", "on")
+# Results of identical runs (same program, test set, language and executor version), shared through the cache
+# (0 entries disables memoization)
+LEETCODE_RESULT_CACHE_SIZE = int(os.getenv("LEETCODE_RESULT_CACHE_SIZE", "1024"))
+LEETCODE_RESULT_CACHE_TTL_SECONDS = int(os.getenv("LEETCODE_RESULT_CACHE_TTL_SECONDS", "3600"))
+# Results with more output (plus error text) than this are not memoized, bounding the in-process tier in bytes
+LEETCODE_RESULT_CACHE_MAX_OUTPUT_BYTES = int(os.getenv("LEETCODE_RESULT_CACHE_MAX_OUTPUT_BYTES", str(64 * 1024)))
+# Entries of the shared "results" cache below (separate from 'default', so Run traffic does not cull the bundles,
+# catalog and daily question stored there)
+LEETCODE_RESULT_CACHE_SHARED_ENTRIES = int(os.getenv("LEETCODE_RESULT_CACHE_SHARED_ENTRIES", "2000"))
+
+# Run requests are JudgeJob rows: "thread" executes them on LEETCODE_JUDGE_THREADS threads in the web process,
+# "worker" leaves them to `manage.py run_judge_workers`, "eager" runs them inline (tests)
+LEETCODE_JUDGE_MODE = os.getenv("LEETCODE_JUDGE_MODE", "thread")
+LEETCODE_JUDGE_THREADS = int(os.getenv("LEETCODE_JUDGE_THREADS", "4"))
+# Finished jobs are deleted this long after they were queued (0 keeps them); thread mode sweeps (purge, then drain
+# whatever is queued) on this interval and at the first judge request after start-up
+LEETCODE_JUDGE_RETENTION_SECONDS = int(os.getenv("LEETCODE_JUDGE_RETENTION_SECONDS", str(7 * 24 * 3600)))
+LEETCODE_JUDGE_SWEEP_SECONDS = int(os.getenv("LEETCODE_JUDGE_SWEEP_SECONDS", "60"))
+# Jobs running longer than this are taken to belong to a dead process and requeued by the thread-mode sweeper
+# (run_judge_workers has --stale-after); keep it above the longest compile + run
+LEETCODE_JUDGE_STALE_SECONDS = int(os.getenv("LEETCODE_JUDGE_STALE_SECONDS", "120"))
+# Fair scheduling: per-flow (user) rate limit and caps, host-wide concurrency, staff share
+LEETCODE_JUDGE_RATE_LIMIT = int(os.getenv("LEETCODE_JUDGE_RATE_LIMIT", "20"))  # runs per window per user
+LEETCODE_JUDGE_RATE_WINDOW_SECONDS = int(os.getenv("LEETCODE_JUDGE_RATE_WINDOW_SECONDS", "300"))
+LEETCODE_JUDGE_USER_MAX_PENDING = int(os.getenv("LEETCODE_JUDGE_USER_MAX_PENDING", "3"))  # queued + running
+LEETCODE_JUDGE_USER_MAX_RUNNING = int(os.getenv("LEETCODE_JUDGE_USER_MAX_RUNNING", "1"))
+LEETCODE_JUDGE_MAX_RUNNING = int(os.getenv("LEETCODE_JUDGE_MAX_RUNNING", "8"))  # across every worker process
+LEETCODE_JUDGE_STAFF_WEIGHT = float(os.getenv("LEETCODE_JUDGE_STAFF_WEIGHT", "1"))
+# Editor socket (ws/leetcode/editor/<question_id>/): autosaved code is written at most this often, and job
+# state is re-read on this interval when no notification arrives (worker processes on another channel layer)
+LEETCODE_EDITOR_AUTOSAVE_SECONDS = float(os.getenv("LEETCODE_EDITOR_AUTOSAVE_SECONDS", "2"))
+LEETCODE_EDITOR_POLL_SECONDS = float(os.getenv("LEETCODE_EDITOR_POLL_SECONDS", "1"))
 
 # Feature flags
 LEETCODE_ENABLED = os.getenv("LEETCODE_ENABLED", "true").lower() in ("1", "true", "yes", "on")
@@ -293,7 +368,16 @@ CACHES = {
         'OPTIONS': {
             'MAX_ENTRIES': 1000,
         }
-    }
+    },
+    # L2 of the execution result cache (leetcode/services/execution/result_cache.py); created by createcachetable
+    'results': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'leetcode_result_cache',
+        'TIMEOUT': LEETCODE_RESULT_CACHE_TTL_SECONDS,
+        'OPTIONS': {
+            'MAX_ENTRIES': max(1, LEETCODE_RESULT_CACHE_SHARED_ENTRIES),
+        }
+    },
 }
 
 # Workout app cache settings
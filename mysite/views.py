@@ -1,22 +1,24 @@
 from django.shortcuts import render
 from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.shortcuts import redirect
 from polls.models import UserCodeSubmission, UserProfile
+import dataclasses
 import json
 import requests
 import re
 from bs4 import BeautifulSoup
-import subprocess
-import tempfile
+from leetcode.services import (
+    artifacts, bundle as problem_bundle, catalog, content_extract, cpp_signature, execution, harness, http_client,
+    judge_queue, literals, tiered_cache,
+)
 import os
 import time
 
-# Simple in-memory cache for fetched problems
-_problem_cache = {}
 
 def home(request):
     """Home page view with links to polls and LeetCode"""
@@ -73,6 +75,10 @@ def _extract_description_before_examples(elem):
 
 def parse_leetcode_content(content):
     """Parse LeetCode HTML content to extract problem details"""
+    return content_extract.extract_problem_content(content)
+
+def legacy_parse_leetcode_content(content):
+    """BeautifulSoup version of parse_leetcode_content, kept as the benchmark baseline"""
     if not content:
         return {
             'description': 'No description available',
@@ -790,15 +796,13 @@ def daily_question(request):
             '''
         }
         
-        # Try with longer timeout and session for deployed environments that may have network issues
-        session = requests.Session()
-        session.headers.update(headers)
-        
+        # Longer timeout for deployed environments that may have network issues; the shared
+        # client keeps the LeetCode connection alive between requests
         # Add retry mechanism for network issues
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = session.post(url, json=query, timeout=30)
+                response = http_client.post(url, json=query, headers=headers, timeout=30)
                 break
             except requests.exceptions.ConnectionError as e:
                 if attempt == max_retries - 1:
@@ -815,7 +819,7 @@ def daily_question(request):
                 
                 # Parse the content to extract description, examples, and constraints
                 content = question.get('content', '')
-                parsed_content = parse_leetcode_content(content)
+                parsed_content = artifacts.get_parsed_content(content, parse_leetcode_content, question.get('titleSlug', ''))
                 
                 # Get example test cases from the API
                 example_testcases = question.get('exampleTestcases', '')
@@ -1060,7 +1064,7 @@ def question_selection(request):
             }
         }
         
-        response = requests.post(url, json=query, headers=headers, timeout=10)
+        response = http_client.post(url, json=query, headers=headers, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -1237,7 +1241,7 @@ def fetch_questions_alternative(page, limit, difficulty, search_term):
             }
         }
         
-        response = requests.post(url, json=query, headers=headers, timeout=15)
+        response = http_client.post(url, json=query, headers=headers, timeout=15)
         
         if response.status_code == 200:
             data = response.json()
@@ -1296,9 +1300,10 @@ def fetch_questions_alternative(page, limit, difficulty, search_term):
 def fetch_problem_from_leetcode_api(question_id):
     """Fetch problem data from LeetCode API dynamically"""
     # Check cache first
-    if question_id in _problem_cache:
+    cached = tiered_cache.problems().get(f"page:{question_id}")
+    if cached is not None:
         print(f"Using cached problem {question_id}")
-        return _problem_cache[question_id]
+        return cached
     
     try:
         # Try a more direct approach - use common title slug patterns
@@ -1324,6 +1329,14 @@ def fetch_problem_from_leetcode_api(question_id):
 
 def fetch_problem_by_search(question_id):
     """Fallback method to search for problem by ID"""
+    # Local catalog hit: one indexed lookup instead of scanning the problemset
+    q = catalog.get_question_info(question_id)
+    if q:
+        full_problem = fetch_full_problem_content(q['titleSlug'], q, question_id)
+        problem = full_problem or create_problem_from_basic_info(q, question_id)
+        tiered_cache.problems().set(f"page:{question_id}", problem)
+        return problem
+    
     try:
         url = 'https://leetcode.com/graphql'
         headers = {
@@ -1344,13 +1357,7 @@ def fetch_problem_by_search(question_id):
                             skip: $skip
                             filters: $filters
                         ) {
-                            questions: data {
-                                frontendQuestionId: questionFrontendId
-                                title
-                                titleSlug
-                                difficulty
-                                acRate
-                            }
+                            questions: data {''' + catalog.QUESTION_LIST_FIELDS + '''}
                         }
                     }
                 ''',
@@ -1362,30 +1369,31 @@ def fetch_problem_by_search(question_id):
                 }
             }
             
-            response = requests.post(url, json=find_query, headers=headers, timeout=10)
+            response = http_client.post(url, json=find_query, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
                 if 'data' in data and 'problemsetQuestionList' in data['data']:
                     questions = data['data']['problemsetQuestionList'].get('questions', [])
+                    catalog.upsert_problems(questions)
                     
                     # Look for our target question ID
-                    for q in questions:
-                        if q.get('frontendQuestionId') == question_id:
-                            # Try to fetch full problem content
-                            title_slug = q.get('titleSlug')
-                            if title_slug:
-                                full_problem = fetch_full_problem_content(title_slug, q, question_id)
-                                if full_problem:
-                                    # Cache the result
-                                    _problem_cache[question_id] = full_problem
-                                    return full_problem
-                            
-                            # Fallback to basic info if full content fetch fails
-                            problem = create_problem_from_basic_info(q, question_id)
-                            # Cache the result
-                            _problem_cache[question_id] = problem
-                            return problem
+                    q = catalog.find_in_rows(questions, question_id)
+                    if q:
+                        # Try to fetch full problem content
+                        title_slug = q.get('titleSlug')
+                        if title_slug:
+                            full_problem = fetch_full_problem_content(title_slug, q, question_id)
+                            if full_problem:
+                                # Cache the result
+                                tiered_cache.problems().set(f"page:{question_id}", full_problem)
+                                return full_problem
+                        
+                        # Fallback to basic info if full content fetch fails
+                        problem = create_problem_from_basic_info(q, question_id)
+                        # Cache the result
+                        tiered_cache.problems().set(f"page:{question_id}", problem)
+                        return problem
         
         return None
         
@@ -1394,7 +1402,17 @@ def fetch_problem_by_search(question_id):
         return None
 
 def fetch_cpp_template_from_leetcode(question_id, title_slug=None):
-    """Fetch C++ code template specifically from LeetCode API"""
+    """Fetch C++ code template specifically from LeetCode API (cached per question)"""
+    key = f"page:{question_id}:{title_slug or ''}"
+    cached = tiered_cache.templates().get(key)
+    if cached is not None:
+        return cached
+    template = _fetch_cpp_template_from_leetcode(question_id, title_slug)
+    if template:
+        tiered_cache.templates().set(key, template)
+    return template
+
+def _fetch_cpp_template_from_leetcode(question_id, title_slug=None):
     try:
         url = 'https://leetcode.com/graphql'
         headers = {
@@ -1431,7 +1449,7 @@ def fetch_cpp_template_from_leetcode(question_id, title_slug=None):
             }
         }
         
-        response = requests.post(url, json=detail_query, headers=headers, timeout=10)
+        response = http_client.post(url, json=detail_query, headers=headers, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -1552,7 +1570,11 @@ int main() {{
     return template
 
 def find_title_slug_by_id(question_id):
-    """Find title_slug for a given question ID by searching through LeetCode problems"""
+    """Find title_slug for a given question ID, using the local problem catalog first"""
+    title_slug = catalog.get_title_slug(question_id)
+    if title_slug:
+        return title_slug
+    
     try:
         url = 'https://leetcode.com/graphql'
         headers = {
@@ -1561,7 +1583,7 @@ def find_title_slug_by_id(question_id):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        # Search in batches to find the question
+        # Catalog miss: search in batches and remember every page we see
         for skip in range(0, 1000, 50):  # Check first 1000 problems
             find_query = {
                 'query': '''
@@ -1572,12 +1594,7 @@ def find_title_slug_by_id(question_id):
                             skip: $skip
                             filters: $filters
                         ) {
-                            questions: data {
-                                frontendQuestionId: questionFrontendId
-                                title
-                                titleSlug
-                                difficulty
-                            }
+                            questions: data {''' + catalog.QUESTION_LIST_FIELDS + '''}
                         }
                     }
                 ''',
@@ -1589,17 +1606,18 @@ def find_title_slug_by_id(question_id):
                 }
             }
             
-            response = requests.post(url, json=find_query, headers=headers, timeout=10)
+            response = http_client.post(url, json=find_query, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
                 if 'data' in data and 'problemsetQuestionList' in data['data']:
                     questions = data['data']['problemsetQuestionList'].get('questions', [])
+                    catalog.upsert_problems(questions)
                     
                     # Look for our target question ID
-                    for q in questions:
-                        if q.get('frontendQuestionId') == question_id:
-                            return q.get('titleSlug')
+                    q = catalog.find_in_rows(questions, question_id)
+                    if q:
+                        return q.get('titleSlug')
         
         return None
         
@@ -1607,6 +1625,35 @@ def find_title_slug_by_id(question_id):
         print(f"Error finding title_slug for question {question_id}: {str(e)}")
         return None
 
+# Default for the compile stages: fetch the bundle themselves. Callers pass the bundle they
+# already fetched (or None when that failed) so a compile never asks LeetCode twice.
+_FETCH_BUNDLE = object()
+
+def get_problem_bundle(question_id, title_slug=None):
+    """Resolve the slug once and fetch the problem bundle shared by every compile stage"""
+    try:
+        if not title_slug:
+            title_slug = find_title_slug_by_id(question_id)
+            if not title_slug:
+                print(f"No title_slug found for question {question_id}")
+                return None
+        
+        bundle = problem_bundle.fetch_problem_bundle(question_id, title_slug)
+        if bundle and bundle.cpp_snippet:
+            # Detect the method and signature from LeetCode's own snippet once for all stages
+            # (on a copy: the cached bundle is shared between requests)
+            method_name = detect_method_name_from_code(bundle.cpp_snippet)
+            bundle = dataclasses.replace(
+                bundle,
+                method_name=method_name,
+                signature=detect_function_signature(bundle.cpp_snippet, method_name),
+            )
+        return bundle
+        
+    except Exception as e:
+        print(f"Error fetching problem bundle for question {question_id}: {str(e)}")
+        return None
+
 def fetch_full_problem_content(title_slug, question_info, question_id):
     """Fetch full problem content using the title slug"""
     try:
@@ -1638,7 +1685,7 @@ def fetch_full_problem_content(title_slug, question_info, question_id):
             }
         }
         
-        response = requests.post(url, json=detail_query, headers=headers, timeout=10)
+        response = http_client.post(url, json=detail_query, headers=headers, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -1648,7 +1695,7 @@ def fetch_full_problem_content(title_slug, question_info, question_id):
                 # Parse the content
                 content = question_data.get('content', '')
                 print(f"Raw content length for problem {question_id}: {len(content)}")
-                parsed_content = parse_leetcode_content(content)
+                parsed_content = artifacts.get_parsed_content(content, parse_leetcode_content, title_slug)
                 print(f"Parsed description length: {len(parsed_content.get('description', ''))}")
                 print(f"Parsed examples count: {len(parsed_content.get('examples', []))}")
                 print(f"Parsed constraints count: {len(parsed_content.get('constraints', []))}")
@@ -1935,8 +1982,14 @@ def compile_code(request):
 
         # return JsonResponse({'error': 'Code before: ' + code})
 
-        # Use the working approach from my_django_project
-        result = execute_code_jdoodle(code, language, question_id, title_slug)
+        # Queue the run; the editor polls leetcode:judge_job_status for the result
+        try:
+            job = judge_queue.submit(
+                'project', code, language, question_id, title_slug,
+                user=request.user, session_key=request.session.session_key,
+            )
+        except judge_queue.Rejected as exc:
+            return JsonResponse({'success': False, 'error': str(exc)}, status=429)
         
         # Save user's code if they're logged in
         if request.user.is_authenticated and code.strip():
@@ -1958,7 +2011,9 @@ def compile_code(request):
                 # Log error but don't fail the compilation
                 print(f"Error saving user code: {e}")
         
-        return JsonResponse(result)
+        data = judge_queue.payload(job)
+        data['status_url'] = reverse('leetcode:judge_job_status', args=[job.pk])
+        return JsonResponse(data, status=202)
             
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
@@ -1967,193 +2022,39 @@ def compile_code(request):
 
 
 def execute_code_jdoodle(code, language, question_id='1', title_slug=None):
-    """Execute code using JDoodle API (more reliable than Judge0)"""
-    
-    # JDoodle language codes and version indices
-    language_codes = {
-        'cpp': 'cpp',
-        'python3': 'python3',
-        'java': 'java',
-        'javascript': 'nodejs',
-    }
-    
-    # Version indices for different language versions
-    version_indices = {
-        # 'cpp': '4',  # C++11 (version 4)
-        'cpp': '5',  # C++17 (version 5)
-        'python3': '3',  # Python 3.5.1
-        'java': '3',  # Java 1.8
-        'javascript': '2',  # Node.js 0.10.36
-    }
-    
-    language_code = language_codes.get(language, 'cpp')
-    # version_index = version_indices.get(language, '4')
-    version_index = version_indices.get(language, '5')
-    
-    # Prepare the code for submission
+    """Wrap code with the problem's test cases and run it on the configured execution backend.
+
+    JDoodle by default; LEETCODE_EXECUTION_BACKEND=local compiles and runs C++ on this host.
+    Returns None when the executor could not be reached.
+    """
     leetcode_data = None
     if language == 'cpp':
-        # Try to get LeetCode API data first
-        leetcode_data = fetch_leetcode_data_for_simulation(question_id, title_slug)
+        # One upstream fetch for the whole compile: every stage below reuses this bundle
+        bundle = get_problem_bundle(question_id, title_slug)
+        leetcode_data = fetch_leetcode_data_for_simulation(question_id, title_slug, bundle=bundle)
         
-        # Wrap C++ code with test cases
-        full_code = generate_cpp_wrapper_jdoodle(code, question_id, title_slug)
-        print(f"Generated wrapper for question {question_id}, length: {len(full_code)}")
-        print(f"First 200 chars: {full_code[:200]}")
+        # Wrap C++ code with test cases; the stdin harness keeps test data out of the script
+        full_code, stdin = generate_cpp_program_jdoodle(code, question_id, title_slug, bundle=bundle)
+        print(f"Generated wrapper for question {question_id}, length: {len(full_code)}, stdin: {len(stdin)}")
     else:
-        full_code = code
-    
-    # JDoodle API endpoint
-    jdoodle_url = "https://api.jdoodle.com/v1/execute"
-    
-    # JDoodle API data with your actual credentials
-    api_data = {
-        "clientId": "5a33bce78cbe581c1c432078db8eaa7f",
-        "clientSecret": "5d2a91048622680e7dfb7165e5afc9be131986d2257916e16a5f1d50e8567289",
-        "script": full_code,
-        "language": language_code,
-        "versionIndex": version_index
-    }
-    
-    try:
-        # Try JDoodle API first
-        response = requests.post(
-            jdoodle_url,
-            json=api_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=15
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            
-            # Debug: Print the full response
-            print(f"JDoodle API Response: {result}")
-            
-            if 'error' in result and result['error']:
-                return {
-                    'success': False,
-                    'error': result['error'],
-                    'error_type': 'api_error'
-                }
-            
-            stdout = result.get('output', '')
-            stderr = result.get('error', '')
-            
-            if stderr and 'compilation error' in stderr.lower():
-                return {
-                    'success': False,
-                    'error': stderr,
-                    'error_type': 'compilation_error'
-                }
-            elif stderr:
-                return {
-                    'success': False,
-                    'error': stderr,
-                    'error_type': 'runtime_error'
-                }
-            
-            return {
-                'success': True,
-                'output': stdout,
-                'error': stderr,
-                'statusCode': 0,
-                'memory': result.get('memory', 'N/A'),
-                'cpuTime': result.get('cpuTime', 'N/A')
-            }
-        
-        else:
-            # Debug: Print the error response
-            print(f"JDoodle API Error: Status {response.status_code}, Response: {response.text}")
-            # Fallback to simulated execution for demo
-            # return execute_code_simulation(code, language, question_id, leetcode_data)
-            return None
+        full_code, stdin = code, ''
     
-    except requests.exceptions.RequestException as e:
-        # Debug: Print the exception
-        print(f"JDoodle API Request Exception: {str(e)}")
+    result = execution.execute(full_code, language, stdin)
+    if result is None:
+        print(f"Execution backend unavailable for question {question_id}")
         # Fallback to simulated execution
         # return execute_code_simulation(code, language, question_id, leetcode_data)
-        return None
+    return result
 
 
-def fetch_leetcode_data_for_simulation(question_id, title_slug=None):
+def fetch_leetcode_data_for_simulation(question_id, title_slug=None, bundle=_FETCH_BUNDLE):
 
     print(f"Fetching LeetCode data for simulation: {question_id}")
 
     """Fetch LeetCode data for simulation fallback"""
-    try:
-        # Use provided title_slug if available (from daily question data)
-        if title_slug:
-            print(f"Using provided title_slug: {title_slug}")
-        else:
-            # Fallback to finding title_slug (for non-daily questions)
-            print(f"No title_slug provided, searching for question_id: {question_id}")
-            title_slug = find_title_slug_by_id(question_id)
-            if not title_slug:
-                return None
-        
-        # Fetch from LeetCode API
-        url = 'https://leetcode.com/graphql'
-        headers = {
-            'Content-Type': 'application/json',
-            'Referer': 'https://leetcode.com/problems/',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        query = {
-            'query': '''
-                query questionContent($titleSlug: String!) {
-                    question(titleSlug: $titleSlug) {
-                        title
-                        difficulty
-                        content
-                        exampleTestcases
-                        codeSnippets {
-                            lang
-                            code
-                        }
-                    }
-                }
-            ''',
-            'variables': {
-                'titleSlug': title_slug
-            }
-        }
-        
-        response = requests.post(url, json=query, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'data' in data and 'question' in data['data'] and data['data']['question']:
-                question_data = data['data']['question']
-                
-                # Get example test cases
-                example_testcases = question_data.get('exampleTestcases', '')
-                
-                # Get method name from LeetCode code snippets
-                method_name = 'solve'  # default
-                code_snippets = question_data.get('codeSnippets', [])
-                for snippet in code_snippets:
-                    if snippet.get('lang') in ['cpp', 'C++']:
-                        cpp_code = snippet.get('code', '')
-                        detected_method = detect_method_name_from_code(cpp_code)
-                        if detected_method != 'solve':
-                            method_name = detected_method
-                            break
-                
-                return {
-                    'example_testcases': example_testcases,
-                    'method_name': method_name,
-                    'title': question_data.get('title', ''),
-                    'difficulty': question_data.get('difficulty', '')
-                }
-        
-        return None
-        
-    except Exception as e:
-        print(f"Error fetching LeetCode data for simulation: {str(e)}")
-        return None
+    if bundle is _FETCH_BUNDLE:
+        bundle = get_problem_bundle(question_id, title_slug)
+    return bundle.as_simulation_data() if bundle else None
 
 def parse_leetcode_test_cases_for_simulation(leetcode_data):
     """Parse LeetCode test cases for simulation"""
@@ -2182,12 +2083,12 @@ def parse_leetcode_test_cases_for_simulation(leetcode_data):
         print(f"Error parsing LeetCode test cases for simulation: {str(e)}")
         return []
 
-def get_test_cases_for_question(question_id, code=''):
+def get_test_cases_for_question(question_id, code='', bundle=_FETCH_BUNDLE):
     """Get test cases and execution code for a specific question"""
     test_cases_map = {}
     # If question not found, try to fetch from LeetCode API
     if question_id not in test_cases_map:
-        leetcode_test_cases = fetch_test_cases_from_leetcode(question_id)
+        leetcode_test_cases = fetch_test_cases_from_leetcode(question_id, bundle=bundle)
         if leetcode_test_cases:
             return leetcode_test_cases
         # Fallback to generic test cases if LeetCode API fails
@@ -2196,7 +2097,52 @@ def get_test_cases_for_question(question_id, code=''):
         return None
     return test_cases_map.get(question_id, test_cases_map['1'])
 
-def generate_cpp_wrapper_jdoodle(code, question_id='1', title_slug=None):
+def generate_cpp_program_jdoodle(code, question_id='1', title_slug=None, bundle=_FETCH_BUNDLE):
+    """(script, stdin) for a C++ submission: a stdin-driven harness when the signature's types allow it,
+    otherwise the unrolled wrapper with empty stdin"""
+    if 'int main(' in code or 'void main(' in code:
+        return code, ''
+    if bundle is _FETCH_BUNDLE:
+        bundle = get_problem_bundle(question_id, title_slug)
+    if bundle and bundle.example_testcases:
+        function_signature = detect_function_signature(code, bundle.method_name) or bundle.signature
+        if function_signature:
+            program = generate_stdin_cpp_wrapper(code, question_id, function_signature, bundle.example_testcases)
+            if program:
+                return program
+    return generate_cpp_wrapper_jdoodle(code, question_id, title_slug, bundle=bundle), ''
+
+def generate_stdin_cpp_wrapper(code, question_id, function_signature, example_testcases):
+    """(script, stdin) for a harness that reads the test cases from stdin, or None when unsupported.
+
+    Everything but the user's code is cached per (question id, signature hash, test-set hash); the question id
+    is part of the harness (its report banner), so it keys the template rather than the title slug.
+    """
+    key = harness.template_key(question_id, function_signature, example_testcases)
+    template = harness.cached_template(
+        key, lambda: build_harness_template(question_id, function_signature, example_testcases),
+    )
+    return template.render(code) if template else None
+
+def build_harness_template(question_id, function_signature, example_testcases):
+    """harness.Template around the user's code: includes, data structures, harness main and stdin"""
+    harness_code = harness.harness_source(question_id, function_signature)
+    if not harness_code:
+        return None
+    parameter_names = [param['name'] for param in function_signature['parameters']]
+    cases = harness.group_test_cases(example_testcases, parameter_names)
+    if not cases:
+        return None
+    
+    includes = generate_necessary_includes(function_signature['parameters'], function_signature['return_type'])
+    data_structures = generate_data_structures(function_signature['parameters'], function_signature['return_type'])
+    return harness.Template(
+        prefix=f"{includes}\n\n{data_structures}\n\n",
+        suffix=f"\n\n{harness_code}",
+        stdin=harness.harness_stdin(cases),
+    )
+
+def generate_cpp_wrapper_jdoodle(code, question_id='1', title_slug=None, bundle=_FETCH_BUNDLE):
     """Generate a complete C++ program with test cases for Judge0"""
     
     # Check if code already has main function
@@ -2205,14 +2151,16 @@ def generate_cpp_wrapper_jdoodle(code, question_id='1', title_slug=None):
     
     # ALWAYS try to fetch test cases from LeetCode API first (for ALL questions)
     print(f"Generating C++ wrapper for question {question_id}")
-    leetcode_wrapper = fetch_and_generate_leetcode_wrapper(code, question_id, title_slug)
+    if bundle is _FETCH_BUNDLE:
+        bundle = get_problem_bundle(question_id, title_slug)
+    leetcode_wrapper = fetch_and_generate_leetcode_wrapper(code, question_id, title_slug, bundle=bundle)
     if leetcode_wrapper:
         print(f"Using LeetCode API wrapper for question {question_id}")
         return leetcode_wrapper
     
     # Only fallback to hardcoded test cases if LeetCode API completely fails
     print(f"LeetCode API failed, falling back to hardcoded test cases for question {question_id}")
-    test_cases = get_test_cases_for_question(question_id, code)
+    test_cases = get_test_cases_for_question(question_id, code, bundle=bundle)
     
     # Generate wrapper code for Judge0
     wrapper_code = '''#include <iostream>
@@ -2263,97 +2211,31 @@ int main() {
     
     return wrapper_code
 
-def fetch_and_generate_leetcode_wrapper(code, question_id, title_slug=None):
+def fetch_and_generate_leetcode_wrapper(code, question_id, title_slug=None, bundle=_FETCH_BUNDLE):
 
     print(f"Fetching and generating LeetCode wrapper for question {question_id}")
 
-    """Fetch test cases from LeetCode and generate a complete C++ wrapper"""
+    """Generate a complete C++ wrapper from the problem bundle's example test cases"""
     try:
-        print(f"Attempting to fetch LeetCode test cases for question {question_id}")
-        
-        # Use provided title_slug if available (from daily question data)
-        if title_slug:
-            print(f"Using provided title_slug: {title_slug}")
-        else:
-            # Fallback to finding title_slug (for non-daily questions)
-            print(f"No title_slug provided, searching for question_id: {question_id}")
-            title_slug = find_title_slug_by_id(question_id)
-            if not title_slug:
-                print(f"No title_slug found for question {question_id}")
-                return None
-        
-        print(f"Found title_slug: {title_slug}")
-        
-        # Fetch from LeetCode API
-        url = 'https://leetcode.com/graphql'
-        headers = {
-            'Content-Type': 'application/json',
-            'Referer': 'https://leetcode.com/problems/',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        query = {
-            'query': '''
-                query questionContent($titleSlug: String!) {
-                    question(titleSlug: $titleSlug) {
-                        title
-                        difficulty
-                        content
-                        exampleTestcases
-                        codeSnippets {
-                            lang
-                            code
-                        }
-                    }
-                }
-            ''',
-            'variables': {
-                'titleSlug': title_slug
-            }
-        }
-        
-        response = requests.post(url, json=query, headers=headers, timeout=10)
-        
-        print(f"LeetCode API response status: {response.status_code}")
+        if bundle is _FETCH_BUNDLE:
+            bundle = get_problem_bundle(question_id, title_slug)
+        if not bundle:
+            print(f"No problem data found for question {question_id}")
+            return None
         
-        if response.status_code == 200:
-            data = response.json()
-            if 'data' in data and 'question' in data['data'] and data['data']['question']:
-                question_data = data['data']['question']
-                
-                # Get example test cases
-                example_testcases = question_data.get('exampleTestcases', '')
-                print(f"Found example test cases: {example_testcases[:100]}...")
-                
-                # Get method name from LeetCode code snippets
-                method_name = 'solve'  # default
-                code_snippets = question_data.get('codeSnippets', [])
-                for snippet in code_snippets:
-                    if snippet.get('lang') in ['cpp', 'C++']:
-                        cpp_code = snippet.get('code', '')
-                        detected_method = detect_method_name_from_code(cpp_code)
-                        if detected_method != 'solve':
-                            method_name = detected_method
-                            print(f"Found method name from LeetCode: {method_name}")
-                            break
-                
-                if example_testcases:
-                    # Generate a simple, working C++ wrapper
-                    wrapper = generate_simple_leetcode_wrapper(code, question_id, example_testcases, method_name)
-                    if wrapper:
-                        print(f"Successfully generated LeetCode wrapper for question {question_id}")
-                        print(f"Wrapper length: {len(wrapper)} characters")
-                        # print(f"First 200 characters: {wrapper[:200]}")
-                        print(f"All wrapper characters: {wrapper}")
-                        return wrapper
-                    else:
-                        print(f"Failed to generate wrapper for question {question_id}")
-                else:
-                    print(f"No example test cases found for question {question_id}")
+        example_testcases = bundle.example_testcases
+        if example_testcases:
+            print(f"Found example test cases: {example_testcases[:100]}...")
+            # Generate a simple, working C++ wrapper
+            wrapper = generate_simple_leetcode_wrapper(code, question_id, example_testcases, bundle.method_name, bundle.signature)
+            if wrapper:
+                print(f"Successfully generated LeetCode wrapper for question {question_id}")
+                print(f"Wrapper length: {len(wrapper)} characters")
+                return wrapper
             else:
-                print(f"No question data found in API response for question {question_id}")
+                print(f"Failed to generate wrapper for question {question_id}")
         else:
-            print(f"LeetCode API request failed with status {response.status_code}")
+            print(f"No example test cases found for question {question_id}")
         
         return None
         
@@ -2361,13 +2243,13 @@ def fetch_and_generate_leetcode_wrapper(code, question_id, title_slug=None):
         print(f"Error fetching LeetCode wrapper for question {question_id}: {str(e)}")
         return None
 
-def generate_simple_leetcode_wrapper(code, question_id, example_testcases, method_name='solve'):
+def generate_simple_leetcode_wrapper(code, question_id, example_testcases, method_name='solve', fallback_signature=None):
     """Generate a simple, working C++ wrapper for LeetCode test cases"""
     try:
         print(f"generate_simple_leetcode_wrapper called with method_name: {method_name}")
         
-        # Try to detect the complete function signature
-        function_signature = detect_function_signature(code, method_name)
+        # Try to detect the complete function signature, falling back to the one from LeetCode's snippet
+        function_signature = detect_function_signature(code, method_name) or fallback_signature
         
         # Parse test cases with proper type conversion
         typed_test_cases = parse_typed_test_cases(example_testcases, function_signature)
@@ -2384,74 +2266,18 @@ def generate_simple_leetcode_wrapper(code, question_id, example_testcases, metho
         print(f"Error generating simple LeetCode wrapper: {str(e)}")
         return None
 
-def fetch_test_cases_from_leetcode(question_id):
+def fetch_test_cases_from_leetcode(question_id, bundle=_FETCH_BUNDLE):
 
     print(f"Fetching test cases from LeetCode API for question {question_id}")
 
-    """Fetch actual test cases from LeetCode API"""
+    """Build test cases from the problem bundle's example test cases"""
     try:
-        # First, try to find the title_slug for this question_id
-        title_slug = find_title_slug_by_id(question_id)
-        if not title_slug:
-            print(f"Could not find title_slug for question {question_id}")
-            return None
-        
-        # Fetch the full problem details including test cases
-        url = 'https://leetcode.com/graphql'
-        headers = {
-            'Content-Type': 'application/json',
-            'Referer': 'https://leetcode.com/problems/',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        if bundle is _FETCH_BUNDLE:
+            bundle = get_problem_bundle(question_id)
+        if bundle and bundle.example_testcases:
+            return parse_leetcode_test_cases(bundle.example_testcases, bundle.method_name, question_id)
         
-        # Query to get problem details including example test cases
-        query = {
-            'query': '''
-                query questionContent($titleSlug: String!) {
-                    question(titleSlug: $titleSlug) {
-                        title
-                        difficulty
-                        content
-                        exampleTestcases
-                        codeSnippets {
-                            lang
-                            code
-                        }
-                    }
-                }
-            ''',
-            'variables': {
-                'titleSlug': title_slug
-            }
-        }
-        
-        response = requests.post(url, json=query, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'data' in data and 'question' in data['data'] and data['data']['question']:
-                question_data = data['data']['question']
-                
-                # Get example test cases
-                example_testcases = question_data.get('exampleTestcases', '')
-                
-                # Get code snippets to find the method name
-                code_snippets = question_data.get('codeSnippets', [])
-                method_name = 'solve'  # default
-                
-                for snippet in code_snippets:
-                    if snippet.get('lang') == 'cpp':
-                        cpp_code = snippet.get('code', '')
-                        detected_method = detect_method_name_from_code(cpp_code)
-                        if detected_method != 'solve':
-                            method_name = detected_method
-                            break
-                
-                # Parse the example test cases
-                if example_testcases:
-                    return parse_leetcode_test_cases(example_testcases, method_name, question_id)
-        
-        print(f"Failed to fetch test cases for question {question_id} ({title_slug})")
+        print(f"Failed to fetch test cases for question {question_id}")
         return None
         
     except Exception as e:
@@ -2602,16 +2428,9 @@ int main() {{
 
 def detect_parameter_type_from_code(code, method_name):
     """Detect the parameter type from method signature"""
-    import re
-    
-    # Look for method signature with the specific method name
-    pattern = rf'{method_name}\s*\(\s*(\w+)\s+\w+'
-    match = re.search(pattern, code)
-    
-    if match:
-        param_type = match.group(1)
-        print(f"Detected parameter type: {param_type}")
-        return param_type
+    signature = cpp_signature.find_signature(code, method_name)
+    if signature and signature.parameters:
+        return signature.parameters[0].type.unqualified_name
     
     # Fallback: look for common patterns
     if 'string' in code and method_name in ['reverseVowels', 'isPalindrome', 'isAnagram', 'wordPattern', 'reverseString']:
@@ -2622,7 +2441,11 @@ def detect_parameter_type_from_code(code, method_name):
         return 'int'  # Default
 
 def search_question_by_id(question_id):
-    """Search for a question by ID using LeetCode's problemset API"""
+    """Search for a question by ID, using the local problem catalog before LeetCode's problemset API"""
+    title_slug = catalog.get_title_slug(question_id)
+    if title_slug:
+        return title_slug
+    
     try:
         url = 'https://leetcode.com/graphql'
         headers = {
@@ -2642,11 +2465,7 @@ def search_question_by_id(question_id):
                         filters: $filters
                     ) {
                         questions: data {
-                            questionId
-                            title
-                            titleSlug
-                            difficulty
-                        }
+                            questionId''' + catalog.QUESTION_LIST_FIELDS + '''}
                     }
                 }
             ''',
@@ -2662,12 +2481,13 @@ def search_question_by_id(question_id):
         # We'll search in batches since LeetCode limits the results
         for skip in range(0, 1000, 50):  # Search up to 1000 questions
             query['variables']['skip'] = skip
-            response = requests.post(url, json=query, headers=headers, timeout=10)
+            response = http_client.post(url, json=query, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
                 if 'data' in data and 'problemsetQuestionList' in data['data']:
                     questions = data['data']['problemsetQuestionList'].get('questions', [])
+                    catalog.upsert_problems(questions)
                     
                     for question in questions:
                         # Compare both string and integer versions of the question ID
@@ -2690,113 +2510,18 @@ def search_question_by_id(question_id):
         return None
 
 def detect_method_name_from_code(code):
-
-    print(f"Detecting method name from code")
-
-    """Detect the method name from C++ code"""
-    import re
-    
-    # Look for method declarations in the Solution class
-    # Pattern: return_type methodName(parameters)
-    method_patterns = [
-        r'(\w+)\s+(\w+)\s*\([^)]*\)\s*{',  # Standard method
-        r'(\w+)\s+(\w+)\s*\([^)]*\)\s*;',   # Method declaration
-    ]
-    
-    for pattern in method_patterns:
-        matches = re.findall(pattern, code)
-        for match in matches:
-            return_type, method_name = match
-            # Skip constructors, destructors, and common non-solution methods
-            if method_name not in ['Solution', '~Solution', 'main', 'cout', 'cin', 'next', 'prev', 'begin', 'end', 'size', 'empty', 'push', 'pop', 'top', 'front', 'back']:
-                print(f"Detected method name: {method_name}")
-                return method_name
-    
-    # If no method found, try to find any function-like pattern
-    function_pattern = r'(\w+)\s*\([^)]*\)\s*{'
-    matches = re.findall(function_pattern, code)
-    for match in matches:
-        if match not in ['main', 'cout', 'cin', 'if', 'for', 'while', 'next', 'prev', 'begin', 'end', 'size', 'empty', 'push', 'pop', 'top', 'front', 'back']:
-            print(f"Detected function name: {match}")
-            return match
-    
-    # Default fallback
-    print("No method detected, using default 'solve'")
-    return 'solve'
+    """Detect the method name from C++ code (the public Solution method for LeetCode snippets)"""
+    signature = cpp_signature.find_signature(code)
+    return signature.method_name if signature else 'solve'
 
 def detect_function_signature(code, method_name):
     """Extract complete function signature including all parameters"""
-    import re
-    
-    print(f"Detecting function signature for method: {method_name}")
-    
-    # Pattern to match: return_type methodName(type1 param1, type2 param2, ...)
-    # This pattern handles various C++ type declarations including references, pointers, and templates
-    pattern = rf'(\w+(?:<[^>]*>)?(?:\s*&\s*|\s*\*\s*)?)\s+{method_name}\s*\(\s*([^)]*)\s*\)'
-    match = re.search(pattern, code)
-    
-    if match:
-        return_type = match.group(1).strip()
-        params_str = match.group(2).strip()
-        
-        print(f"Found signature: {return_type} {method_name}({params_str})")
-        
-        # Parse individual parameters
-        parameters = []
-        if params_str:
-            # Split by comma, but be careful with template parameters
-            param_parts = []
-            current_param = ""
-            template_depth = 0
-            
-            for char in params_str:
-                if char == '<':
-                    template_depth += 1
-                elif char == '>':
-                    template_depth -= 1
-                elif char == ',' and template_depth == 0:
-                    param_parts.append(current_param.strip())
-                    current_param = ""
-                    continue
-                current_param += char
-            
-            if current_param.strip():
-                param_parts.append(current_param.strip())
-            
-            for param in param_parts:
-                if param:
-                    # Split type and name - handle complex types
-                    # Look for the last word as the parameter name
-                    words = param.split()
-                    if len(words) >= 2:
-                        # Handle cases like "vector<int>& nums" or "const string& s"
-                        param_name = words[-1]  # Last word is the parameter name
-                        param_type = ' '.join(words[:-1])  # Everything else is the type
-                        
-                        parameters.append({
-                            'type': param_type,
-                            'name': param_name
-                        })
-                        print(f"  Parameter: {param_type} {param_name}")
-        
-        result = {
-            'return_type': return_type,
-            'parameters': parameters,
-            'method_name': method_name
-        }
-        
-        print(f"Complete signature detected: {result}")
-        return result
-    
-    print(f"No signature found for method: {method_name}")
-    return None
+    signature = cpp_signature.find_signature(code, method_name)
+    return signature.as_dict() if signature else None
 
 def parse_typed_test_cases(example_testcases, function_signature):
     """Parse test cases with proper type conversion based on function signature"""
-    print(f"Parsing typed test cases for signature: {function_signature}")
-    
     if not function_signature:
-        print("No function signature provided, using fallback parsing")
         return parse_fallback_test_cases(example_testcases)
     
     parameters = function_signature['parameters']
@@ -2825,7 +2550,6 @@ def parse_typed_test_cases(example_testcases, function_signature):
                         'raw_input': input_line,
                         'raw_output': output_line
                     })
-                    print(f"  Parsed test case {len(test_cases)}: {parsed_params} -> {expected_output}")
                 i += 2
             else:
                 i += 1
@@ -2855,80 +2579,53 @@ def parse_typed_test_cases(example_testcases, function_signature):
                         'raw_input': '\n'.join(input_lines),
                         'raw_output': output_line
                     })
-                    print(f"  Parsed test case {len(test_cases)}: {parsed_params} -> {expected_output}")
                 
                 i += len(parameters) + 1
             else:
                 i += 1
     
-    print(f"Successfully parsed {len(test_cases)} test cases")
     return test_cases
 
 def parse_parameters_from_string(input_string, parameters):
     """Parse individual parameters from LeetCode input string"""
-    print(f"Parsing parameters from: '{input_string}'")
     parsed = {}
+    types = {param['name']: param['type'] for param in parameters}
     
     # Handle different input formats
     if '=' in input_string:
         # Format: "nums = [2,7,11,15], target = 9"
-        # Need to be more careful with splitting to handle nested brackets
-        parts = []
-        current_part = ""
-        bracket_depth = 0
-        
-        for char in input_string:
-            if char == '[':
-                bracket_depth += 1
-            elif char == ']':
-                bracket_depth -= 1
-            elif char == ',' and bracket_depth == 0:
-                parts.append(current_part.strip())
-                current_part = ""
-                continue
-            current_part += char
-        
-        if current_part.strip():
-            parts.append(current_part.strip())
-        
-        for part in parts:
-            if '=' in part:
-                key, value = part.split('=', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Find matching parameter
-                for param in parameters:
-                    if param['name'] == key:
-                        parsed[key] = convert_value_to_type(value, param['type'])
-                        print(f"    {key} = {value} -> {parsed[key]} ({param['type']})")
-                        break
+        try:
+            assignments = literals.parse_assignments(input_string)
+        except literals.LiteralError:
+            assignments = []
+        for key, value, source in assignments:
+            if key in types:
+                parsed[key] = literals.coerce_to(value, types[key], source)
     else:
-        # Format: "[2,7,11,15]\n9" (separate lines) - handle this case
-        # For now, try to match parameters by position
+        # Format: "[2,7,11,15]\n9" (separate lines): match parameters by position
         values = [line.strip() for line in input_string.split('\n') if line.strip()]
         for i, param in enumerate(parameters):
             if i < len(values):
                 parsed[param['name']] = convert_value_to_type(values[i], param['type'])
-                print(f"    {param['name']} = {values[i]} -> {parsed[param['name']]} ({param['type']})")
     
     return parsed
 
 def parse_parameters_from_multiple_lines(input_lines, parameters):
     """Parse parameters from multiple input lines (one per parameter)"""
-    print(f"Parsing parameters from multiple lines: {input_lines}")
     parsed = {}
     
     for i, param in enumerate(parameters):
         if i < len(input_lines):
-            value_str = input_lines[i].strip()
-            parsed[param['name']] = convert_value_to_type(value_str, param['type'])
-            print(f"    {param['name']} = {value_str} -> {parsed[param['name']]} ({param['type']})")
+            parsed[param['name']] = convert_value_to_type(input_lines[i], param['type'])
     
     return parsed
 
 def convert_value_to_type(value_str, target_type):
     """Convert string value to appropriate type"""
+    return literals.convert(value_str, target_type)
+
+def legacy_convert_value_to_type(value_str, target_type):
+    """Character-walking version of convert_value_to_type, kept as the benchmark baseline"""
     value_str = value_str.strip()
     print(f"Converting '{value_str}' to type '{target_type}'")
     
@@ -3036,14 +2733,13 @@ def convert_value_to_type(value_str, target_type):
     elif target_type.endswith('&'):
         # Remove the & and process the base type
         base_type = target_type[:-1].strip()
-        return convert_value_to_type(value_str, base_type)
+        return legacy_convert_value_to_type(value_str, base_type)
     
     # Default fallback
     return value_str
 
 def parse_output_value(output_str, return_type):
     """Parse expected output value based on return type"""
-    print(f"Parsing output '{output_str}' for return type '{return_type}'")
     return convert_value_to_type(output_str, return_type)
 
 def parse_fallback_test_cases(example_testcases):
@@ -3183,6 +2879,15 @@ def generate_data_structures(parameters, return_type):
     
     return '\n\n'.join(structures) if structures else ''
 
+def _cpp_string_literal(value):
+    """C++ string literal for a parsed (unescaped) value"""
+    return json.dumps(str(value))
+
+def _cpp_char_literal(value):
+    """C++ char literal for a parsed value"""
+    char = str(value)[:1] or '\\0'
+    return "'\\''" if char == "'" else "'\\\\'" if char == '\\' else f"'{char}'"
+
 def generate_typed_test_data(test_cases, parameters, return_type, method_name):
     """Generate properly typed test case execution code with enhanced features"""
     test_code = ""
@@ -3208,19 +2913,19 @@ def generate_typed_test_data(test_cases, parameters, return_type, method_name):
                 elif param_type == 'vector<string>' or param_type == 'vector<string>&':
                     test_code += f'    vector<string> {unique_param_name} = {{'
                     for j, v in enumerate(value):
-                        test_code += f'"{v}"'
+                        test_code += _cpp_string_literal(v)
                         if j < len(value) - 1:
                             test_code += ', '
                     test_code += f'}};\n'
                 elif param_type == 'vector<char>' or param_type == 'vector<char>&':
                     test_code += f'    vector<char> {unique_param_name} = {{'
                     for j, v in enumerate(value):
-                        test_code += f"'{v}'"
+                        test_code += _cpp_char_literal(v)
                         if j < len(value) - 1:
                             test_code += ', '
                     test_code += f'}};\n'
                 elif param_type == 'string':
-                    test_code += f'    string {unique_param_name} = "{value}";\n'
+                    test_code += f'    string {unique_param_name} = {_cpp_string_literal(value)};\n'
                 elif param_type == 'int':
                     test_code += f'    int {unique_param_name} = {value};\n'
                 elif param_type == 'bool':
@@ -3254,19 +2959,19 @@ def generate_typed_test_data(test_cases, parameters, return_type, method_name):
             elif return_type == 'vector<string>':
                 test_code += f'    vector<string> expected_{i+1} = {{'
                 for j, v in enumerate(expected):
-                    test_code += f'"{v}"'
+                    test_code += _cpp_string_literal(v)
                     if j < len(expected) - 1:
                         test_code += ', '
                 test_code += f'}};\n'
             elif return_type == 'vector<char>':
                 test_code += f'    vector<char> expected_{i+1} = {{'
                 for j, v in enumerate(expected):
-                    test_code += f"'{v}'"
+                    test_code += _cpp_char_literal(v)
                     if j < len(expected) - 1:
                         test_code += ', '
                 test_code += f'}};\n'
             elif return_type == 'string':
-                test_code += f'    string expected_{i+1} = "{expected}";\n'
+                test_code += f'    string expected_{i+1} = {_cpp_string_literal(expected)};\n'
             elif return_type == 'int':
                 test_code += f'    int expected_{i+1} = {expected};\n'
             elif return_type == 'bool':
@@ -3309,7 +3014,7 @@ def generate_typed_test_data(test_cases, parameters, return_type, method_name):
         
         test_code += f'''
     cout << endl;
-    cout << "  Expected: {expected_str}" << endl;
+    cout << "  Expected: " << {_cpp_string_literal(expected_str)} << endl;
     cout << "  Your Output: ";
     '''
         